@@ -11,6 +11,7 @@ import platform
 import statistics
 import subprocess
 import sys
+from dataclasses import asdict
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -22,7 +23,16 @@ if str(ROOT) not in sys.path:
 from pronunciation_mapper import __version__  # noqa: E402
 from pronunciation_mapper.v2 import (  # noqa: E402
     AgenticPronunciationMapper,
+    LocalConfidenceGate,
     ProviderUnavailableError,
+    ReasonCode,
+    create_provider,
+)
+from pronunciation_mapper.v2.models import PAYLOAD_FORMATS  # noqa: E402
+from pronunciation_mapper.v2.prompts import system_instructions  # noqa: E402
+from pronunciation_mapper.v2.providers.base import (  # noqa: E402
+    PROMPT_TOKEN_OVERHEAD,
+    estimate_prompt_tokens,
 )
 
 
@@ -34,6 +44,22 @@ class OfflineProvider:
         raise ProviderUnavailableError("offline eval intentionally uses deterministic fallback")
 
 
+class CountingProvider:
+    """실제 provider 호출 수를 세고 전달된 request를 기록하는 wrapper."""
+
+    def __init__(self, provider):
+        self.provider = provider
+        self.name = provider.name
+        self.model = provider.model
+        self.calls = 0
+        self.requests = []
+
+    async def decide(self, request):
+        self.calls += 1
+        self.requests.append(request)
+        return await self.provider.decide(request)
+
+
 def parse_args():
     parser = argparse.ArgumentParser(description="Pronunciation Mapper V2 golden-set evaluation")
     parser.add_argument("--provider", choices=["offline", "azure", "ollama"], default="offline")
@@ -52,6 +78,14 @@ def parse_args():
         default=0,
         help="require at least this many non-fallback results from the selected provider",
     )
+    parser.add_argument(
+        "--calibrate-gate",
+        action="store_true",
+        help="compare provider calls and accuracy with and without the local-confidence gate",
+    )
+    parser.add_argument("--gate-max-distance", type=float, default=0.2)
+    parser.add_argument("--gate-min-margin", type=float, default=0.25)
+    parser.add_argument("--gate-max-candidates", type=int, default=3)
     parser.add_argument(
         "--output",
         type=Path,
@@ -199,6 +233,93 @@ def _git_state():
     return revision or None, dirty
 
 
+async def calibrate_local_gate(vocabulary, cases, provider, gate):
+    """같은 provider로 gate 없이/있이 실행해 절약한 호출 수와 정확도 비용을 비교합니다."""
+    passes = {}
+    for label, local_gate in (("without_gate", None), ("with_gate", gate)):
+        counter = CountingProvider(provider)
+        mapper = AgenticPronunciationMapper(
+            vocabulary["terms"],
+            custom_mappings=vocabulary.get("mappings", {}),
+            provider=counter,
+            fallback_strategy="heuristic",
+            local_gate=local_gate,
+        )
+        passed = 0
+        gated_spans = 0
+        for case in cases:
+            result = await mapper.rewrite(case["input"])
+            passed += result.rewritten_text == case["expected"]
+            gated_spans += sum(
+                decision.reason_code == ReasonCode.LOCAL_CONFIDENCE.value
+                for decision in result.decisions
+            )
+        passes[label] = {
+            "provider_calls": counter.calls,
+            "accuracy": passed / len(cases) if cases else 0.0,
+            "gated_spans": gated_spans,
+        }
+
+    without_gate = passes["without_gate"]
+    with_gate = passes["with_gate"]
+    return {
+        "gate": asdict(gate),
+        "provider_calls_without_gate": without_gate["provider_calls"],
+        "provider_calls_with_gate": with_gate["provider_calls"],
+        "provider_calls_saved": without_gate["provider_calls"] - with_gate["provider_calls"],
+        "gated_spans": with_gate["gated_spans"],
+        "accuracy_without_gate": without_gate["accuracy"],
+        "accuracy_with_gate": with_gate["accuracy"],
+        "accuracy_cost": round(without_gate["accuracy"] - with_gate["accuracy"], 6),
+    }
+
+
+async def compare_payload_formats(vocabulary, cases):
+    """offline pass에서 나온 provider request를 형식별로 직렬화해 입력 토큰을 비교합니다."""
+    recorder = CountingProvider(OfflineProvider())
+    mapper = AgenticPronunciationMapper(
+        vocabulary["terms"],
+        custom_mappings=vocabulary.get("mappings", {}),
+        provider=recorder,
+        fallback_strategy="heuristic",
+    )
+    for case in cases:
+        await mapper.rewrite(case["input"])
+
+    request_count = len(recorder.requests)
+    comparison = {"request_count": request_count}
+    for payload_format in PAYLOAD_FORMATS:
+        instructions = system_instructions(payload_format)
+        payloads = [
+            json.dumps(
+                request.to_provider_payload(payload_format),
+                ensure_ascii=False,
+                separators=(",", ":"),
+            )
+            for request in recorder.requests
+        ]
+        # 지침은 호출마다 다시 보내므로 호출당 총 입력 토큰이 형식 선택의 기준입니다.
+        input_tokens = sum(estimate_prompt_tokens(instructions, payload) for payload in payloads)
+        comparison[payload_format] = {
+            "input_tokens": input_tokens,
+            "input_tokens_per_call": (
+                round(input_tokens / request_count, 2) if request_count else 0.0
+            ),
+            "instruction_tokens": estimate_prompt_tokens(instructions) - PROMPT_TOKEN_OVERHEAD,
+            "payload_tokens": sum(
+                estimate_prompt_tokens(payload) - PROMPT_TOKEN_OVERHEAD for payload in payloads
+            ),
+        }
+    for metric, reduction in (
+        ("input_tokens", "input_token_reduction"),
+        ("payload_tokens", "payload_token_reduction"),
+    ):
+        standard = comparison["standard"][metric]
+        compact = comparison["compact"][metric]
+        comparison[reduction] = round(1 - compact / standard, 6) if standard else 0.0
+    return comparison
+
+
 async def run(args):
     vocabulary = json.loads(args.vocabulary.read_text(encoding="utf-8"))
     cases = load_jsonl(args.cases)
@@ -260,13 +381,34 @@ async def run(args):
         "provider": args.provider,
         "metrics": metrics,
         "cases": rows,
+        "payload_format_comparison": await compare_payload_formats(vocabulary, cases),
     }
+    if args.calibrate_gate:
+        gate = LocalConfidenceGate(
+            max_distance=args.gate_max_distance,
+            min_margin=args.gate_min_margin,
+            max_candidates=args.gate_max_candidates,
+        )
+        calibration_provider = (
+            OfflineProvider() if args.provider == "offline" else create_provider(args.provider)
+        )
+        try:
+            report["local_gate_calibration"] = await calibrate_local_gate(
+                vocabulary, cases, calibration_provider, gate
+            )
+        finally:
+            aclose = getattr(calibration_provider, "aclose", None)
+            if callable(aclose):
+                await aclose()
 
     output_path = args.output
     output_path.parent.mkdir(parents=True, exist_ok=True)
     output_path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
 
     print(json.dumps(metrics, ensure_ascii=False, indent=2))
+    print(json.dumps(report["payload_format_comparison"], ensure_ascii=False, indent=2))
+    if "local_gate_calibration" in report:
+        print(json.dumps(report["local_gate_calibration"], ensure_ascii=False, indent=2))
     for row in rows:
         marker = "PASS" if row["passed"] else "FAIL"
         print(f"[{marker}] {row['id']}: {row['actual']}")
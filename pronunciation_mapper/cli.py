@@ -6,7 +6,10 @@ import sys
 import json
 from .mapper import PronunciationMapper
 from .utils import load_mappings_from_file, save_mappings_to_file, get_cache_path
-from .v2 import AgenticPronunciationMapper
+from .v2 import AgenticPronunciationMapper, ProviderError
+
+# warm-up과 stream 한 줄 rewrite에서 보고하고 계속 진행할 오류.
+_V2_ERRORS = (ProviderError, ValueError, OSError)
 
 def main():
     parser = argparse.ArgumentParser(description='발음 유사도 기반 매핑 도구')
@@ -28,7 +31,7 @@ def main():
 
     # V2 agentic rewrite 명령
     rewrite_parser = subparsers.add_parser('rewrite', aliases=['rewrite-v2'], help='V2 agentic Query Rewriting')
-    rewrite_parser.add_argument('sentence', help='매핑할 문장')
+    rewrite_parser.add_argument('sentence', nargs='?', help='매핑할 문장 (--stdin이면 생략)')
     rewrite_parser.add_argument('--db-terms', '-d', help='DB 용어 파일(.json)')
     rewrite_parser.add_argument('--threshold', '-t', type=float, help='fallback 유사도 임계값')
     rewrite_parser.add_argument('--provider', choices=['azure', 'ollama'], default='azure', help='AI provider (기본: azure)')
@@ -40,6 +43,14 @@ def main():
     )
     rewrite_parser.add_argument('--min-confidence', type=float, default=0.55, help='교체를 적용할 최소 모델 confidence')
     rewrite_parser.add_argument('--json', action='store_true', help='상세 결과를 JSON으로 출력')
+    rewrite_parser.add_argument(
+        '--stdin', action='store_true',
+        help='표준 입력을 한 줄씩 계속 rewrite하는 stream 모드 (--json이면 JSON Lines 출력)',
+    )
+    rewrite_parser.add_argument(
+        '--warm', action='store_true',
+        help='첫 입력 전에 SDK import, 인증, 모델 적재를 미리 수행하고 단계별 시간을 stderr에 출력',
+    )
     
     # 매핑 추가 명령
     add_mapping_parser = subparsers.add_parser('add-mapping', help='사용자 정의 매핑 추가')
@@ -96,6 +107,8 @@ def main():
         print(f"매핑: {result}")
 
     elif args.command in {'rewrite', 'rewrite-v2'}:
+        if args.stdin == (args.sentence is not None):
+            rewrite_parser.error('문장 인자와 --stdin 중 하나만 지정하세요')
         provider_options = {}
         if args.model:
             provider_options['model'] = args.model
@@ -109,12 +122,27 @@ def main():
             threshold=threshold,
             minimum_confidence=args.min_confidence,
             fallback_strategy=args.fallback,
+            # 준비한 client와 연결을 이후 rewrite가 같은 loop에서 재사용합니다.
+            sync_runner='background' if args.stdin or args.warm else None,
         )
         try:
-            result = v2_mapper.rewrite_sync(args.sentence)
-        except Exception as error:
-            print(f"V2 rewrite 오류: {error}", file=sys.stderr)
-            return 1
+            if args.warm:
+                try:
+                    timings = v2_mapper.warm_up()
+                except _V2_ERRORS as error:
+                    print(f"V2 warm-up 오류: {error}", file=sys.stderr)
+                    if args.fallback == 'raise':
+                        return 1
+                else:
+                    steps = ', '.join(f"{step}={value:.1f}ms" for step, value in timings.items())
+                    print(f"warm-up: {steps}", file=sys.stderr)
+            if args.stdin:
+                return _rewrite_stream(v2_mapper, sys.stdin, as_json=args.json)
+            try:
+                result = v2_mapper.rewrite_sync(args.sentence)
+            except Exception as error:
+                print(f"V2 rewrite 오류: {error}", file=sys.stderr)
+                return 1
         finally:
             v2_mapper.close()
         if args.json:
@@ -135,5 +163,22 @@ def main():
     
     return 0
 
+def _rewrite_stream(v2_mapper, lines, *, as_json):
+    """입력 한 줄마다 결과 한 줄을 바로 출력합니다. 실패한 줄은 건너뛰고 종료 코드로 알립니다."""
+    status = 0
+    for line in lines:
+        sentence = line.rstrip('\r\n')
+        try:
+            result = v2_mapper.rewrite_sync(sentence)
+        except _V2_ERRORS as error:
+            print(f"V2 rewrite 오류: {error}", file=sys.stderr)
+            status = 1
+            continue
+        if as_json:
+            print(json.dumps(result.to_dict(), ensure_ascii=False), flush=True)
+        else:
+            print(result.rewritten_text, flush=True)
+    return status
+
 if __name__ == "__main__":
     sys.exit(main())
@@ -74,6 +74,9 @@ class PronunciationMapper:
             self.term_mappings.update(custom_mappings)
 
         self.pronunciation_rules = PRONUNCIATION_RULES["korean"]
+        # 후보 인덱스가 다시 만들어질 때마다 증가합니다. V2 cache는 이 값으로
+        # vocabulary 변경 이후의 오래된 판정을 재사용하지 않습니다.
+        self.vocabulary_generation = 0
         self._build_bidirectional_mappings()
         self._refresh_indexes()
 
@@ -89,6 +92,7 @@ class PronunciationMapper:
                 self.reverse_aliases.setdefault(target, source)
 
     def _refresh_indexes(self):
+        self.vocabulary_generation += 1
         self.aliases_by_target = {term: [] for term in self.db_terms}
         for source, target in self.term_mappings.items():
             if target in self.aliases_by_target and source != target:
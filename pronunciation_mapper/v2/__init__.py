@@ -1,5 +1,10 @@
-from .engine import AgenticPronunciationMapper
+from .cache import CacheStats, DecisionCache, LRUCache, RewriteCache, SQLiteDecisionCache
+from .candidates import CandidatePruning, LocalConfidenceGate
+from .engine import AgenticPronunciationMapper, StreamSession
 from .errors import (
+    CircuitOpenError,
+    ConcurrencyLimitExceededError,
+    DeadlineExceededError,
     InvalidProviderOutputError,
     ProviderConfigurationError,
     ProviderError,
@@ -17,26 +22,66 @@ from .models import (
     ReasonCode,
     RewriteResult,
 )
-from .providers import AzureFoundryProvider, DecisionProvider, OllamaProvider, create_provider
+from .providers import (
+    AzureFoundryProvider,
+    DecisionProvider,
+    HedgedProvider,
+    HedgeStats,
+    OllamaProvider,
+    PooledProvider,
+    PoolMemberStats,
+    create_provider,
+    create_provider_pool,
+)
+from .resilience import (
+    AdaptiveConcurrencyLimiter,
+    CircuitBreaker,
+    CircuitBreakerStats,
+    CircuitState,
+    ConcurrencyLimiterStats,
+)
+from .runner import BackgroundLoopRunner
 
 __all__ = [
+    "AdaptiveConcurrencyLimiter",
     "AgenticPronunciationMapper",
     "AppliedDecision",
     "AzureFoundryProvider",
+    "BackgroundLoopRunner",
+    "CacheStats",
     "Candidate",
+    "CandidatePruning",
     "CandidateSpan",
+    "CircuitBreaker",
+    "CircuitBreakerStats",
+    "CircuitOpenError",
+    "CircuitState",
+    "ConcurrencyLimitExceededError",
+    "ConcurrencyLimiterStats",
+    "DeadlineExceededError",
     "DecisionAction",
+    "DecisionCache",
     "DecisionProvider",
     "DecisionRequest",
+    "HedgeStats",
+    "HedgedProvider",
     "InvalidProviderOutputError",
+    "LRUCache",
+    "LocalConfidenceGate",
     "OllamaProvider",
+    "PoolMemberStats",
+    "PooledProvider",
     "ProviderConfigurationError",
     "ProviderError",
     "ProviderResponse",
     "ProviderSelection",
     "ProviderUnavailableError",
     "ReasonCode",
+    "RewriteCache",
     "RewriteResult",
+    "SQLiteDecisionCache",
+    "StreamSession",
     "UnsupportedProviderError",
     "create_provider",
+    "create_provider_pool",
 ]
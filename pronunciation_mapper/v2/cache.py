@@ -0,0 +1,329 @@
+"""반복 입력의 provider 호출을 줄이기 위한 크기 제한 V2 cache."""
+
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any, Protocol, runtime_checkable
+
+
+@dataclass(frozen=True, slots=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+    errors: int = 0
+
+
+@runtime_checkable
+class RewriteCache(Protocol):
+    """``AgenticPronunciationMapper(result_cache=...)``가 사용하는 최소 계약."""
+
+    def get(self, key: str) -> Any | None:
+        """저장된 값을 반환하고 없으면 ``None``을 반환합니다."""
+
+    def put(self, key: str, value: Any) -> None:
+        """값을 저장합니다. 크기 제한은 구현체가 결정합니다."""
+
+
+@runtime_checkable
+class DecisionCache(Protocol):
+    """span 단위 provider 판정 cache 계약.
+
+    한 rewrite의 모든 span을 한 번에 조회·저장하므로 원격 또는 디스크 기반
+    구현체도 요청당 왕복 한 번으로 동작할 수 있습니다. 값은 JSON 직렬화 가능한
+    ``dict``입니다.
+    """
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        """찾은 key만 담은 ``{key: value}``를 반환합니다."""
+
+    def put_many(self, items: Mapping[str, Any]) -> None:
+        """여러 항목을 한 번에 저장합니다."""
+
+
+class LRUCache:
+    """thread-safe in-memory LRU cache와 hit/miss/eviction counter."""
+
+    def __init__(self, maxsize: int = 1024):
+        if isinstance(maxsize, bool) or not isinstance(maxsize, int) or maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        found = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                found[key] = value
+        return found
+
+    def put_many(self, items: Mapping[str, Any]) -> None:
+        for key, value in items.items():
+            self.put(key, value)
+
+    def clear(self) -> None:
+        """항목만 비우고 누적 counter는 유지합니다."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=len(self._entries),
+                maxsize=self.maxsize,
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class SQLiteDecisionCache:
+    """같은 host의 여러 worker process가 공유하는 WAL-mode span 판정 cache.
+
+    표준 라이브러리 ``sqlite3``만 사용합니다. key에는 이미 provider model과
+    vocabulary hash가 들어 있으므로 서로 다른 설정의 worker가 같은 파일을
+    공유해도 판정이 섞이지 않습니다. 만료(TTL)는 조회 시 바로 적용하고,
+    크기 제한은 최근에 사용하지 않은 항목부터 제거합니다.
+
+    cache는 최적화일 뿐이므로 다른 process가 쓰기 잠금을 오래 쥐고 있거나
+    디스크 오류가 나면(``sqlite3.Error``) 예외 대신 조회는 miss로, 저장은
+    건너뛴 쓰기로 처리하고 ``stats().errors``에 셉니다. 각 호출은
+    ``busy_timeout``까지 block될 수 있으므로 mapper는 이 cache를 event loop
+    밖의 thread에서 호출합니다.
+    """
+
+    _SQL_VARIABLE_LIMIT = 500
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        *,
+        ttl_seconds: float | None = 7 * 24 * 3600,
+        max_entries: int = 100_000,
+        busy_timeout: float = 5.0,
+        eviction_interval: int = 64,
+    ):
+        if ttl_seconds is not None and (
+            isinstance(ttl_seconds, bool)
+            or not isinstance(ttl_seconds, (int, float))
+            or not math.isfinite(ttl_seconds)
+            or ttl_seconds <= 0
+        ):
+            raise ValueError("ttl_seconds must be a positive finite number or None")
+        for name, value in (("max_entries", max_entries), ("eviction_interval", eviction_interval)):
+            if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+                raise ValueError(f"{name} must be at least 1")
+        if (
+            isinstance(busy_timeout, bool)
+            or not isinstance(busy_timeout, (int, float))
+            or not math.isfinite(busy_timeout)
+            or busy_timeout < 0
+        ):
+            raise ValueError("busy_timeout must be a non-negative finite number")
+
+        self.path = os.fspath(path)
+        self.ttl_seconds = None if ttl_seconds is None else float(ttl_seconds)
+        self.max_entries = max_entries
+        self.eviction_interval = eviction_interval
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._errors = 0
+        self._writes_since_eviction = 0
+        # autocommit 모드에서 필요한 구간만 명시적 transaction으로 묶습니다.
+        self._connection = sqlite3.connect(
+            self.path,
+            timeout=busy_timeout,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        try:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS decisions ("
+                "key TEXT PRIMARY KEY, "
+                "value TEXT NOT NULL, "
+                "expires_at REAL, "
+                "last_used REAL NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS decisions_last_used ON decisions(last_used)"
+            )
+        except BaseException:
+            self._connection.close()
+            raise
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+        now = time.time()
+        found: dict[str, Any] = {}
+        with self._lock:
+            connection = self._require_connection()
+            try:
+                for offset in range(0, len(keys), self._SQL_VARIABLE_LIMIT):
+                    chunk = keys[offset:offset + self._SQL_VARIABLE_LIMIT]
+                    placeholders = ",".join("?" for _ in chunk)
+                    rows = connection.execute(
+                        f"SELECT key, value, expires_at FROM decisions WHERE key IN ({placeholders})",  # nosec B608
+                        chunk,
+                    ).fetchall()
+                    for key, value, expires_at in rows:
+                        if expires_at is not None and expires_at <= now:
+                            continue
+                        try:
+                            found[key] = json.loads(value)
+                        except json.JSONDecodeError:
+                            continue
+            except sqlite3.Error:
+                self._errors += 1
+                self._misses += len(keys)
+                return {}
+            if found:
+                try:
+                    connection.executemany(
+                        "UPDATE decisions SET last_used = ? WHERE key = ?",
+                        [(now, key) for key in found],
+                    )
+                except sqlite3.Error:
+                    # 사용 시각은 eviction 순서에만 쓰이므로 갱신하지 못해도 값은 반환합니다.
+                    self._errors += 1
+            self._hits += len(found)
+            self._misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, items: Mapping[str, Any]) -> None:
+        if not items:
+            return
+        now = time.time()
+        expires_at = None if self.ttl_seconds is None else now + self.ttl_seconds
+        rows = [
+            (key, json.dumps(value, ensure_ascii=False, separators=(",", ":")), expires_at, now)
+            for key, value in items.items()
+        ]
+        with self._lock:
+            connection = self._require_connection()
+            try:
+                connection.execute("BEGIN IMMEDIATE")
+                connection.executemany(
+                    "INSERT OR REPLACE INTO decisions (key, value, expires_at, last_used) "
+                    "VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+                self._writes_since_eviction += len(rows)
+                if self._writes_since_eviction >= self.eviction_interval:
+                    self._writes_since_eviction = 0
+                    self._evict(connection, now)
+                connection.execute("COMMIT")
+            except BaseException as error:
+                if connection.in_transaction:
+                    connection.execute("ROLLBACK")
+                if not isinstance(error, sqlite3.Error):
+                    raise
+                self._errors += 1
+
+    def _evict(self, connection: sqlite3.Connection, now: float) -> None:
+        removed = connection.execute(
+            "DELETE FROM decisions WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,)
+        ).rowcount
+        (size,) = connection.execute("SELECT COUNT(*) FROM decisions").fetchone()
+        overflow = size - self.max_entries
+        if overflow > 0:
+            removed += connection.execute(
+                "DELETE FROM decisions WHERE key IN "
+                "(SELECT key FROM decisions ORDER BY last_used LIMIT ?)",
+                (overflow,),
+            ).rowcount
+        self._evictions += max(0, removed)
+
+    def evict(self) -> None:
+        """만료 항목과 크기 초과 항목을 즉시 제거합니다."""
+        with self._lock:
+            connection = self._require_connection()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                self._evict(connection, time.time())
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+            self._writes_since_eviction = 0
+
+    def stats(self) -> CacheStats:
+        """hit/miss/eviction은 이 process 기준, size는 공유 파일 기준입니다."""
+        with self._lock:
+            (size,) = self._require_connection().execute(
+                "SELECT COUNT(*) FROM decisions"
+            ).fetchone()
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=size,
+                maxsize=self.max_entries,
+                errors=self._errors,
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _require_connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            raise RuntimeError("SQLiteDecisionCache is closed")
+        return self._connection
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        self.close()
+        return False
+
+
+def fingerprint(*parts: Any) -> str:
+    """JSON 직렬화 가능한 값들로 process 간에도 안정적인 cache key를 만듭니다."""
+    encoded = json.dumps(parts, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
@@ -1,12 +1,120 @@
 """로컬 exact/phonetic retrieval로 모델 입력을 bounded top-k로 축소합니다."""
 
-from dataclasses import replace
+import math
+from dataclasses import dataclass, replace
 
 from pronunciation_mapper.mapper import LEXICAL_TOKEN_PATTERN, PronunciationMapper, split_korean_particle
 
 from .models import Candidate, CandidateSpan
 
 
+@dataclass(frozen=True, slots=True)
+class LocalConfidenceGate:
+    """provider 없이 로컬에서 확정해도 될 만큼 분명한 span을 고릅니다.
+
+    1위 후보 거리가 ``max_distance`` 이하이고, 2위와의 거리 차이가
+    ``min_margin`` 이상이며, 후보 수가 ``max_candidates`` 이하일 때 통과합니다.
+    후보가 하나뿐이면 2위 거리는 1.0으로 봅니다.
+    """
+
+    max_distance: float = 0.2
+    min_margin: float = 0.25
+    max_candidates: int = 3
+
+    def __post_init__(self):
+        for name in ("max_distance", "min_margin"):
+            value = getattr(self, name)
+            if (
+                isinstance(value, bool)
+                or not isinstance(value, (int, float))
+                or not math.isfinite(value)
+                or not 0.0 <= value <= 1.0
+            ):
+                raise ValueError(f"{name} must be between 0 and 1")
+        if (
+            isinstance(self.max_candidates, bool)
+            or not isinstance(self.max_candidates, int)
+            or self.max_candidates < 1
+        ):
+            raise ValueError("max_candidates must be at least 1")
+
+    def select(self, span: CandidateSpan) -> Candidate | None:
+        if not span.candidates or len(span.candidates) > self.max_candidates:
+            return None
+        best = span.candidates[0]
+        runner_up = span.candidates[1].distance if len(span.candidates) > 1 else 1.0
+        if best.distance <= self.max_distance and runner_up - best.distance >= self.min_margin:
+            return best
+        return None
+
+
+@dataclass(frozen=True, slots=True)
+class CandidatePruning:
+    """provider에 보낼 후보를 span별로 줄이는 규칙입니다.
+
+    1위보다 거리가 ``max_distance_gap`` 넘게 크거나 1위 거리의
+    ``max_distance_ratio`` 배를 넘는 후보를 버립니다. 1위 거리가 0이면 ratio
+    규칙은 적용하지 않습니다. ``max_request_candidates``를 주면 요청 하나의
+    전체 후보 예산을 span 수로 나눈 값이 span별 상한이 됩니다. 1위 후보는 항상
+    남으므로 후보 id와 검증 규칙은 그대로입니다.
+    """
+
+    max_distance_ratio: float | None = 3.0
+    max_distance_gap: float | None = 0.25
+    max_request_candidates: int | None = None
+
+    def __post_init__(self):
+        ratio = self.max_distance_ratio
+        if ratio is not None and (
+            isinstance(ratio, bool)
+            or not isinstance(ratio, (int, float))
+            or not math.isfinite(ratio)
+            or ratio < 1.0
+        ):
+            raise ValueError("max_distance_ratio must be a finite number of at least 1")
+        gap = self.max_distance_gap
+        if gap is not None and (
+            isinstance(gap, bool)
+            or not isinstance(gap, (int, float))
+            or not math.isfinite(gap)
+            or not 0.0 <= gap <= 1.0
+        ):
+            raise ValueError("max_distance_gap must be between 0 and 1")
+        budget = self.max_request_candidates
+        if budget is not None and (
+            isinstance(budget, bool) or not isinstance(budget, int) or budget < 1
+        ):
+            raise ValueError("max_request_candidates must be at least 1")
+
+    def prune(self, spans) -> tuple[CandidateSpan, ...]:
+        spans = tuple(spans)
+        per_span = None
+        if self.max_request_candidates is not None and spans:
+            per_span = max(1, self.max_request_candidates // len(spans))
+        return tuple(self._prune_span(span, per_span) for span in spans)
+
+    def _prune_span(self, span: CandidateSpan, per_span: int | None) -> CandidateSpan:
+        if len(span.candidates) <= 1:
+            return span
+        best = span.candidates[0].distance
+        kept = [span.candidates[0]]
+        for candidate in span.candidates[1:]:
+            if per_span is not None and len(kept) >= per_span:
+                break
+            if self.max_distance_gap is not None and candidate.distance - best > self.max_distance_gap:
+                break
+            if (
+                self.max_distance_ratio is not None
+                and best > 0.0
+                and candidate.distance > best * self.max_distance_ratio
+            ):
+                break
+            kept.append(candidate)
+        if len(kept) == len(span.candidates):
+            return span
+        return replace(span, candidates=tuple(kept))
+
+
 class CandidateGenerator:
     def __init__(
         self,
@@ -16,6 +124,7 @@ class CandidateGenerator:
         candidate_threshold: float = 0.65,
         max_spans: int = 64,
         max_token_chars: int = 256,
+        pruning: CandidatePruning | None = None,
     ):
         if isinstance(top_k, bool) or not isinstance(top_k, int) or top_k < 1:
             raise ValueError("top_k must be at least 1")
@@ -37,14 +146,20 @@ class CandidateGenerator:
             or max_token_chars < 1
         ):
             raise ValueError("max_token_chars must be at least 1")
+        if pruning is not None and not isinstance(pruning, CandidatePruning):
+            raise TypeError("pruning must be a CandidatePruning")
         self.mapper = mapper
         self.top_k = top_k
         self.candidate_threshold = candidate_threshold
         self.max_spans = max_spans
         self.max_token_chars = max_token_chars
+        self.pruning = pruning
         self._terms_by_length = sorted(mapper.db_terms, key=lambda term: (-len(term), term))
 
-    def generate(self, text: str) -> tuple[CandidateSpan, ...]:
+    def generate(
+        self, text: str, *, memo: dict[str, tuple[Candidate, ...]] | None = None
+    ) -> tuple[CandidateSpan, ...]:
+        """``memo``를 주면 token 원문별 후보 검색 결과를 그 dict에 재사용합니다."""
         spans = []
         canonical_ranges = self.mapper.canonical_ranges(text)
         for token_index, match in enumerate(LEXICAL_TOKEN_PATTERN.finditer(text)):
@@ -58,7 +173,12 @@ class CandidateGenerator:
                 continue
             if len(source) > self.max_token_chars:
                 continue
-            candidates = self._candidates_for(source)
+            if memo is None:
+                candidates = self._candidates_for(source)
+            else:
+                candidates = memo.get(source)
+                if candidates is None:
+                    candidates = memo[source] = self._candidates_for(source)
             if not candidates:
                 continue
 
@@ -89,6 +209,12 @@ class CandidateGenerator:
                 break
         return tuple(spans)
 
+    def prune(self, spans) -> tuple[CandidateSpan, ...]:
+        """provider 요청에 들어갈 span의 후보만 줄입니다. 설정이 없으면 그대로 둡니다."""
+        if self.pruning is None:
+            return tuple(spans)
+        return self.pruning.prune(spans)
+
     def _candidates_for(self, source: str) -> tuple[Candidate, ...]:
         if source in self.mapper.db_terms and self.mapper._direct_target(source) is None:
             return ()
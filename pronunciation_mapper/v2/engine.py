@@ -3,15 +3,28 @@
 import asyncio
 import math
 import time
-from collections.abc import Mapping
+from collections import deque
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Mapping
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from functools import partial
 from typing import Any
 
 from pronunciation_mapper.mapper import LEXICAL_TOKEN_PATTERN, PronunciationMapper
 from pronunciation_mapper.utils import convert_korean_numbers_correctly
 
-from .candidates import CandidateGenerator
-from .errors import InvalidProviderOutputError, ProviderError
+from .cache import DecisionCache, LRUCache, RewriteCache, fingerprint
+from .candidates import CandidateGenerator, CandidatePruning, LocalConfidenceGate
+from .errors import (
+    CircuitOpenError,
+    DeadlineExceededError,
+    InvalidProviderOutputError,
+    ProviderError,
+    ProviderUnavailableError,
+)
 from .models import (
+    HYPOTHESIS_SPAN_ID,
+    PROVIDER_REASON_CODES,
     AppliedDecision,
     Candidate,
     CandidateSpan,
@@ -23,9 +36,23 @@ from .models import (
     RewriteResult,
 )
 from .providers import DecisionProvider, create_provider
+from .providers.base import (
+    consume_task_exception,
+    elapsed_ms,
+    estimate_prompt_tokens,
+    is_overload_error,
+    warm_up_provider,
+)
+from .resilience import AdaptiveConcurrencyLimiter, CircuitBreaker, CircuitState
+from .runner import BackgroundLoopRunner
+from .segmentation import segment_text
 
 
 MAX_USAGE_INTEGER = 2**63 - 1
+# stream session의 token 원문별 후보 memo가 무한히 커지지 않게 하는 상한.
+MAX_STREAM_MEMO_ENTRIES = 4096
+# provider 문맥을 잘랐을 때 남긴 구간 사이에 넣는 생략 표시.
+_CONTEXT_SEPARATOR = " … "
 
 
 class AgenticPronunciationMapper:
@@ -46,6 +73,22 @@ class AgenticPronunciationMapper:
         max_input_chars: int = 4096,
         max_spans: int = 64,
         max_token_chars: int = 256,
+        result_cache: RewriteCache | None = None,
+        decision_cache: DecisionCache | None = None,
+        decision_context_tokens: int = 2,
+        coalesce_requests: bool = True,
+        deadline_ms: float | None = None,
+        late_results_fill_cache: bool = True,
+        circuit_breaker: CircuitBreaker | None = None,
+        concurrency_limiter: AdaptiveConcurrencyLimiter | None = None,
+        local_gate: LocalConfidenceGate | None = None,
+        candidate_pruning: CandidatePruning | None = None,
+        provider_context_tokens: int | None = None,
+        segment_long_inputs: bool = False,
+        max_concurrent_segments: int = 4,
+        executor: str | Executor | None = None,
+        executor_workers: int | None = None,
+        sync_runner: str | BackgroundLoopRunner | None = None,
     ):
         if isinstance(minimum_confidence, bool) or not isinstance(
             minimum_confidence, (int, float)
@@ -61,6 +104,54 @@ class AgenticPronunciationMapper:
             or max_input_chars < 1
         ):
             raise ValueError("max_input_chars must be at least 1")
+        if result_cache is not None and not isinstance(result_cache, RewriteCache):
+            raise TypeError("result_cache must implement get() and put()")
+        if decision_cache is not None and not isinstance(decision_cache, DecisionCache):
+            raise TypeError("decision_cache must implement get_many() and put_many()")
+        if (
+            isinstance(decision_context_tokens, bool)
+            or not isinstance(decision_context_tokens, int)
+            or decision_context_tokens < 0
+        ):
+            raise ValueError("decision_context_tokens must be a non-negative integer")
+        _validate_deadline_ms(deadline_ms)
+        if circuit_breaker is not None and not isinstance(circuit_breaker, CircuitBreaker):
+            raise TypeError("circuit_breaker must be a CircuitBreaker")
+        if concurrency_limiter is not None and not isinstance(
+            concurrency_limiter, AdaptiveConcurrencyLimiter
+        ):
+            raise TypeError("concurrency_limiter must be an AdaptiveConcurrencyLimiter")
+        if local_gate is not None and not isinstance(local_gate, LocalConfidenceGate):
+            raise TypeError("local_gate must be a LocalConfidenceGate")
+        if provider_context_tokens is not None and (
+            isinstance(provider_context_tokens, bool)
+            or not isinstance(provider_context_tokens, int)
+            or provider_context_tokens < 0
+        ):
+            raise ValueError("provider_context_tokens must be a non-negative integer or None")
+        if (
+            isinstance(max_concurrent_segments, bool)
+            or not isinstance(max_concurrent_segments, int)
+            or max_concurrent_segments < 1
+        ):
+            raise ValueError("max_concurrent_segments must be at least 1")
+        if isinstance(executor, ProcessPoolExecutor):
+            raise TypeError("use executor='process' so each worker holds a pre-built mapper")
+        if executor is not None and not isinstance(executor, Executor) and executor not in {
+            "thread",
+            "process",
+        }:
+            raise ValueError("executor must be 'thread', 'process', an Executor, or None")
+        if executor_workers is not None and (
+            isinstance(executor_workers, bool)
+            or not isinstance(executor_workers, int)
+            or executor_workers < 1
+        ):
+            raise ValueError("executor_workers must be at least 1")
+        if sync_runner is not None and sync_runner != "background" and not isinstance(
+            sync_runner, BackgroundLoopRunner
+        ):
+            raise ValueError("sync_runner must be 'background', a BackgroundLoopRunner, or None")
 
         self.heuristic_mapper = PronunciationMapper(
             db_terms,
@@ -73,6 +164,7 @@ class AgenticPronunciationMapper:
             candidate_threshold=candidate_threshold,
             max_spans=max_spans,
             max_token_chars=max_token_chars,
+            pruning=candidate_pruning,
         )
         self._owns_provider = provider is None or isinstance(provider, str)
         if provider is None or isinstance(provider, str):
@@ -87,137 +179,435 @@ class AgenticPronunciationMapper:
         self.max_input_chars = max_input_chars
         self.max_spans = max_spans
         self.max_token_chars = max_token_chars
+        self.result_cache = result_cache
+        self.decision_cache = decision_cache
+        self.decision_context_tokens = decision_context_tokens
+        self.coalesce_requests = bool(coalesce_requests)
+        self._inflight: dict[tuple[asyncio.AbstractEventLoop, str], _InflightCall] = {}
+        self.deadline_ms = deadline_ms
+        self.late_results_fill_cache = bool(late_results_fill_cache)
+        self.circuit_breaker = circuit_breaker
+        self.concurrency_limiter = concurrency_limiter
+        self.local_gate = local_gate
+        self.provider_context_tokens = provider_context_tokens
+        self.segment_long_inputs = bool(segment_long_inputs)
+        self.max_concurrent_segments = max_concurrent_segments
+        self._owns_executor = isinstance(executor, str)
+        self._executor_kind = "process" if executor == "process" else "thread"
+        if executor == "thread":
+            executor = ThreadPoolExecutor(
+                max_workers=executor_workers, thread_name_prefix="pronunciation-mapper"
+            )
+        elif executor == "process":
+            # worker마다 같은 vocabulary로 mapper를 한 번 만들어 두고 text만
+            # 보냅니다. 이후 vocabulary가 바뀌면 _prepare_async가 pool을 새로 만듭니다.
+            self._executor_workers = executor_workers
+            self._worker_options = {
+                "top_k": top_k,
+                "candidate_threshold": candidate_threshold,
+                "max_spans": max_spans,
+                "max_token_chars": max_token_chars,
+                "pruning": candidate_pruning,
+            }
+            executor = self._new_process_executor()
+        self.executor = executor
+        # rewrite_sync가 호출마다 asyncio.run을 쓰지 않고 한 loop를 공유하게 합니다.
+        self._owns_sync_runner = sync_runner == "background"
+        if sync_runner == "background":
+            sync_runner = BackgroundLoopRunner()
+        self.sync_runner = sync_runner
+        self._vocabulary_fingerprint: tuple[int, str] | None = None
 
-    async def rewrite(self, text: str) -> RewriteResult:
-        if not isinstance(text, str):
-            raise TypeError("text must be a string")
-        if len(text) > self.max_input_chars:
-            raise ValueError(f"text exceeds max_input_chars={self.max_input_chars}")
-
-        started = time.perf_counter()
-        normalized = convert_korean_numbers_correctly(text)
-        lexical_tokens = tuple(LEXICAL_TOKEN_PATTERN.finditer(normalized))
-        if len(lexical_tokens) > self.max_spans:
-            raise ValueError(f"text exceeds max_spans={self.max_spans}")
-        if any(len(match.group(0)) > self.max_token_chars for match in lexical_tokens):
-            raise ValueError(
-                f"text contains a token exceeding max_token_chars={self.max_token_chars}"
+    @property
+    def vocabulary_fingerprint(self) -> str:
+        """canonical vocabulary와 alias 규칙의 내용 기반 hash입니다."""
+        generation = self.heuristic_mapper.vocabulary_generation
+        if self._vocabulary_fingerprint is None or self._vocabulary_fingerprint[0] != generation:
+            value = fingerprint(
+                sorted(self.heuristic_mapper.db_terms),
+                sorted(self.heuristic_mapper.term_mappings.items()),
             )
-        spans = self.candidate_generator.generate(normalized)
-        diagnostics = []
-        if normalized != text:
-            diagnostics.append("number-normalization-applied")
+            self._vocabulary_fingerprint = (generation, value)
+        return self._vocabulary_fingerprint[1]
 
-        selected: dict[str, Candidate | None] = {}
-        applied: dict[str, AppliedDecision] = {}
-        unresolved = []
+    async def rewrite(self, text: str, *, deadline_ms: float | None = None) -> RewriteResult:
+        """문장을 rewrite합니다.
 
-        for span in spans:
-            deterministic = self._candidate_by_id(span, span.deterministic_candidate_id)
-            if deterministic is None:
-                unresolved.append(span)
-                continue
-            self._assert_candidate_is_safe(deterministic)
-            selected[span.id] = deterministic
-            applied[span.id] = self._applied(
-                span,
-                deterministic,
-                action=DecisionAction.REPLACE.value,
-                confidence=1.0,
-                reason_code=ReasonCode.ALIAS.value,
+        ``deadline_ms``(또는 mapper 기본값)가 있으면 호출 시작부터 그 시간 안에
+        provider가 답하지 않을 때 미리 계산된 heuristic 후보로 즉시 반환하고
+        ``deadline-fallback`` 진단을 남깁니다.
+
+        ``segment_long_inputs``가 켜져 있으면 ``max_input_chars``나 ``max_spans``를
+        넘는 입력을 문장·절 경계에서 나눠 동시에 rewrite한 뒤 하나의 결과로
+        합칩니다.
+        """
+        _validate_deadline_ms(deadline_ms)
+        deadline_at = self._deadline_at(deadline_ms)
+        if self.segment_long_inputs and isinstance(text, str) and not self._fits_limits(text):
+            return await self._rewrite_segmented(text, deadline_at)
+        return await self._rewrite_one(text, deadline_at)
+
+    async def _rewrite_one(self, text: str, deadline_at: float | None) -> RewriteResult:
+        prepared = await self._prepare_async(text)
+        if not prepared.unresolved:
+            return self._finish(prepared, provider="local-deterministic", model="", usage={})
+        cached = self._cached_result(prepared)
+        if cached is not None:
+            return cached
+        await self._resolve_cached_decisions(prepared)
+        if not prepared.unresolved:
+            return self._finish_from_decision_cache(prepared)
+
+        request = self._provider_request(prepared)
+        try:
+            if deadline_at is None:
+                response = await self._decide(request)
+            else:
+                response = await self._decide_before_deadline(
+                    request,
+                    deadline_at,
+                    lambda late: self._decision_items(prepared, late.selections),
+                )
+                if response is None:
+                    return self._finish_at_deadline(prepared)
+            self._apply_selections(prepared, response.selections)
+            await self._remember_decisions(prepared, response.selections)
+        except (ProviderError, ConnectionError, TimeoutError, OSError) as error:
+            if self.fallback_strategy == "raise":
+                raise
+            return self._finish_with_fallback(prepared, error)
+        result = self._finish(
+            prepared,
+            provider=response.provider,
+            model=response.model,
+            usage=dict(response.usage),
+        )
+        self._remember_result(prepared, result)
+        return result
+
+    async def rewrite_many(
+        self,
+        texts,
+        *,
+        max_batch_spans: int | None = None,
+        max_batch_chars: int | None = None,
+    ) -> tuple[RewriteResult, ...]:
+        """여러 문장의 미해결 span을 적은 수의 provider 요청으로 묶어 판정합니다.
+
+        batch는 입력 순서대로 span 수와 문자 수 예산을 넘지 않게 채우며, 한 문장의
+        span은 여러 batch로 나누지 않습니다. 같은 batch의 결과는 provider usage를
+        공유하고 ``provider-batch:<index>`` 진단으로 구분됩니다.
+        """
+        if isinstance(texts, (str, bytes)):
+            raise TypeError("texts must be an iterable of strings, not a string")
+        max_batch_spans = self.max_spans if max_batch_spans is None else max_batch_spans
+        max_batch_chars = self.max_input_chars if max_batch_chars is None else max_batch_chars
+        for name, value in (
+            ("max_batch_spans", max_batch_spans),
+            ("max_batch_chars", max_batch_chars),
+        ):
+            if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+                raise ValueError(f"{name} must be at least 1")
+
+        prepared = list(await asyncio.gather(*(self._prepare_async(text) for text in texts)))
+        results: list[RewriteResult | None] = [None] * len(prepared)
+        for index, item in enumerate(prepared):
+            if item.unresolved:
+                results[index] = self._cached_result(item)
+        lookups = [
+            index
+            for index, (item, result) in enumerate(zip(prepared, results))
+            if item.unresolved and result is None
+        ]
+        await asyncio.gather(*(self._resolve_cached_decisions(prepared[index]) for index in lookups))
+        for index in lookups:
+            if not prepared[index].unresolved:
+                results[index] = self._finish_from_decision_cache(prepared[index])
+        pending = [
+            index
+            for index, (item, result) in enumerate(zip(prepared, results))
+            if item.unresolved and result is None
+        ]
+        requests = {index: self._provider_request(prepared[index]) for index in pending}
+        batches = self._pack_batches(requests, pending, max_batch_spans, max_batch_chars)
+        outcomes = await asyncio.gather(
+            *(
+                self._decide_batch(prepared, requests, batch, batch_index)
+                for batch_index, batch in enumerate(batches)
             )
+        )
+        for outcome in outcomes:
+            for index, result in outcome:
+                results[index] = result
+        return tuple(
+            result
+            if result is not None
+            else self._finish(item, provider="local-deterministic", model="", usage={})
+            for item, result in zip(prepared, results)
+        )
 
-        fallback_used = False
-        provider_name = "local-deterministic"
-        model_name = ""
-        usage = {}
+    async def rewrite_stream(
+        self,
+        source: AsyncIterable[str],
+        *,
+        concurrency: int = 4,
+        ordered: bool = True,
+        deadline_ms: float | None = None,
+    ) -> AsyncIterator[RewriteResult]:
+        """비동기 입력을 최대 ``concurrency``개까지 동시에 rewrite하며 결과를 내보냅니다.
 
-        if unresolved:
-            request = DecisionRequest(text=normalized, spans=tuple(unresolved))
-            try:
-                response = await self.provider.decide(request)
-                self._validate_response(response, unresolved)
-                provider_name = response.provider
-                model_name = response.model
-                usage = dict(response.usage)
-                selection_by_span = {
-                    selection.span_id: selection for selection in response.selections
-                }
-                for span in unresolved:
-                    selection = selection_by_span[span.id]
-                    candidate = self._candidate_by_id(span, selection.candidate_id)
-                    if (
-                        selection.action is DecisionAction.REPLACE
-                        and selection.confidence >= self.minimum_confidence
-                        and candidate is not None
-                    ):
-                        self._assert_candidate_is_safe(candidate)
-                        selected[span.id] = candidate
-                        applied[span.id] = self._applied(
-                            span,
-                            candidate,
-                            action=selection.action.value,
-                            confidence=selection.confidence,
-                            reason_code=selection.reason_code.value,
+        진행 중인 rewrite가 창을 채우면 ``source``에서 더 읽지 않으므로 느린
+        provider나 소비자가 입력 쪽으로 backpressure를 전달합니다. ``ordered``가
+        참이면 입력 순서대로, 거짓이면 끝나는 순서대로 내보냅니다. 한 항목이
+        예외를 내면 남은 작업을 취소하고 그 예외를 그대로 전달합니다.
+        """
+        if isinstance(concurrency, bool) or not isinstance(concurrency, int) or concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        if not isinstance(source, AsyncIterable):
+            raise TypeError("source must be an async iterable of strings")
+        _validate_deadline_ms(deadline_ms)
+
+        iterator = aiter(source)
+        in_flight: deque[asyncio.Task] = deque()
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(in_flight) < concurrency:
+                    try:
+                        text = await anext(iterator)
+                    except StopAsyncIteration:
+                        exhausted = True
+                        break
+                    in_flight.append(
+                        asyncio.ensure_future(self.rewrite(text, deadline_ms=deadline_ms))
+                    )
+                if not in_flight:
+                    return
+                if ordered:
+                    yield await in_flight.popleft()
+                    continue
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in [task for task in in_flight if task in done]:
+                    in_flight.remove(task)
+                    yield task.result()
+        finally:
+            for task in in_flight:
+                task.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
+
+    async def rewrite_nbest(
+        self, hypotheses, *, deadline_ms: float | None = None
+    ) -> tuple[RewriteResult, ...]:
+        """ASR n-best 가설을 한 번의 provider 요청으로 rewrite하고 순위를 매깁니다.
+
+        후보 검색은 가설 전체에서 고유 token마다 한 번만 수행하고, 여러 가설에서
+        같은 위치에 나오는 같은 span은 요청에 한 번만 넣어 그 판정을 함께
+        적용합니다. 요청에는 가설 자체를 고르는 ``hyp`` span도 넣고, 모델이 고른
+        가설을 첫 번째로, 나머지는 입력 순서대로 반환합니다. 선택이 없거나
+        provider를 쓸 수 없으면 입력 순서를 유지합니다. ``deadline_ms``와
+        ``executor``는 ``rewrite()``와 같게 적용합니다.
+        """
+        if isinstance(hypotheses, (str, bytes)):
+            raise TypeError("hypotheses must be an iterable of strings, not a string")
+        _validate_deadline_ms(deadline_ms)
+        deadline_at = self._deadline_at(deadline_ms)
+        candidate_memo: dict[str, tuple[Candidate, ...]] = {}
+        prepared = [
+            await self._prepare_async(text, candidate_memo=candidate_memo) for text in hypotheses
+        ]
+        if not prepared:
+            raise ValueError("hypotheses must not be empty")
+        await asyncio.gather(*(self._resolve_cached_decisions(item) for item in prepared))
+
+        # 가설마다 "#<index> " 번호를 붙인 줄로 잇고, span은 처음 나온 가설의
+        # prefix("h<index>.")를 붙여 한 번만 보냅니다. shared는 보낸 span ID마다
+        # 그 판정을 적용할 (가설 index, 원래 span) 목록입니다.
+        parts = []
+        spans = []
+        shared: dict[str, list[tuple[int, CandidateSpan]]] = {}
+        sent_ids: dict[tuple, str] = {}
+        positions: dict[str, int] = {}
+        offset = 0
+        for index, item in enumerate(prepared):
+            label = f"#{index} "
+            for span in item.unresolved:
+                key = (
+                    span.start,
+                    span.end,
+                    span.source,
+                    tuple(candidate.replacement for candidate in span.candidates),
+                )
+                if key not in sent_ids:
+                    (sent,) = self._prefixed_spans([span], f"h{index}.", offset + len(label), {})
+                    positions.update(
+                        (candidate.id, position) for position, candidate in enumerate(sent.candidates)
+                    )
+                    sent_ids[key] = sent.id
+                    shared[sent.id] = []
+                    spans.append(sent)
+                shared[sent_ids[key]].append((index, span))
+            parts.append(label + item.normalized)
+            offset += len(parts[-1]) + 1
+        hypothesis_ids = {}
+        if len({item.normalized for item in prepared}) > 1:
+            hypothesis_ids = {f"{HYPOTHESIS_SPAN_ID}:c{index}": index for index in range(len(prepared))}
+            # 거리는 가설 사이에 우열을 주지 않도록 모두 0으로 둡니다.
+            spans.insert(
+                0,
+                CandidateSpan(
+                    id=HYPOTHESIS_SPAN_ID,
+                    start=0,
+                    end=0,
+                    source="n-best",
+                    candidates=tuple(
+                        Candidate(
+                            id=candidate_id,
+                            replacement=f"#{index}",
+                            canonical_terms=(),
+                            distance=0.0,
+                            method="hypothesis",
                         )
-                    elif selection.action is DecisionAction.REPLACE:
-                        diagnostics.append(f"low-confidence:{span.id}")
-                        selected[span.id] = None
-                        applied[span.id] = self._applied(
-                            span,
-                            None,
-                            action=DecisionAction.KEEP.value,
-                            confidence=selection.confidence,
-                            reason_code=ReasonCode.AMBIGUOUS.value,
+                        for candidate_id, index in hypothesis_ids.items()
+                    ),
+                ),
+            )
+
+        def split(response: ProviderResponse) -> dict[int, list[ProviderSelection]]:
+            selections: dict[int, list[ProviderSelection]] = {
+                index: [] for index in range(len(prepared))
+            }
+            for selection in response.selections:
+                if selection.span_id == HYPOTHESIS_SPAN_ID:
+                    continue
+                position = positions.get(selection.candidate_id)
+                for index, span in shared[selection.span_id]:
+                    selections[index].append(
+                        replace(
+                            selection,
+                            span_id=span.id,
+                            candidate_id=None if position is None else span.candidates[position].id,
                         )
-                    else:
-                        selected[span.id] = None
-                        applied[span.id] = self._applied(
-                            span,
-                            None,
-                            action=selection.action.value,
-                            confidence=selection.confidence,
-                            reason_code=selection.reason_code.value,
+                    )
+            return selections
+
+        def late_items(response: ProviderResponse) -> dict[str, Any]:
+            return {
+                key: value
+                for index, selections in split(response).items()
+                for key, value in self._decision_items(prepared[index], selections).items()
+            }
+
+        chosen = None
+        provider, model, usage = "local-deterministic", "", {}
+        if spans:
+            request = DecisionRequest(text="\n".join(parts), spans=tuple(spans))
+            try:
+                if deadline_at is None:
+                    response = await self._decide(request)
+                else:
+                    response = await self._decide_before_deadline(request, deadline_at, late_items)
+                    if response is None:
+                        return tuple(
+                            self._finish_at_deadline(item)
+                            if item.unresolved
+                            else self._finish(item, provider="local-deterministic", model="", usage={})
+                            for item in prepared
                         )
             except (ProviderError, ConnectionError, TimeoutError, OSError) as error:
                 if self.fallback_strategy == "raise":
                     raise
-                fallback_used = True
-                provider_name = getattr(self.provider, "name", "unknown")
-                model_name = getattr(self.provider, "model", "")
-                diagnostics.append(f"provider-fallback:{type(error).__name__}")
-                self._apply_fallback(unresolved, selected, applied)
+                return tuple(
+                    self._finish_with_fallback(item, error)
+                    if item.unresolved
+                    else self._finish(item, provider="local-deterministic", model="", usage={})
+                    for item in prepared
+                )
+            for selection in response.selections:
+                if (
+                    selection.span_id == HYPOTHESIS_SPAN_ID
+                    and selection.action is DecisionAction.REPLACE
+                    and selection.confidence >= self.minimum_confidence
+                ):
+                    chosen = hypothesis_ids[selection.candidate_id]
+            selections = split(response)
+            for index, item in enumerate(prepared):
+                self._apply_selections(item, selections[index])
+            await asyncio.gather(
+                *(
+                    self._remember_decisions(item, selections[index])
+                    for index, item in enumerate(prepared)
+                )
+            )
+            provider, model, usage = response.provider, response.model, dict(response.usage)
 
-        rewritten = self._render(normalized, spans, selected)
-        ordered_decisions = tuple(
-            applied[span.id] for span in spans if span.id in applied
-        )
-        return RewriteResult(
-            original_text=text,
-            normalized_text=normalized,
-            rewritten_text=rewritten,
-            provider=provider_name,
-            model=model_name,
-            fallback_used=fallback_used,
-            decisions=ordered_decisions,
-            latency_ms=round((time.perf_counter() - started) * 1000, 3),
-            usage=usage,
-            diagnostics=tuple(diagnostics),
-        )
+        results = []
+        for index, item in enumerate(prepared):
+            item.diagnostics.append(f"nbest:{index}")
+            if index == chosen:
+                item.diagnostics.append("nbest-selected")
+            results.append(self._finish(item, provider=provider, model=model, usage=usage))
+        if chosen is not None:
+            results.insert(0, results.pop(chosen))
+        return tuple(results)
+
+    def stream_session(self, *, debounce_ms: float = 300.0) -> "StreamSession":
+        """ASR partial을 차례로 받아 증분 rewrite하는 session을 만듭니다."""
+        return StreamSession(self, debounce_ms=debounce_ms)
 
     def rewrite_sync(self, text: str) -> RewriteResult:
+        return self._run_sync("rewrite_sync", self.rewrite, text)
+
+    async def awarm_up(self) -> dict[str, float]:
+        """첫 rewrite가 치를 준비 비용을 미리 치르고 단계별 소요 시간(ms)을 반환합니다.
+
+        로컬 단계(``local``)는 정규화·후보 생성 경로와 executor worker를 깨우고,
+        provider 단계(``provider.<step>``)는 provider의 ``warm_up()``을 실행합니다.
+        loop에 묶인 client를 준비하므로 실제 요청과 같은 loop에서 호출해야 합니다.
+        """
+        timings = {}
+        started = time.perf_counter()
+        await self._prepare_async("워밍업 warm-up")
+        timings["local"] = elapsed_ms(started)
+        for step, value in (await warm_up_provider(self.provider)).items():
+            timings[f"provider.{step}"] = value
+        return timings
+
+    def warm_up(self) -> dict[str, float]:
+        """``awarm_up()``의 동기 버전. ``sync_runner``가 없으면 준비한 loop 자원이 호출 뒤 닫힙니다."""
+        return self._run_sync("warm_up", self.awarm_up)
+
+    def _run_sync(self, sync_name: str, method, *args):
         try:
             asyncio.get_running_loop()
         except RuntimeError:
-            return asyncio.run(self.rewrite(text))
-        raise RuntimeError("rewrite_sync cannot run inside an event loop; use 'await rewrite(...)'")
+            if self.sync_runner is not None:
+                return self.sync_runner.run(method(*args))
+            return asyncio.run(method(*args))
+        raise RuntimeError(
+            f"{sync_name} cannot run inside an event loop; use 'await {method.__name__}(...)'"
+        )
 
     def map_sentence(self, sentence: str) -> str:
         """동기 애플리케이션을 위한 간단한 문자열 projection."""
         return self.rewrite_sync(sentence).rewritten_text
 
     def close(self) -> None:
-        """이 mapper가 factory로 만든 provider 리소스를 해제합니다."""
+        """이 mapper가 factory로 만든 provider와 executor 리소스를 해제합니다.
+
+        ``sync_runner``가 실행 중이면 provider를 그 loop에서 ``aclose()``로 닫고,
+        mapper가 만든 runner라면 loop thread도 멈춥니다.
+        """
+        runner = self.sync_runner
+        if runner is not None:
+            try:
+                if runner.running:
+                    runner.run(self.aclose())
+                    return
+            finally:
+                if self._owns_sync_runner:
+                    runner.close()
+        self._shutdown_executor()
         if not self._owns_provider:
             return
         close = getattr(self.provider, "close", None)
@@ -225,7 +615,9 @@ class AgenticPronunciationMapper:
             close()
 
     async def aclose(self) -> None:
-        """이 mapper가 factory로 만든 provider 리소스를 비동기로 해제합니다."""
+        """이 mapper가 factory로 만든 provider와 executor 리소스를 비동기로 해제합니다."""
+        if self._owns_executor and self.executor is not None:
+            await asyncio.to_thread(self._shutdown_executor)
         if not self._owns_provider:
             return
         aclose = getattr(self.provider, "aclose", None)
@@ -236,6 +628,33 @@ class AgenticPronunciationMapper:
         if callable(close):
             await asyncio.to_thread(close)
 
+    def _new_process_executor(self) -> ProcessPoolExecutor:
+        self._executor_generation = self.heuristic_mapper.vocabulary_generation
+        return ProcessPoolExecutor(
+            max_workers=self._executor_workers,
+            initializer=_init_analysis_worker,
+            initargs=(
+                list(self.heuristic_mapper.db_terms),
+                dict(self.heuristic_mapper.term_mappings),
+                self.heuristic_mapper.threshold,
+                self._worker_options,
+            ),
+        )
+
+    def _restart_process_executor(self) -> None:
+        """vocabulary가 바뀐 뒤 새 vocabulary로 초기화한 worker pool로 교체합니다.
+
+        이전 pool은 기다리지 않고 닫으므로 이미 제출된 분석은 그대로 끝납니다.
+        """
+        executor, self.executor = self.executor, self._new_process_executor()
+        executor.shutdown(wait=False)
+
+    def _shutdown_executor(self) -> None:
+        if not self._owns_executor or self.executor is None:
+            return
+        executor, self.executor = self.executor, None
+        executor.shutdown(wait=True)
+
     def __enter__(self):
         return self
 
@@ -250,6 +669,746 @@ class AgenticPronunciationMapper:
         await self.aclose()
         return False
 
+    def _fits_limits(self, text: str) -> bool:
+        if len(text) > self.max_input_chars:
+            return False
+        normalized = convert_korean_numbers_correctly(text)
+        return sum(1 for _ in LEXICAL_TOKEN_PATTERN.finditer(normalized)) <= self.max_spans
+
+    async def _rewrite_segmented(self, text: str, deadline_at: float | None) -> RewriteResult:
+        # 구간은 각각 한도 안이므로 다시 나뉘지 않습니다. 동시 실행 수를 제한해
+        # provider에 한꺼번에 몰리지 않게 하면서 전체 지연은 가장 느린 구간에
+        # 가깝게 둡니다. 모든 구간이 호출 시작 기준의 같은 마감을 공유하므로
+        # 마감 뒤에 차례가 온 구간은 provider를 부르지 않고 fallback합니다.
+        started = time.perf_counter()
+        bounds = segment_text(text, self._fits_limits)
+        semaphore = asyncio.Semaphore(self.max_concurrent_segments)
+
+        async def rewrite_segment(start: int, end: int) -> RewriteResult:
+            async with semaphore:
+                return await self._rewrite_one(text[start:end], deadline_at)
+
+        results = await asyncio.gather(*(rewrite_segment(start, end) for start, end in bounds))
+        return self._stitch_segments(text, bounds, results, started)
+
+    @staticmethod
+    def _stitch_segments(
+        text: str,
+        bounds: tuple[tuple[int, int], ...],
+        results,
+        started: float,
+    ) -> RewriteResult:
+        # 구간 사이 간격은 공백뿐이라 원문 그대로 잇고, span ID는 합친 정규화
+        # 문장 기준 token 순번으로 다시 매겨 분할하지 않은 결과와 같은 형태로
+        # 둡니다. 원문 offset은 segment:<index>:<start>-<end> 진단에 남깁니다.
+        normalized_parts = []
+        rewritten_parts = []
+        decisions = []
+        usage: dict[str, int | float | str | None] = {}
+        diagnostics = [f"segmented:{len(bounds)}"]
+        cursor = 0
+        token_offset = 0
+        for index, ((start, end), result) in enumerate(zip(bounds, results)):
+            gap = text[cursor:start]
+            normalized_parts.extend((gap, result.normalized_text))
+            rewritten_parts.extend((gap, result.rewritten_text))
+            decisions.extend(_shift_decision(decision, token_offset) for decision in result.decisions)
+            diagnostics.append(f"segment:{index}:{start}-{end}")
+            diagnostics.extend(f"segment:{index}:{diagnostic}" for diagnostic in result.diagnostics)
+            for key, value in result.usage.items():
+                current = usage.get(key)
+                if (
+                    isinstance(current, (int, float))
+                    and isinstance(value, (int, float))
+                    and not isinstance(current, bool)
+                    and not isinstance(value, bool)
+                ):
+                    usage[key] = current + value
+                elif key not in usage:
+                    usage[key] = value
+            token_offset += sum(1 for _ in LEXICAL_TOKEN_PATTERN.finditer(result.normalized_text))
+            cursor = end
+        normalized_parts.append(text[cursor:])
+        rewritten_parts.append(text[cursor:])
+
+        answered = next(
+            (result for result in results if result.provider != "local-deterministic"),
+            results[0],
+        )
+        return RewriteResult(
+            original_text=text,
+            normalized_text="".join(normalized_parts),
+            rewritten_text="".join(rewritten_parts),
+            provider=answered.provider,
+            model=answered.model,
+            fallback_used=any(result.fallback_used for result in results),
+            decisions=tuple(decisions),
+            latency_ms=round((time.perf_counter() - started) * 1000, 3),
+            usage=usage,
+            diagnostics=tuple(diagnostics),
+        )
+
+    async def _prepare_async(
+        self,
+        text: str,
+        *,
+        candidate_memo: dict[str, tuple[Candidate, ...]] | None = None,
+    ) -> "_PreparedRewrite":
+        """executor가 있으면 정규화와 후보 생성을 event loop 밖에서 수행합니다.
+
+        ``candidate_memo``는 thread executor와 loop 안 처리에서만 공유됩니다.
+        """
+        if self.executor is None or not isinstance(text, str) or len(text) > self.max_input_chars:
+            return self._prepare(text, candidate_memo=candidate_memo)
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        restarted = False
+        if self._executor_kind == "process":
+            if self.heuristic_mapper.vocabulary_generation != self._executor_generation:
+                self._restart_process_executor()
+                restarted = True
+            analysis = await loop.run_in_executor(self.executor, _analyse_in_worker, text)
+        else:
+            analysis = await loop.run_in_executor(
+                self.executor,
+                partial(
+                    _analyse,
+                    self.candidate_generator,
+                    text,
+                    max_spans=self.max_spans,
+                    max_token_chars=self.max_token_chars,
+                    memo=candidate_memo,
+                ),
+            )
+        prepared = self._prepare(text, analysis=analysis, started=started)
+        if restarted:
+            prepared.diagnostics.append("executor-restarted:vocabulary")
+        return prepared
+
+    def _prepare(
+        self,
+        text: str,
+        *,
+        candidate_memo: dict[str, tuple[Candidate, ...]] | None = None,
+        analysis: "_Analysis | None" = None,
+        started: float | None = None,
+    ) -> "_PreparedRewrite":
+        """숫자 정규화, 후보 생성, deterministic 선택까지의 로컬 단계를 수행합니다."""
+        if not isinstance(text, str):
+            raise TypeError("text must be a string")
+        if len(text) > self.max_input_chars:
+            raise ValueError(f"text exceeds max_input_chars={self.max_input_chars}")
+
+        started = time.perf_counter() if started is None else started
+        if analysis is None:
+            analysis = _analyse(
+                self.candidate_generator,
+                text,
+                max_spans=self.max_spans,
+                max_token_chars=self.max_token_chars,
+                memo=candidate_memo,
+            )
+        normalized, token_bounds, spans = analysis
+        prepared = _PreparedRewrite(
+            text=text,
+            normalized=normalized,
+            spans=spans,
+            started=started,
+            token_bounds=token_bounds,
+        )
+        if normalized != text:
+            prepared.diagnostics.append("number-normalization-applied")
+
+        for span in prepared.spans:
+            deterministic = self._candidate_by_id(span, span.deterministic_candidate_id)
+            if deterministic is None:
+                gated = None if self.local_gate is None else self.local_gate.select(span)
+                if gated is None:
+                    prepared.unresolved.append(span)
+                    continue
+                self._assert_candidate_is_safe(gated)
+                prepared.selected[span.id] = gated
+                prepared.applied[span.id] = self._applied(
+                    span,
+                    gated,
+                    action=DecisionAction.REPLACE.value,
+                    confidence=max(0.0, 1.0 - gated.distance),
+                    reason_code=ReasonCode.LOCAL_CONFIDENCE.value,
+                )
+                continue
+            self._assert_candidate_is_safe(deterministic)
+            prepared.selected[span.id] = deterministic
+            prepared.applied[span.id] = self._applied(
+                span,
+                deterministic,
+                action=DecisionAction.REPLACE.value,
+                confidence=1.0,
+                reason_code=ReasonCode.ALIAS.value,
+            )
+        # 로컬에서 확정되지 않은 span만 provider로 가므로 후보 예산도 이들에만
+        # 적용합니다. 1위 후보는 남아 fallback 결과는 달라지지 않습니다.
+        prepared.unresolved = list(self.candidate_generator.prune(prepared.unresolved))
+        return prepared
+
+    async def _decide(self, request: DecisionRequest) -> ProviderResponse:
+        response = await self._call_provider(request)
+        self._validate_response(response, list(request.spans))
+        return response
+
+    def _deadline_at(self, deadline_ms: float | None) -> float | None:
+        """호출별 또는 mapper 기본 지연 예산을 ``time.perf_counter()`` 기준 마감 시각으로 바꿉니다."""
+        deadline_ms = self.deadline_ms if deadline_ms is None else deadline_ms
+        if deadline_ms is None:
+            return None
+        return time.perf_counter() + deadline_ms / 1000
+
+    async def _decide_before_deadline(
+        self,
+        request: DecisionRequest,
+        deadline_at: float,
+        late_items: Callable[[ProviderResponse], dict[str, Any]],
+    ) -> ProviderResponse | None:
+        """마감 전에 응답이 오면 검증된 응답을, 아니면 ``None``을 반환합니다.
+
+        늦게 도착한 응답은 ``late_items``로 판정 cache 항목을 만들어 저장합니다.
+        """
+        remaining = deadline_at - time.perf_counter()
+        if remaining <= 0:
+            return None
+        task = asyncio.ensure_future(self._call_provider(request))
+        try:
+            done, _ = await asyncio.wait({task}, timeout=remaining)
+        except asyncio.CancelledError:
+            # asyncio.wait는 기다리던 task를 취소하지 않으므로 호출자가 떠날 때 직접 취소합니다.
+            task.cancel()
+            task.add_done_callback(consume_task_exception)
+            raise
+        if task in done:
+            response = task.result()
+            self._validate_response(response, list(request.spans))
+            return response
+
+        if self.late_results_fill_cache and self.decision_cache is not None:
+            # 늦게 도착한 판정은 이번 결과에는 쓰지 않고 다음 요청을 위해 저장합니다.
+            task.add_done_callback(
+                lambda late: self._remember_late_decisions(request, late_items, late)
+            )
+        else:
+            task.cancel()
+            task.add_done_callback(consume_task_exception)
+        return None
+
+    def _remember_late_decisions(
+        self,
+        request: DecisionRequest,
+        late_items: Callable[[ProviderResponse], dict[str, Any]],
+        task: asyncio.Future,
+    ) -> None:
+        if task.cancelled() or task.exception() is not None:
+            return
+        response = task.result()
+        try:
+            self._validate_response(response, list(request.spans))
+        except InvalidProviderOutputError:
+            return
+        items = late_items(response)
+        if items:
+            # done callback 안이므로 기다리지 않고 저장만 맡깁니다.
+            self._decision_cache_call(self.decision_cache.put_many, items).add_done_callback(
+                consume_task_exception
+            )
+
+    def _finish_at_deadline(self, prepared: "_PreparedRewrite") -> RewriteResult:
+        if self.fallback_strategy == "raise":
+            raise DeadlineExceededError("provider did not answer within the rewrite deadline")
+        prepared.diagnostics.append("deadline-fallback")
+        self._apply_fallback(prepared.unresolved, prepared.selected, prepared.applied)
+        return self._finish(
+            prepared,
+            provider=getattr(self.provider, "name", "unknown"),
+            model=getattr(self.provider, "model", ""),
+            usage={},
+            fallback_used=True,
+        )
+
+    async def _call_provider(self, request: DecisionRequest) -> ProviderResponse:
+        """동시에 도착한 동일 요청은 하나의 ``provider.decide()`` 결과를 공유합니다.
+
+        공유 호출은 ``asyncio.shield``로 감싸므로 대기자 하나가 취소되어도 다른
+        대기자의 호출은 계속됩니다. 마지막 대기자까지 떠나면 공유 호출도 취소해
+        limiter 슬롯과 half-open 시험 슬롯을 바로 돌려줍니다. 늦은 결과로 cache를
+        채우려는 호출자는 대기를 취소하지 않으므로 공유 호출이 유지됩니다. 응답
+        검증은 대기자마다 따로 수행합니다.
+        """
+        if not self.coalesce_requests:
+            self._check_circuit()
+            return await self._guarded_decide(request)
+        loop = asyncio.get_running_loop()
+        key = (
+            loop,
+            fingerprint(
+                "decision-request",
+                request.to_provider_payload(),
+                getattr(self.provider, "name", ""),
+                getattr(self.provider, "model", ""),
+            ),
+        )
+        call = self._inflight.get(key)
+        if call is None:
+            # 진행 중인 호출에 합류하는 대기자는 half-open 시험 슬롯을 쓰지 않습니다.
+            self._check_circuit()
+            call = _InflightCall(loop.create_task(self._guarded_decide(request)))
+            self._inflight[key] = call
+            call.task.add_done_callback(lambda done: self._forget_inflight(key, done))
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if not call.waiters and not call.task.done():
+                # 새 대기자가 취소 중인 호출에 합류하지 않도록 먼저 목록에서 뺍니다.
+                self._forget_inflight(key, call.task)
+                call.task.cancel()
+
+    def _check_circuit(self) -> None:
+        if self.circuit_breaker is not None and not self.circuit_breaker.allow():
+            raise CircuitOpenError(
+                f"{getattr(self.provider, 'name', 'provider')} circuit is open"
+            )
+
+    async def _guarded_decide(self, request: DecisionRequest) -> ProviderResponse:
+        limiter = self.concurrency_limiter
+        if limiter is None:
+            return await self._breaker_decide(request)
+        try:
+            started = await limiter.acquire()
+        except BaseException:
+            # provider에 도달하지 않았으므로 예약한 half-open 시험 슬롯만 돌려줍니다.
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.record_cancelled()
+            raise
+        try:
+            response = await self._breaker_decide(request)
+        except BaseException as error:
+            if is_overload_error(error):
+                limiter.record_overload(started)
+            else:
+                limiter.record_ignored()
+            raise
+        # 응답 시간은 요청 크기에 비례하므로 추정 입력 토큰 단위로 비교합니다.
+        limiter.record_success(
+            started,
+            size=estimate_prompt_tokens(
+                request.text,
+                *(candidate.replacement for span in request.spans for candidate in span.candidates),
+            ),
+        )
+        return response
+
+    async def _breaker_decide(self, request: DecisionRequest) -> ProviderResponse:
+        breaker = self.circuit_breaker
+        if breaker is None:
+            return await self.provider.decide(request)
+        try:
+            response = await self.provider.decide(request)
+        except (
+            ProviderUnavailableError,
+            ConnectionError,
+            TimeoutError,
+            asyncio.TimeoutError,
+            OSError,
+        ):
+            breaker.record_failure()
+            raise
+        except asyncio.CancelledError:
+            breaker.record_cancelled()
+            raise
+        except BaseException:
+            # 설정 오류나 잘못된 출력은 provider에 도달했다는 뜻이므로 가용성
+            # 실패로 세지 않습니다.
+            breaker.record_success()
+            raise
+        breaker.record_success()
+        return response
+
+    def _forget_inflight(self, key: tuple[asyncio.AbstractEventLoop, str], task: asyncio.Task) -> None:
+        call = self._inflight.get(key)
+        if call is not None and call.task is task:
+            del self._inflight[key]
+        if task.done():
+            # 모든 대기자가 취소된 뒤 실패한 호출도 "never retrieved" 경고를 남기지 않습니다.
+            consume_task_exception(task)
+
+    def _apply_selections(
+        self,
+        prepared: "_PreparedRewrite",
+        selections,
+    ) -> None:
+        selection_by_span = {selection.span_id: selection for selection in selections}
+        for span in prepared.unresolved:
+            selection = selection_by_span.get(span.id)
+            if selection is None:
+                continue
+            candidate = self._candidate_by_id(span, selection.candidate_id)
+            if (
+                selection.action is DecisionAction.REPLACE
+                and selection.confidence >= self.minimum_confidence
+                and candidate is not None
+            ):
+                self._assert_candidate_is_safe(candidate)
+                prepared.selected[span.id] = candidate
+                prepared.applied[span.id] = self._applied(
+                    span,
+                    candidate,
+                    action=selection.action.value,
+                    confidence=selection.confidence,
+                    reason_code=selection.reason_code.value,
+                )
+            elif selection.action is DecisionAction.REPLACE:
+                prepared.diagnostics.append(f"low-confidence:{span.id}")
+                prepared.selected[span.id] = None
+                prepared.applied[span.id] = self._applied(
+                    span,
+                    None,
+                    action=DecisionAction.KEEP.value,
+                    confidence=selection.confidence,
+                    reason_code=ReasonCode.AMBIGUOUS.value,
+                )
+            else:
+                prepared.selected[span.id] = None
+                prepared.applied[span.id] = self._applied(
+                    span,
+                    None,
+                    action=selection.action.value,
+                    confidence=selection.confidence,
+                    reason_code=selection.reason_code.value,
+                )
+
+    def _finish_with_fallback(
+        self,
+        prepared: "_PreparedRewrite",
+        error: BaseException,
+    ) -> RewriteResult:
+        prepared.diagnostics.append(f"provider-fallback:{type(error).__name__}")
+        self._apply_fallback(prepared.unresolved, prepared.selected, prepared.applied)
+        return self._finish(
+            prepared,
+            provider=getattr(self.provider, "name", "unknown"),
+            model=getattr(self.provider, "model", ""),
+            usage={},
+            fallback_used=True,
+        )
+
+    def _finish(
+        self,
+        prepared: "_PreparedRewrite",
+        *,
+        provider: str,
+        model: str,
+        usage: Mapping[str, int | float | str | None],
+        fallback_used: bool = False,
+    ) -> RewriteResult:
+        if fallback_used and self.circuit_breaker is not None:
+            state = self.circuit_breaker.state
+            if state is not CircuitState.CLOSED:
+                prepared.diagnostics.append(f"circuit:{state.value}")
+        rewritten = self._render(prepared.normalized, prepared.spans, prepared.selected)
+        ordered_decisions = tuple(
+            prepared.applied[span.id] for span in prepared.spans if span.id in prepared.applied
+        )
+        return RewriteResult(
+            original_text=prepared.text,
+            normalized_text=prepared.normalized,
+            rewritten_text=rewritten,
+            provider=provider,
+            model=model,
+            fallback_used=fallback_used,
+            decisions=ordered_decisions,
+            latency_ms=round((time.perf_counter() - prepared.started) * 1000, 3),
+            usage=usage,
+            diagnostics=tuple(prepared.diagnostics),
+        )
+
+    def _cached_result(self, prepared: "_PreparedRewrite") -> RewriteResult | None:
+        if self.result_cache is None:
+            return None
+        prepared.cache_key = fingerprint(
+            "rewrite-result",
+            prepared.normalized,
+            [span.to_dict() for span in prepared.spans],
+            getattr(self.provider, "name", ""),
+            getattr(self.provider, "model", ""),
+            self.minimum_confidence,
+            self.vocabulary_fingerprint,
+        )
+        cached = self.result_cache.get(prepared.cache_key)
+        if not isinstance(cached, RewriteResult):
+            return None
+        # 원문, 로컬 진단과 latency는 이번 호출 기준으로 다시 계산합니다. 같은
+        # 정규화 결과라도 원문 표기(예: 숫자 발화)는 다를 수 있습니다.
+        diagnostics = [
+            *prepared.diagnostics,
+            *(item for item in cached.diagnostics if item.startswith("low-confidence:")),
+            "cache-hit",
+        ]
+        return replace(
+            cached,
+            original_text=prepared.text,
+            latency_ms=round((time.perf_counter() - prepared.started) * 1000, 3),
+            usage={},
+            diagnostics=tuple(diagnostics),
+        )
+
+    def _remember_result(self, prepared: "_PreparedRewrite", result: RewriteResult) -> None:
+        if self.result_cache is not None and prepared.cache_key is not None:
+            self.result_cache.put(prepared.cache_key, result)
+
+    def _decision_cache_call(self, method, argument) -> asyncio.Future:
+        """판정 cache 호출을 event loop를 막지 않는 future로 실행합니다.
+
+        in-memory ``LRUCache``는 바로 호출하고, 디스크나 원격일 수 있는 그 밖의
+        구현은 loop의 기본 thread pool에서 실행합니다.
+        """
+        loop = asyncio.get_running_loop()
+        if isinstance(self.decision_cache, LRUCache):
+            future = loop.create_future()
+            future.set_result(method(argument))
+            return future
+        return loop.run_in_executor(None, method, argument)
+
+    async def _resolve_cached_decisions(self, prepared: "_PreparedRewrite") -> None:
+        """cache에 있는 span 판정을 적용하고 나머지 span만 provider 대상으로 남깁니다."""
+        if self.decision_cache is None or not prepared.unresolved:
+            return
+        prepared.decision_keys = {
+            span.id: self._decision_key(prepared, span) for span in prepared.unresolved
+        }
+        found = await self._decision_cache_call(
+            self.decision_cache.get_many, list(prepared.decision_keys.values())
+        )
+        hits = []
+        for span in prepared.unresolved:
+            selection = _selection_from_cache(span, found.get(prepared.decision_keys[span.id]))
+            if selection is None:
+                continue
+            # cache 값도 provider 출력과 같은 계약으로 다시 검사합니다.
+            try:
+                self._validate_response(
+                    ProviderResponse((selection,), "decision-cache", ""), [span]
+                )
+            except InvalidProviderOutputError:
+                continue
+            hits.append(selection)
+        if not hits:
+            return
+        self._apply_selections(prepared, hits)
+        hit_ids = {selection.span_id for selection in hits}
+        prepared.diagnostics.extend(
+            f"decision-cache-hit:{span.id}" for span in prepared.unresolved if span.id in hit_ids
+        )
+        prepared.unresolved = [span for span in prepared.unresolved if span.id not in hit_ids]
+
+    def _decision_key(self, prepared: "_PreparedRewrite", span: CandidateSpan) -> str:
+        window = self.decision_context_tokens
+        token_index = next(
+            index for index, (start, _) in enumerate(prepared.token_bounds) if start == span.start
+        )
+        tokens = [prepared.normalized[start:end] for start, end in prepared.token_bounds]
+        return fingerprint(
+            "span-decision",
+            span.source,
+            [candidate.replacement for candidate in span.candidates],
+            tokens[max(0, token_index - window):token_index],
+            tokens[token_index + 1:token_index + 1 + window],
+            getattr(self.provider, "name", ""),
+            getattr(self.provider, "model", ""),
+            self.vocabulary_fingerprint,
+        )
+
+    async def _remember_decisions(self, prepared: "_PreparedRewrite", selections) -> None:
+        items = self._decision_items(prepared, selections)
+        if items:
+            await self._decision_cache_call(self.decision_cache.put_many, items)
+
+    def _decision_items(self, prepared: "_PreparedRewrite", selections) -> dict[str, Any]:
+        if self.decision_cache is None:
+            return {}
+        span_by_id = {span.id: span for span in prepared.unresolved}
+        items = {}
+        for selection in selections:
+            span = span_by_id.get(selection.span_id)
+            key = prepared.decision_keys.get(selection.span_id)
+            if span is None or key is None:
+                continue
+            items[key] = _selection_to_cache(span, selection)
+        return items
+
+    def _finish_from_decision_cache(self, prepared: "_PreparedRewrite") -> RewriteResult:
+        result = self._finish(
+            prepared,
+            provider=getattr(self.provider, "name", "unknown"),
+            model=getattr(self.provider, "model", ""),
+            usage={},
+        )
+        self._remember_result(prepared, result)
+        return result
+
+    def _provider_request(self, prepared: "_PreparedRewrite") -> DecisionRequest:
+        spans = tuple(prepared.unresolved)
+        window = self.provider_context_tokens
+        if window is None:
+            return DecisionRequest(text=prepared.normalized, spans=spans)
+
+        # 각 span 앞뒤 ±window token만 남기고, 겹치거나 맞닿은 창은 합칩니다.
+        # 잘린 구간은 생략 기호로 잇고 span offset만 옮기므로 span/candidate
+        # ID와 응답 검증 규칙은 그대로입니다.
+        bounds = prepared.token_bounds
+        token_index = {start: index for index, (start, _) in enumerate(bounds)}
+        windows: list[list[int]] = []
+        for span in spans:
+            index = token_index[span.start]
+            low, high = max(0, index - window), min(len(bounds) - 1, index + window)
+            if windows and low <= windows[-1][1] + 1:
+                windows[-1][1] = max(windows[-1][1], high)
+            else:
+                windows.append([low, high])
+
+        parts = []
+        shifts = []
+        position = 0
+        for low, high in windows:
+            start, end = bounds[low][0], bounds[high][1]
+            if parts:
+                position += len(_CONTEXT_SEPARATOR)
+            shifts.append((start, end, position - start))
+            parts.append(prepared.normalized[start:end])
+            position += end - start
+
+        remapped = []
+        for span in spans:
+            shift = next(shift for start, end, shift in shifts if start <= span.start < end)
+            remapped.append(replace(span, start=span.start + shift, end=span.end + shift))
+        return DecisionRequest(text=_CONTEXT_SEPARATOR.join(parts), spans=tuple(remapped))
+
+    @staticmethod
+    def _pack_batches(
+        requests: Mapping[int, DecisionRequest],
+        pending: list[int],
+        max_batch_spans: int,
+        max_batch_chars: int,
+    ) -> list[list[int]]:
+        batches: list[list[int]] = []
+        current: list[int] = []
+        span_count = 0
+        char_count = 0
+        for index in pending:
+            request = requests[index]
+            # 문장 사이 구분자("\n") 한 글자를 예산에 포함합니다.
+            item_chars = len(request.text) + 1
+            if current and (
+                span_count + len(request.spans) > max_batch_spans
+                or char_count + item_chars > max_batch_chars
+            ):
+                batches.append(current)
+                current, span_count, char_count = [], 0, 0
+            current.append(index)
+            span_count += len(request.spans)
+            char_count += item_chars
+        if current:
+            batches.append(current)
+        return batches
+
+    @staticmethod
+    def _prefixed_spans(
+        spans,
+        prefix: str,
+        offset: int,
+        candidate_origin: dict[str, str],
+    ) -> list[CandidateSpan]:
+        prefixed = []
+        for span in spans:
+            candidates = tuple(
+                replace(candidate, id=prefix + candidate.id) for candidate in span.candidates
+            )
+            for original, renamed in zip(span.candidates, candidates):
+                candidate_origin[renamed.id] = original.id
+            prefixed.append(
+                replace(
+                    span,
+                    id=prefix + span.id,
+                    start=span.start + offset,
+                    end=span.end + offset,
+                    candidates=candidates,
+                    deterministic_candidate_id=None,
+                )
+            )
+        return prefixed
+
+    async def _decide_batch(
+        self,
+        prepared: list["_PreparedRewrite"],
+        requests: Mapping[int, DecisionRequest],
+        batch: list[int],
+        batch_index: int,
+    ) -> list[tuple[int, RewriteResult]]:
+        # 여러 문장을 하나의 text로 잇고 span/candidate ID에 문장 prefix를 붙여
+        # batch 안에서 전역적으로 유일하게 만듭니다. 모델 응답은 원래 ID로
+        # 되돌린 뒤 문장별로 기존 선택 규칙을 그대로 적용합니다.
+        parts = []
+        spans = []
+        span_origin: dict[str, tuple[int, str]] = {}
+        candidate_origin: dict[str, str] = {}
+        offset = 0
+        for index in batch:
+            sentence = requests[index]
+            prefix = f"t{index}."
+            for span in self._prefixed_spans(sentence.spans, prefix, offset, candidate_origin):
+                span_origin[span.id] = (index, span.id[len(prefix):])
+                spans.append(span)
+            parts.append(sentence.text)
+            offset += len(sentence.text) + 1
+
+        request = DecisionRequest(text="\n".join(parts), spans=tuple(spans))
+        diagnostic = f"provider-batch:{batch_index}"
+        try:
+            response = await self._decide(request)
+            selections: dict[int, list[ProviderSelection]] = {index: [] for index in batch}
+            for selection in response.selections:
+                index, span_id = span_origin[selection.span_id]
+                selections[index].append(
+                    replace(
+                        selection,
+                        span_id=span_id,
+                        candidate_id=candidate_origin.get(selection.candidate_id),
+                    )
+                )
+            for index in batch:
+                self._apply_selections(prepared[index], selections[index])
+            await asyncio.gather(
+                *(self._remember_decisions(prepared[index], selections[index]) for index in batch)
+            )
+        except (ProviderError, ConnectionError, TimeoutError, OSError) as error:
+            if self.fallback_strategy == "raise":
+                raise
+            outcome = []
+            for index in batch:
+                prepared[index].diagnostics.append(diagnostic)
+                outcome.append((index, self._finish_with_fallback(prepared[index], error)))
+            return outcome
+
+        outcome = []
+        for index in batch:
+            prepared[index].diagnostics.append(diagnostic)
+            result = self._finish(
+                prepared[index],
+                provider=response.provider,
+                model=response.model,
+                usage=dict(response.usage),
+            )
+            self._remember_result(prepared[index], result)
+            outcome.append((index, result))
+        return outcome
+
     def _validate_response(self, response: ProviderResponse, spans: list[CandidateSpan]) -> None:
         if not isinstance(response, ProviderResponse):
             raise InvalidProviderOutputError("provider must return ProviderResponse")
@@ -289,6 +1448,8 @@ class AgenticPronunciationMapper:
                 raise InvalidProviderOutputError("selection action must be DecisionAction")
             if not isinstance(selection.reason_code, ReasonCode):
                 raise InvalidProviderOutputError("selection reason_code must be ReasonCode")
+            if selection.reason_code not in PROVIDER_REASON_CODES:
+                raise InvalidProviderOutputError("reason_code is reserved for local decisions")
             if isinstance(selection.confidence, bool) or not isinstance(
                 selection.confidence, (int, float)
             ):
@@ -401,6 +1562,268 @@ class AgenticPronunciationMapper:
         return "".join(parts)
 
 
+class StreamSession:
+    """같은 발화의 partial을 차례로 받아 안정된 앞부분의 작업을 재사용합니다.
+
+    token 원문별 후보 검색과 provider 판정을 기억하고, 이전 partial과 달라진
+    token부터만 다시 판정합니다. 마지막 token은 뒤에 공백이나 문장부호가 올
+    때까지 아직 자라는 중으로 봅니다. provider는 새로 안정된 미해결 span이
+    생겼을 때 호출하고, 자라는 중인 span은 마지막 호출 뒤 ``debounce_ms``가
+    지났거나 ``final=True``일 때만 함께 보냅니다. 그 전에는 heuristic 미리보기와
+    ``stream-pending:<span_id>`` 진단을 반환합니다.
+    """
+
+    def __init__(
+        self,
+        mapper: AgenticPronunciationMapper,
+        *,
+        debounce_ms: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if (
+            isinstance(debounce_ms, bool)
+            or not isinstance(debounce_ms, (int, float))
+            or not math.isfinite(debounce_ms)
+            or debounce_ms < 0
+        ):
+            raise ValueError("debounce_ms must be a non-negative finite number")
+        if not callable(clock):
+            raise TypeError("clock must be callable")
+        self.mapper = mapper
+        self.debounce_ms = float(debounce_ms)
+        self._clock = clock
+        self._candidates: dict[str, tuple[Candidate, ...]] = {}
+        self._decisions: dict[int, tuple[str, ProviderSelection]] = {}
+        self._tokens: list[str] = []
+        self._generation = mapper.heuristic_mapper.vocabulary_generation
+        self._last_call = clock()
+        self.provider_calls = 0
+
+    async def update(self, partial: str, *, final: bool = False) -> RewriteResult:
+        """새 partial을 rewrite합니다. 발화가 끝났으면 ``final=True``로 호출합니다."""
+        mapper = self.mapper
+        generation = mapper.heuristic_mapper.vocabulary_generation
+        if generation != self._generation or len(self._candidates) > MAX_STREAM_MEMO_ENTRIES:
+            self._candidates.clear()
+            self._decisions.clear()
+            self._generation = generation
+
+        prepared = mapper._prepare(partial, candidate_memo=self._candidates)
+        tokens = [prepared.normalized[start:end] for start, end in prepared.token_bounds]
+        changed = 0
+        while changed < min(len(tokens), len(self._tokens)) and tokens[changed] == self._tokens[changed]:
+            changed += 1
+        # 달라진 token 뒤의 판정은 왼쪽 문맥이 바뀌었으므로 버립니다.
+        self._decisions = {
+            index: memo for index, memo in self._decisions.items() if index < changed
+        }
+        self._tokens = tokens
+
+        stable_tokens = len(tokens)
+        if (
+            not final
+            and tokens
+            and prepared.token_bounds[-1][1] == len(prepared.normalized)
+        ):
+            stable_tokens -= 1
+
+        # span ID는 "s<token 순번>"이므로 순번으로 안정 여부와 memo를 찾습니다.
+        unresolved = prepared.unresolved
+        remembered_spans = []
+        remembered = []
+        pending_stable = []
+        pending_tail = []
+        for span in unresolved:
+            index = int(span.id[1:])
+            memo = self._decisions.get(index)
+            if memo is not None and memo[0] == span.source:
+                remembered_spans.append(span)
+                remembered.append(memo[1])
+            elif index < stable_tokens:
+                pending_stable.append(span)
+            else:
+                pending_tail.append(span)
+
+        prepared.unresolved = remembered_spans
+        mapper._apply_selections(prepared, remembered)
+
+        send = list(pending_stable)
+        now = self._clock()
+        if pending_tail and (final or (now - self._last_call) * 1000 >= self.debounce_ms):
+            send.extend(pending_tail)
+        waiting = [span for span in pending_tail if span not in send]
+
+        provider = getattr(mapper.provider, "name", "unknown")
+        model = getattr(mapper.provider, "model", "")
+        usage = {}
+        fallback_used = False
+        if send:
+            self._last_call = now
+            self.provider_calls += 1
+            prepared.unresolved = send
+            try:
+                response = await mapper._decide(mapper._provider_request(prepared))
+            except (ProviderError, ConnectionError, TimeoutError, OSError) as error:
+                if mapper.fallback_strategy == "raise":
+                    raise
+                fallback_used = True
+                prepared.diagnostics.append(f"provider-fallback:{type(error).__name__}")
+                mapper._apply_fallback(send, prepared.selected, prepared.applied)
+            else:
+                mapper._apply_selections(prepared, response.selections)
+                for selection in response.selections:
+                    span_index = int(selection.span_id[1:])
+                    self._decisions[span_index] = (tokens[span_index], selection)
+                provider, model, usage = response.provider, response.model, dict(response.usage)
+
+        if waiting:
+            mapper._apply_fallback(waiting, prepared.selected, prepared.applied)
+            prepared.diagnostics.extend(f"stream-pending:{span.id}" for span in waiting)
+        prepared.unresolved = unresolved
+        if not unresolved:
+            provider, model = "local-deterministic", ""
+        return mapper._finish(
+            prepared,
+            provider=provider,
+            model=model,
+            usage=usage,
+            fallback_used=fallback_used,
+        )
+
+
+@dataclass(slots=True)
+class _PreparedRewrite:
+    """provider 판정 전까지 완료된 한 문장의 로컬 처리 상태."""
+
+    text: str
+    normalized: str
+    spans: tuple[CandidateSpan, ...]
+    started: float
+    unresolved: list[CandidateSpan] = field(default_factory=list)
+    selected: dict[str, Candidate | None] = field(default_factory=dict)
+    applied: dict[str, AppliedDecision] = field(default_factory=dict)
+    diagnostics: list[str] = field(default_factory=list)
+    token_bounds: tuple[tuple[int, int], ...] = ()
+    cache_key: str | None = None
+    decision_keys: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class _InflightCall:
+    """병합된 provider 호출과 그 결과를 기다리는 대기자 수."""
+
+    task: asyncio.Task
+    waiters: int = 0
+
+
+def _validate_deadline_ms(deadline_ms: float | None) -> None:
+    if deadline_ms is None:
+        return
+    if (
+        isinstance(deadline_ms, bool)
+        or not isinstance(deadline_ms, (int, float))
+        or not math.isfinite(deadline_ms)
+        or deadline_ms <= 0
+    ):
+        raise ValueError("deadline_ms must be a positive finite number")
+
+
+# (정규화 문장, lexical token 경계, 후보 span) — executor 경계를 넘는 pickle 가능한 값.
+_Analysis = tuple[str, tuple[tuple[int, int], ...], tuple[CandidateSpan, ...]]
+
+_WORKER_GENERATOR: CandidateGenerator | None = None
+
+
+def _analyse(
+    generator: CandidateGenerator,
+    text: str,
+    *,
+    max_spans: int,
+    max_token_chars: int,
+    memo: dict[str, tuple[Candidate, ...]] | None = None,
+) -> _Analysis:
+    normalized = convert_korean_numbers_correctly(text)
+    lexical_tokens = tuple(LEXICAL_TOKEN_PATTERN.finditer(normalized))
+    if len(lexical_tokens) > max_spans:
+        raise ValueError(f"text exceeds max_spans={max_spans}")
+    if any(len(match.group(0)) > max_token_chars for match in lexical_tokens):
+        raise ValueError(f"text contains a token exceeding max_token_chars={max_token_chars}")
+    return (
+        normalized,
+        tuple((match.start(), match.end()) for match in lexical_tokens),
+        generator.generate(normalized, memo=memo),
+    )
+
+
+def _init_analysis_worker(db_terms, term_mappings, threshold, generator_options) -> None:
+    global _WORKER_GENERATOR
+    mapper = PronunciationMapper(db_terms, threshold=threshold, custom_mappings=term_mappings)
+    _WORKER_GENERATOR = CandidateGenerator(mapper, **generator_options)
+
+
+def _analyse_in_worker(text: str) -> _Analysis:
+    generator = _WORKER_GENERATOR
+    return _analyse(
+        generator,
+        text,
+        max_spans=generator.max_spans,
+        max_token_chars=generator.max_token_chars,
+    )
+
+
+def _shift_decision(decision: AppliedDecision, token_offset: int) -> AppliedDecision:
+    if not token_offset:
+        return decision
+    span_id = f"s{int(decision.span_id[1:]) + token_offset}"
+    candidate_id = decision.candidate_id
+    if candidate_id is not None:
+        candidate_id = span_id + candidate_id[len(decision.span_id):]
+    return replace(decision, span_id=span_id, candidate_id=candidate_id)
+
+
+def _selection_to_cache(span: CandidateSpan, selection: ProviderSelection) -> dict[str, Any]:
+    # candidate ID는 문장 안 위치에 따라 달라지므로 후보 순번으로 저장합니다.
+    candidate_index = next(
+        (
+            index
+            for index, candidate in enumerate(span.candidates)
+            if candidate.id == selection.candidate_id
+        ),
+        None,
+    )
+    return {
+        "action": selection.action.value,
+        "candidate_index": candidate_index,
+        "confidence": selection.confidence,
+        "reason_code": selection.reason_code.value,
+    }
+
+
+def _selection_from_cache(span: CandidateSpan, value: Any) -> ProviderSelection | None:
+    if not isinstance(value, Mapping):
+        return None
+    candidate_index = value.get("candidate_index")
+    candidate_id = None
+    if candidate_index is not None:
+        if (
+            isinstance(candidate_index, bool)
+            or not isinstance(candidate_index, int)
+            or not 0 <= candidate_index < len(span.candidates)
+        ):
+            return None
+        candidate_id = span.candidates[candidate_index].id
+    try:
+        return ProviderSelection(
+            span_id=span.id,
+            action=DecisionAction(value.get("action")),
+            candidate_id=candidate_id,
+            confidence=value.get("confidence"),
+            reason_code=ReasonCode(value.get("reason_code")),
+        )
+    except ValueError:
+        return None
+
+
 def _is_unit_interval_number(value: int | float) -> bool:
     if isinstance(value, bool) or not isinstance(value, (int, float)):
         return False
@@ -17,6 +17,18 @@ class ProviderUnavailableError(ProviderError):
     """provider 또는 로컬 모델에 연결할 수 없습니다."""
 
 
+class DeadlineExceededError(ProviderUnavailableError):
+    """provider가 호출별 지연 예산 안에 응답하지 않았습니다."""
+
+
+class CircuitOpenError(ProviderUnavailableError):
+    """circuit breaker가 열려 provider를 호출하지 않았습니다."""
+
+
+class ConcurrencyLimitExceededError(ProviderUnavailableError):
+    """동시 호출 한도 대기열이 가득 찼거나 대기 시간이 끝나 provider를 호출하지 않았습니다."""
+
+
 class InvalidProviderOutputError(ProviderError):
     """provider 출력이 V2의 제한된 결정 계약을 위반했습니다."""
 
@@ -19,6 +19,47 @@ class ReasonCode(str, Enum):
     CONTEXT = "context"
     AMBIGUOUS = "ambiguous"
     NO_MATCH = "no_match"
+    LOCAL_CONFIDENCE = "local_confidence"
+
+
+# provider가 반환할 수 있는 reason code. 로컬 gate 전용 code는 모델에 노출하지
+# 않습니다.
+PROVIDER_REASON_CODES = tuple(
+    reason for reason in ReasonCode if reason is not ReasonCode.LOCAL_CONFIDENCE
+)
+
+
+# provider 입력 payload 형식. compact는 후보 표를 공유하고 짧은 key를 씁니다.
+PAYLOAD_FORMATS = ("standard", "compact")
+
+
+# provider 출력 형식. compact는 span 순서대로 [후보 index, confidence] 배열만
+# 받아 출력 토큰을 줄입니다.
+DECISION_FORMATS = ("standard", "compact")
+
+# n-best 요청에서 가설 자체를 고르는 pseudo-span ID.
+HYPOTHESIS_SPAN_ID = "hyp"
+
+# compact 출력의 특수 후보 index와 action별 기본 reason code.
+COMPACT_KEEP_INDEX = -1
+COMPACT_ABSTAIN_INDEX = -2
+_COMPACT_DEFAULT_REASONS = {
+    DecisionAction.REPLACE: ReasonCode.PHONETIC,
+    DecisionAction.KEEP: ReasonCode.CONTEXT,
+    DecisionAction.ABSTAIN: ReasonCode.AMBIGUOUS,
+}
+
+
+def validate_payload_format(payload_format: str) -> str:
+    if payload_format not in PAYLOAD_FORMATS:
+        raise ValueError(f"payload_format must be one of {', '.join(PAYLOAD_FORMATS)}")
+    return payload_format
+
+
+def validate_decision_format(decision_format: str) -> str:
+    if decision_format not in DECISION_FORMATS:
+        raise ValueError(f"decision_format must be one of {', '.join(DECISION_FORMATS)}")
+    return decision_format
 
 
 @dataclass(frozen=True, slots=True)
@@ -61,8 +102,15 @@ class DecisionRequest:
     spans: tuple[CandidateSpan, ...]
     locale: str = "ko-KR"
 
-    def to_provider_payload(self) -> dict[str, Any]:
+    @property
+    def has_hypotheses(self) -> bool:
+        """n-best 가설 선택 span이 들어 있는 요청인지 여부."""
+        return any(span.id == HYPOTHESIS_SPAN_ID for span in self.spans)
+
+    def to_provider_payload(self, payload_format: str = "standard") -> dict[str, Any]:
         """모델에는 전체 DB 사전 대신 로컬에서 축소한 후보만 전달합니다."""
+        if validate_payload_format(payload_format) == "compact":
+            return self._compact_payload()
         return {
             "text": self.text,
             "locale": self.locale,
@@ -84,6 +132,23 @@ class DecisionRequest:
             ],
         }
 
+    def _compact_payload(self) -> dict[str, Any]:
+        # 같은 replacement는 후보 표에 한 번만 싣고 span은 표 index와 거리만
+        # 참조합니다. provider에 가는 span은 로컬에서 확정되지 않은 phonetic
+        # 후보뿐이므로 method는 생략합니다. candidate_id는 "<span_id>:c<순번>"
+        # 규칙으로 복원되므로 그 규칙을 지키지 않는 요청은 거부합니다.
+        table: dict[str, int] = {}
+        spans = []
+        for span in self.spans:
+            refs = []
+            for position, candidate in enumerate(span.candidates):
+                if candidate.id != f"{span.id}:c{position}":
+                    raise ValueError("compact payload requires positional candidate ids")
+                index = table.setdefault(candidate.replacement, len(table))
+                refs.append([index, round(candidate.distance, 2)])
+            spans.append({"i": span.id, "w": span.source, "k": refs})
+        return {"t": self.text, "l": self.locale, "c": list(table), "s": spans}
+
 
 @dataclass(frozen=True, slots=True)
 class ProviderSelection:
@@ -154,7 +219,7 @@ DECISION_SCHEMA: dict[str, Any] = {
                     "action": {"type": "string", "enum": [action.value for action in DecisionAction]},
                     "candidate_id": {"type": ["string", "null"]},
                     "confidence": {"type": "number"},
-                    "reason_code": {"type": "string", "enum": [reason.value for reason in ReasonCode]},
+                    "reason_code": {"type": "string", "enum": [reason.value for reason in PROVIDER_REASON_CODES]},
                 },
                 "required": ["span_id", "action", "candidate_id", "confidence", "reason_code"],
                 "additionalProperties": False,
@@ -166,14 +231,47 @@ DECISION_SCHEMA: dict[str, Any] = {
 }
 
 
+# d[i] = [candidate index | -1 keep | -2 abstain, confidence, (선택) reason index].
+# reason index는 PROVIDER_REASON_CODES의 순번입니다. strict structured output이
+# tuple schema를 지원하지 않으므로 길이와 자료형은 parse 단계에서 검사합니다.
+COMPACT_DECISION_SCHEMA: dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "d": {
+            "type": "array",
+            "items": {"type": "array", "items": {"type": "number"}},
+        }
+    },
+    "required": ["d"],
+    "additionalProperties": False,
+}
+
+
+def decision_schema(decision_format: str = "standard") -> dict[str, Any]:
+    if validate_decision_format(decision_format) == "compact":
+        return COMPACT_DECISION_SCHEMA
+    return DECISION_SCHEMA
+
+
 def parse_provider_payload(
     payload: Any,
     *,
     provider: str,
     model: str,
     usage: Mapping[str, int | float | str | None] | None = None,
+    decision_format: str = "standard",
+    request: DecisionRequest | None = None,
 ) -> ProviderResponse:
     """구조화 출력이더라도 신뢰하지 않고 로컬에서 계약을 다시 검사합니다."""
+    if validate_decision_format(decision_format) == "compact":
+        if request is None:
+            raise ValueError("compact decisions require the originating request")
+        return ProviderResponse(
+            selections=_parse_compact_selections(payload, request),
+            provider=provider,
+            model=model,
+            usage={} if usage is None else dict(usage),
+        )
     if not isinstance(payload, dict) or set(payload) != {"decisions"}:
         raise InvalidProviderOutputError("provider output must contain only 'decisions'")
     raw_decisions = payload["decisions"]
@@ -202,6 +300,8 @@ def parse_provider_payload(
             reason_code = ReasonCode(raw["reason_code"])
         except ValueError as error:
             raise InvalidProviderOutputError(str(error)) from error
+        if reason_code not in PROVIDER_REASON_CODES:
+            raise InvalidProviderOutputError("reason_code is reserved for local decisions")
         if action is DecisionAction.REPLACE and not candidate_id:
             raise InvalidProviderOutputError("replace requires candidate_id")
         if action is not DecisionAction.REPLACE and candidate_id is not None:
@@ -224,3 +324,68 @@ def parse_provider_payload(
         model=model,
         usage={} if usage is None else dict(usage),
     )
+
+
+def _parse_compact_selections(
+    payload: Any, request: DecisionRequest
+) -> tuple[ProviderSelection, ...]:
+    # 위치 기반 형식이므로 span 수가 정확히 같아야 하고, index는 해당 span의
+    # 후보 범위 안이어야 합니다. 그 뒤의 후보 id 검증은 standard와 같습니다.
+    if not isinstance(payload, dict) or set(payload) != {"d"}:
+        raise InvalidProviderOutputError("compact provider output must contain only 'd'")
+    rows = payload["d"]
+    if not isinstance(rows, list):
+        raise InvalidProviderOutputError("'d' must be a list")
+    if len(rows) != len(request.spans):
+        raise InvalidProviderOutputError("compact output must contain one row per span")
+
+    selections = []
+    for span, row in zip(request.spans, rows):
+        if not isinstance(row, list) or len(row) not in {2, 3}:
+            raise InvalidProviderOutputError("each compact decision must have 2 or 3 values")
+        index = _compact_integer(row[0], "candidate index")
+        confidence = row[1]
+        if isinstance(confidence, bool) or not isinstance(confidence, (int, float)):
+            raise InvalidProviderOutputError("confidence must be numeric")
+        if not 0.0 <= confidence <= 1.0:
+            raise InvalidProviderOutputError("confidence must be between 0 and 1")
+
+        candidate_id = None
+        if index == COMPACT_KEEP_INDEX:
+            action = DecisionAction.KEEP
+        elif index == COMPACT_ABSTAIN_INDEX:
+            action = DecisionAction.ABSTAIN
+        elif 0 <= index < len(span.candidates):
+            action = DecisionAction.REPLACE
+            candidate_id = span.candidates[index].id
+        else:
+            raise InvalidProviderOutputError("candidate index is out of range for its span")
+
+        reason_code = _COMPACT_DEFAULT_REASONS[action]
+        if len(row) == 3:
+            reason_index = _compact_integer(row[2], "reason index")
+            if not 0 <= reason_index < len(PROVIDER_REASON_CODES):
+                raise InvalidProviderOutputError("reason index is out of range")
+            reason_code = PROVIDER_REASON_CODES[reason_index]
+
+        selections.append(
+            ProviderSelection(
+                span_id=span.id,
+                action=action,
+                candidate_id=candidate_id,
+                confidence=float(confidence),
+                reason_code=reason_code,
+            )
+        )
+    return tuple(selections)
+
+
+def _compact_integer(value: Any, name: str) -> int:
+    # number schema이므로 1.0처럼 정수값인 float은 허용합니다.
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise InvalidProviderOutputError(f"{name} must be an integer")
+    if isinstance(value, float):
+        if not value.is_integer():
+            raise InvalidProviderOutputError(f"{name} must be an integer")
+        value = int(value)
+    return value
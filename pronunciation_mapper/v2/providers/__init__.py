@@ -1,11 +1,18 @@
 from .azure_foundry import AzureFoundryProvider
 from .base import DecisionProvider
-from .factory import create_provider
+from .factory import create_provider, create_provider_pool
+from .hedged import HedgedProvider, HedgeStats
 from .ollama import OllamaProvider
+from .pooled import PooledProvider, PoolMemberStats
 
 __all__ = [
     "AzureFoundryProvider",
     "DecisionProvider",
+    "HedgeStats",
+    "HedgedProvider",
     "OllamaProvider",
+    "PoolMemberStats",
+    "PooledProvider",
     "create_provider",
+    "create_provider_pool",
 ]
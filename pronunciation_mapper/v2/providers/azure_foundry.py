@@ -1,16 +1,30 @@
 """Microsoft Foundry Project Responses API provider."""
 
 import asyncio
+import inspect
 import json
 import math
 import os
 import threading
+import time
 from typing import Any
 
 from ..errors import InvalidProviderOutputError, ProviderConfigurationError
-from ..models import DECISION_SCHEMA, DecisionRequest, ProviderResponse, parse_provider_payload
-from ..prompts import SYSTEM_INSTRUCTIONS
-from .base import raise_classified_provider_error
+from ..models import (
+    DecisionRequest,
+    ProviderResponse,
+    decision_schema,
+    parse_provider_payload,
+    validate_decision_format,
+    validate_payload_format,
+)
+from ..prompts import system_instructions
+from .base import elapsed_ms, output_token_budget, raise_classified_provider_error
+
+
+TRANSPORTS = ("sync", "async")
+# Foundry project client가 Entra ID token을 요청할 때 쓰는 scope.
+TOKEN_SCOPE = "https://ai.azure.com/.default"
 
 
 class AzureFoundryProvider:
@@ -18,6 +32,13 @@ class AzureFoundryProvider:
 
     ``AIProjectClient.get_openai_client()``가 반환하는 OpenAI-compatible client는
     Azure 전송 클라이언트일 뿐이며 ``OPENAI_API_KEY``를 사용하지 않습니다.
+
+    ``transport="sync"``는 동기 client 호출을 ``asyncio.to_thread``로 감싸므로
+    동시 호출 수가 기본 executor thread 수에 묶입니다. ``transport="async"``는
+    ``azure.ai.projects.aio`` client와 ``max_connections`` 크기의 연결 pool을
+    공유하는 async OpenAI client를 써서 호출마다 thread를 잡지 않습니다. 이때
+    ``credential``과 ``async_client``는 async 구현이어야 하며, 내부에서 만든
+    client는 처음 사용한 event loop에 묶입니다.
     """
 
     name = "azure-foundry"
@@ -32,6 +53,12 @@ class AzureFoundryProvider:
         timeout: float = 30.0,
         max_retries: int = 1,
         max_output_tokens: int = 2048,
+        payload_format: str = "standard",
+        decision_format: str = "standard",
+        adaptive_budget: bool = False,
+        transport: str = "sync",
+        max_connections: int = 100,
+        async_client: Any | None = None,
     ):
         self.endpoint = endpoint or os.getenv("FOUNDRY_PROJECT_ENDPOINT") or os.getenv("AZURE_AI_PROJECT_ENDPOINT")
         self.model = (
@@ -46,8 +73,25 @@ class AzureFoundryProvider:
             raise ValueError("max_retries must be a non-negative integer")
         if isinstance(max_output_tokens, bool) or not isinstance(max_output_tokens, int) or max_output_tokens <= 0:
             raise ValueError("max_output_tokens must be a positive integer")
+        if transport not in TRANSPORTS:
+            raise ValueError(f"transport must be one of: {', '.join(TRANSPORTS)}")
+        if (
+            isinstance(max_connections, bool)
+            or not isinstance(max_connections, int)
+            or max_connections < 1
+        ):
+            raise ValueError("max_connections must be at least 1")
+        if async_client is not None and transport != "async":
+            raise ValueError("async_client requires transport='async'")
+        if client is not None and transport != "sync":
+            raise ValueError("client is synchronous; pass async_client with transport='async'")
         self.max_retries = max_retries
         self.max_output_tokens = max_output_tokens
+        self.payload_format = validate_payload_format(payload_format)
+        self.decision_format = validate_decision_format(decision_format)
+        self.adaptive_budget = bool(adaptive_budget)
+        self.transport = transport
+        self.max_connections = max_connections
         self._credential = credential
         self._client = client
         self._project_client = None
@@ -55,37 +99,104 @@ class AzureFoundryProvider:
         self._owns_client = False
         self._owns_project_client = False
         self._client_lock = threading.Lock()
+        self._async_client = async_client
+        self._async_credential = credential if transport == "async" else None
+        self._async_project_client = None
+        self._owns_async_credential = False
+        self._owns_async_client = False
+        self._owns_async_project_client = False
+        self._async_loop: asyncio.AbstractEventLoop | None = None
+        self._async_client_lock: asyncio.Lock | None = None
+        self._async_lock_loop: asyncio.AbstractEventLoop | None = None
+
+    async def warm_up(self) -> dict[str, float]:
+        """SDK import, client 생성, credential token 발급을 미리 수행합니다.
+
+        단계별 소요 시간(ms)을 반환합니다. 과금되는 모델 호출은 하지 않으므로
+        연결은 첫 판정 때 열립니다. 주입한 client는 import와 생성 단계를 건너뜁니다.
+        """
+        self._check_model()
+        timings = {}
+        if self.transport == "async":
+            if self._async_client is None:
+                started = time.perf_counter()
+                self._load_async_sdk()
+                timings["import_sdk"] = elapsed_ms(started)
+            started = time.perf_counter()
+            await self._ensure_async_client()
+            timings["client"] = elapsed_ms(started)
+            credential = self._async_credential
+        else:
+            if self._client is None:
+                started = time.perf_counter()
+                await asyncio.to_thread(self._load_sdk)
+                timings["import_sdk"] = elapsed_ms(started)
+            started = time.perf_counter()
+            await asyncio.to_thread(self._ensure_client)
+            timings["client"] = elapsed_ms(started)
+            credential = self._credential
+
+        get_token = getattr(credential, "get_token", None)
+        if callable(get_token):
+            # 대부분의 credential은 발급한 token을 cache하므로 첫 판정이 token
+            # 발급을 기다리지 않습니다.
+            started = time.perf_counter()
+            try:
+                if self.transport == "async":
+                    await get_token(TOKEN_SCOPE)
+                else:
+                    await asyncio.to_thread(get_token, TOKEN_SCOPE)
+            except Exception as error:
+                raise_classified_provider_error("Microsoft Foundry", error)
+            timings["credential"] = elapsed_ms(started)
+        return timings
 
     async def decide(self, request: DecisionRequest) -> ProviderResponse:
-        # Validate the deployment before importing SDKs or allocating credentials.
-        if not isinstance(self.model, str) or not self.model.strip():
-            raise ProviderConfigurationError(
-                "Foundry model deployment is missing; set FOUNDRY_MODEL or AZURE_AI_MODEL_DEPLOYMENT_NAME"
-            )
-        client = self._ensure_client()
-
-        payload = json.dumps(request.to_provider_payload(), ensure_ascii=False, separators=(",", ":"))
-
-        def call():
-            return client.responses.create(
-                model=self.model,
-                instructions=SYSTEM_INSTRUCTIONS,
-                input=payload,
-                text={
-                    "format": {
-                        "type": "json_schema",
-                        "name": "pronunciation_mapper_v2_decision",
-                        "description": "Bounded candidate selections for Korean ASR query rewriting",
-                        "strict": True,
-                        "schema": DECISION_SCHEMA,
-                    }
-                },
-                store=False,
-                max_output_tokens=self.max_output_tokens,
+        self._check_model()
+        if self.transport == "async":
+            client = await self._ensure_async_client()
+        else:
+            client = self._ensure_client()
+
+        payload = json.dumps(
+            request.to_provider_payload(self.payload_format),
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+
+        instructions = system_instructions(
+            self.payload_format, self.decision_format, nbest=request.has_hypotheses
+        )
+        schema = decision_schema(self.decision_format)
+        max_output_tokens = self.max_output_tokens
+        if self.adaptive_budget:
+            # reasoning 모델은 추론 토큰도 이 상한에 포함되므로 기본값은 끔입니다.
+            max_output_tokens = output_token_budget(
+                request, self.decision_format, self.max_output_tokens
             )
 
+        arguments = {
+            "model": self.model,
+            "instructions": instructions,
+            "input": payload,
+            "text": {
+                "format": {
+                    "type": "json_schema",
+                    "name": "pronunciation_mapper_v2_decision",
+                    "description": "Bounded candidate selections for Korean ASR query rewriting",
+                    "strict": True,
+                    "schema": schema,
+                }
+            },
+            "store": False,
+            "max_output_tokens": max_output_tokens,
+        }
+
         try:
-            response = await asyncio.to_thread(call)
+            if self.transport == "async":
+                response = await client.responses.create(**arguments)
+            else:
+                response = await asyncio.to_thread(client.responses.create, **arguments)
         except Exception as error:
             raise_classified_provider_error("Microsoft Foundry", error)
 
@@ -102,8 +213,17 @@ class AzureFoundryProvider:
             provider=self.name,
             model=self.model,
             usage=_extract_usage(getattr(response, "usage", None)),
+            decision_format=self.decision_format,
+            request=request,
         )
 
+    def _check_model(self) -> None:
+        # Validate the deployment before importing SDKs or allocating credentials.
+        if not isinstance(self.model, str) or not self.model.strip():
+            raise ProviderConfigurationError(
+                "Foundry model deployment is missing; set FOUNDRY_MODEL or AZURE_AI_MODEL_DEPLOYMENT_NAME"
+            )
+
     def _ensure_client(self):
         if self._client is not None:
             return self._client
@@ -153,6 +273,77 @@ class AzureFoundryProvider:
         self._owns_client = True
         return client
 
+    async def _ensure_async_client(self):
+        loop = asyncio.get_running_loop()
+        if self._async_client is not None and (
+            not self._owns_async_client or self._async_loop is loop
+        ):
+            return self._async_client
+        if self._async_client_lock is None or self._async_lock_loop is not loop:
+            self._async_client_lock = asyncio.Lock()
+            self._async_lock_loop = loop
+        async with self._async_client_lock:
+            if self._async_client is not None and self._async_loop is not loop:
+                if not self._async_loop.is_closed():
+                    raise ProviderConfigurationError(
+                        "the async Foundry client is bound to another running event loop"
+                    )
+                # 끝난 loop의 연결은 닫을 수 없으므로 버리고 이 loop에서 새로 만듭니다.
+                self._discard_async_resources()
+            if self._async_client is not None:
+                return self._async_client
+            return await self._create_async_client(loop)
+
+    async def _create_async_client(self, loop: asyncio.AbstractEventLoop):
+        if not isinstance(self.endpoint, str) or not self.endpoint.strip():
+            raise ProviderConfigurationError(
+                "Foundry project endpoint is missing; set FOUNDRY_PROJECT_ENDPOINT"
+            )
+        AIProjectClient, DefaultAzureCredential, http_client_factory = self._load_async_sdk()
+
+        credential = self._async_credential
+        owns_credential = credential is None
+        project_client = None
+        try:
+            if credential is None:
+                credential = DefaultAzureCredential()
+            project_client = AIProjectClient(endpoint=self.endpoint, credential=credential)
+            client = project_client.get_openai_client(
+                timeout=self.timeout,
+                max_retries=self.max_retries,
+                http_client=http_client_factory(self.max_connections),
+            )
+            if inspect.isawaitable(client):
+                client = await client
+        except Exception as error:
+            try:
+                if project_client is not None:
+                    await _close_async(project_client)
+                if owns_credential and credential is not None:
+                    await _close_async(credential)
+            except (TypeError, AssertionError):
+                raise
+            # Preserve the primary creation failure; close is best effort.
+            except Exception:  # nosec B110
+                pass
+            raise_classified_provider_error("Microsoft Foundry", error)
+
+        self._async_credential = credential
+        self._async_project_client = project_client
+        self._async_client = client
+        self._owns_async_credential = owns_credential
+        self._owns_async_project_client = True
+        self._owns_async_client = True
+        self._async_loop = loop
+        return client
+
+    def _discard_async_resources(self) -> None:
+        for resource_name, ownership_name in _ASYNC_RESOURCES:
+            if getattr(self, ownership_name):
+                setattr(self, ownership_name, False)
+                setattr(self, resource_name, None)
+        self._async_loop = None
+
     @staticmethod
     def _load_sdk():
         try:
@@ -165,9 +356,38 @@ class AzureFoundryProvider:
             ) from error
         return AIProjectClient, DefaultAzureCredential
 
+    @staticmethod
+    def _load_async_sdk():
+        try:
+            import httpx
+            from azure.ai.projects.aio import AIProjectClient
+            from azure.identity.aio import DefaultAzureCredential
+            from openai import DefaultAsyncHttpxClient
+        except ImportError as error:
+            raise ProviderConfigurationError(
+                "Install the Foundry extra with: "
+                "python -m pip install 'pronunciation-mapper[foundry]'"
+            ) from error
+
+        def http_client_factory(max_connections: int):
+            limits = httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            )
+            return DefaultAsyncHttpxClient(limits=limits)
+
+        return AIProjectClient, DefaultAzureCredential, http_client_factory
+
     def close(self) -> None:
         """Close only resources allocated by this provider, in dependency order."""
         errors: list[Exception] = []
+        if any(getattr(self, ownership) for _, ownership in _ASYNC_RESOURCES):
+            loop = self._async_loop
+            if loop is not None and loop.is_running():
+                errors.append(RuntimeError("use aclose() to release the async Foundry client"))
+            else:
+                # loop가 끝난 뒤에는 연결을 정상 종료할 수 없어 참조만 놓습니다.
+                self._discard_async_resources()
         with self._client_lock:
             resources = (
                 ("_client", "_owns_client"),
@@ -188,7 +408,22 @@ class AzureFoundryProvider:
             raise errors[0]
 
     async def aclose(self) -> None:
+        errors: list[Exception] = []
+        if self._async_loop is asyncio.get_running_loop():
+            for resource_name, ownership_name in _ASYNC_RESOURCES:
+                if not getattr(self, ownership_name):
+                    continue
+                resource = getattr(self, resource_name)
+                setattr(self, ownership_name, False)
+                setattr(self, resource_name, None)
+                try:
+                    await _close_async(resource)
+                except Exception as error:
+                    errors.append(error)
+            self._async_loop = None
         await asyncio.to_thread(self.close)
+        if errors:
+            raise errors[0]
 
     def __enter__(self):
         return self
@@ -205,6 +440,13 @@ class AzureFoundryProvider:
         return False
 
 
+_ASYNC_RESOURCES = (
+    ("_async_client", "_owns_async_client"),
+    ("_async_project_client", "_owns_async_project_client"),
+    ("_async_credential", "_owns_async_credential"),
+)
+
+
 def _extract_usage(usage: Any) -> dict[str, int | float | str | None]:
     if usage is None:
         return {}
@@ -243,3 +485,13 @@ def _close_sync(resource: Any) -> None:
     close = getattr(resource, "close", None)
     if callable(close):
         close()
+
+
+async def _close_async(resource: Any) -> None:
+    if resource is None:
+        return
+    close = getattr(resource, "close", None)
+    if callable(close):
+        result = close()
+        if inspect.isawaitable(result):
+            await result
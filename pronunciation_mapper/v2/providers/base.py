@@ -1,10 +1,20 @@
 """구조화 판정 provider가 구현해야 하는 최소 계약과 오류 분류."""
 
 import asyncio
+import math
+import time
 from typing import NoReturn, Protocol, runtime_checkable
 
 from ..errors import ProviderConfigurationError, ProviderUnavailableError
-from ..models import DecisionRequest, ProviderResponse
+from ..models import DecisionRequest, ProviderResponse, validate_decision_format
+
+# 출력 schema별 decision 하나의 대략적인 토큰 비용과 JSON 외곽 overhead.
+# batch prefix("t12.")와 긴 span id를 감안해 여유 있게 잡았습니다.
+DECISION_TOKEN_COST = {"standard": 48, "compact": 12}
+DECISION_TOKEN_OVERHEAD = 16
+# chat template 등 payload 밖에서 붙는 토큰 여유분.
+PROMPT_TOKEN_OVERHEAD = 64
+MIN_CONTEXT_TOKENS = 1024
 
 
 @runtime_checkable
@@ -22,6 +32,29 @@ class DecisionProvider(Protocol):
         """동기 컨텍스트에서 provider가 소유한 리소스를 해제합니다."""
 
 
+async def warm_up_provider(provider: DecisionProvider) -> dict[str, float]:
+    """provider가 ``warm_up()``을 구현하면 실행하고 단계별 소요 시간(ms)을 반환합니다.
+
+    ``warm_up()``은 선택 사항이라 계약에 넣지 않았습니다. 구현하지 않은 provider는
+    빈 dict를 반환합니다.
+    """
+    warm_up = getattr(provider, "warm_up", None)
+    if not callable(warm_up):
+        return {}
+    return dict(await warm_up())
+
+
+def consume_task_exception(task: asyncio.Future) -> None:
+    """버린 task의 예외를 꺼내 "exception was never retrieved" 경고를 막는 done callback."""
+    if not task.cancelled():
+        task.exception()
+
+
+def elapsed_ms(started: float) -> float:
+    """``time.perf_counter()`` 기준 시각부터 지난 시간을 ms로 반환합니다."""
+    return round((time.perf_counter() - started) * 1000, 3)
+
+
 def raise_classified_provider_error(provider: str, error: Exception) -> NoReturn:
     """SDK별 예외 타입에 결합하지 않고 HTTP/전송 오류를 공통 분류합니다.
 
@@ -54,6 +87,26 @@ def raise_classified_provider_error(provider: str, error: Exception) -> NoReturn
     raise ProviderUnavailableError(f"{provider} request failed{suffix}") from error
 
 
+def is_overload_error(error: BaseException) -> bool:
+    """HTTP 429 또는 timeout처럼 provider 용량 초과를 뜻하는 오류인지 판별합니다.
+
+    ``raise_classified_provider_error``는 원래 SDK 예외를 ``__cause__``로 남기므로
+    분류된 ``ProviderUnavailableError``도 원인 사슬을 따라가 확인합니다.
+    """
+    seen: set[int] = set()
+    current: BaseException | None = error
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        if isinstance(current, (TimeoutError, asyncio.TimeoutError)):
+            return True
+        if "timeout" in type(current).__name__.lower():
+            return True
+        if isinstance(current, Exception) and _status_code(current) == 429:
+            return True
+        current = current.__cause__
+    return False
+
+
 def _status_code(error: Exception) -> int | None:
     for value in (error, getattr(error, "response", None)):
         status = getattr(value, "status_code", None)
@@ -87,3 +140,35 @@ def _is_authentication_error(error: Exception) -> bool:
         and cause is not error
         and _is_authentication_error(cause)
     )
+
+
+def output_token_budget(request: DecisionRequest, decision_format: str, ceiling: int) -> int:
+    """span 수와 출력 schema 비용으로 생성 토큰 상한을 정하고 ``ceiling``을 넘지 않게 합니다."""
+    cost = DECISION_TOKEN_COST[validate_decision_format(decision_format)]
+    return min(ceiling, DECISION_TOKEN_OVERHEAD + cost * len(request.spans))
+
+
+def estimate_prompt_tokens(*texts: str) -> int:
+    """tokenizer 없이 입력 토큰을 보수적으로 어림합니다.
+
+    ASCII는 3자당 1, 한글 등 비ASCII 문자는 글자당 2로 세어 실제보다 크게
+    잡습니다. context가 모자라 prompt가 잘리는 것보다 조금 큰 편이 안전합니다.
+    """
+    total = PROMPT_TOKEN_OVERHEAD
+    for text in texts:
+        non_ascii = sum(not character.isascii() for character in text)
+        total += non_ascii * 2 + math.ceil((len(text) - non_ascii) / 3)
+    return total
+
+
+def context_window(prompt_tokens: int, output_tokens: int) -> int:
+    """필요한 토큰 수를 담는 가장 작은 2의 거듭제곱 context 크기를 반환합니다.
+
+    Ollama는 ``num_ctx``가 바뀌면 모델을 다시 올리므로 요청마다 정확한 값을
+    쓰지 않고 몇 개의 bucket으로 묶습니다.
+    """
+    needed = prompt_tokens + output_tokens
+    window = MIN_CONTEXT_TOKENS
+    while window < needed:
+        window *= 2
+    return window
@@ -1,12 +1,15 @@
 """명시적 provider 선택. Azure 장애 시 Ollama 자동 전환은 하지 않습니다."""
 
+import contextlib
 import os
+from collections.abc import Mapping, Sequence
 from typing import Any
 
 from ..errors import UnsupportedProviderError
 from .azure_foundry import AzureFoundryProvider
 from .base import DecisionProvider
 from .ollama import OllamaProvider
+from .pooled import PooledProvider
 
 
 def create_provider(name: str | None = None, **kwargs: Any) -> DecisionProvider:
@@ -20,3 +23,33 @@ def create_provider(name: str | None = None, **kwargs: Any) -> DecisionProvider:
             f"{provider_name} is reference-only in V2; choose 'azure' or 'ollama'"
         )
     raise UnsupportedProviderError(f"unsupported provider: {provider_name}")
+
+
+def create_provider_pool(
+    name: str | None,
+    members: Sequence[Mapping[str, Any]],
+    **pool_options: Any,
+) -> PooledProvider:
+    """같은 provider 종류의 endpoint별 설정으로 ``PooledProvider``를 만듭니다.
+
+    ``members``의 각 항목은 ``create_provider(name, **options)``에 그대로 전달됩니다.
+    중간 member 생성이나 pool 검증이 실패하면 이미 만든 member를 닫은 뒤 원래
+    예외를 다시 발생시킵니다.
+    """
+    if isinstance(members, (str, bytes)) or not isinstance(members, Sequence):
+        raise TypeError("members must be a sequence of provider option mappings")
+    if any(not isinstance(options, Mapping) for options in members):
+        raise TypeError("each member must be a mapping of provider options")
+    providers: list[DecisionProvider] = []
+    try:
+        for options in members:
+            providers.append(create_provider(name, **dict(options)))
+        return PooledProvider(providers, **pool_options)
+    except BaseException:
+        for provider in providers:
+            close = getattr(provider, "close", None)
+            if callable(close):
+                # 정리 실패가 원래 생성 실패를 가리지 않도록 무시합니다.
+                with contextlib.suppress(Exception):
+                    close()
+        raise
@@ -0,0 +1,209 @@
+"""느린 응답에 두 번째 요청을 보내 tail latency를 줄이는 provider wrapper."""
+
+import asyncio
+import math
+import time
+from collections import deque
+from dataclasses import dataclass
+
+from ..errors import InvalidProviderOutputError
+from ..models import DecisionRequest, ProviderResponse
+from .base import DecisionProvider, consume_task_exception, warm_up_provider
+
+
+@dataclass(frozen=True, slots=True)
+class HedgeStats:
+    requests: int
+    hedged: int
+    hedge_wins: int
+    hedge_delay_ms: float
+
+    @property
+    def hedge_rate(self) -> float:
+        return self.hedged / self.requests if self.requests else 0.0
+
+
+class HedgedProvider:
+    """첫 요청이 최근 latency 분위수(기본 p95)를 넘기면 hedge 요청을 보냅니다.
+
+    먼저 도착한 유효한 응답을 사용하고 나머지 요청은 취소합니다. hedge 대상은
+    같은 provider 인스턴스 또는 호출자가 명시한 같은 종류(``name``)의 다른
+    인스턴스이며, 다른 데이터 경계로 자동 전환하지 않는다는 ADR 0002 원칙에 따라
+    암묵적으로 선택하지 않고 종류가 다른 hedge는 ``PooledProvider``와 같이
+    거절합니다.
+    """
+
+    def __init__(
+        self,
+        primary: DecisionProvider,
+        hedge: DecisionProvider | None = None,
+        *,
+        quantile: float = 0.95,
+        initial_delay_ms: float = 500.0,
+        min_delay_ms: float = 20.0,
+        max_delay_ms: float = 5000.0,
+        window: int = 256,
+        min_samples: int = 20,
+    ):
+        if isinstance(quantile, bool) or not isinstance(quantile, (int, float)) or not 0.0 < quantile < 1.0:
+            raise ValueError("quantile must be between 0 and 1")
+        for name, value in (
+            ("initial_delay_ms", initial_delay_ms),
+            ("min_delay_ms", min_delay_ms),
+            ("max_delay_ms", max_delay_ms),
+        ):
+            if (
+                isinstance(value, bool)
+                or not isinstance(value, (int, float))
+                or not math.isfinite(value)
+                or value < 0
+            ):
+                raise ValueError(f"{name} must be a non-negative finite number")
+        if min_delay_ms > max_delay_ms:
+            raise ValueError("min_delay_ms must not exceed max_delay_ms")
+        for name, value in (("window", window), ("min_samples", min_samples)):
+            if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+                raise ValueError(f"{name} must be at least 1")
+
+        if hedge is not None and getattr(hedge, "name", None) != getattr(primary, "name", None):
+            raise ValueError(
+                "hedge and primary must share one provider type; "
+                "mixing data boundaries is not allowed (ADR 0002)"
+            )
+
+        self.primary = primary
+        self.hedge = primary if hedge is None else hedge
+        self.name = primary.name
+        self.model = primary.model
+        self.quantile = float(quantile)
+        self.initial_delay_ms = float(initial_delay_ms)
+        self.min_delay_ms = float(min_delay_ms)
+        self.max_delay_ms = float(max_delay_ms)
+        self.min_samples = min_samples
+        self._latencies_ms: deque[float] = deque(maxlen=window)
+        self._requests = 0
+        self._hedged = 0
+        self._hedge_wins = 0
+
+    @property
+    def hedge_delay_ms(self) -> float:
+        if len(self._latencies_ms) < self.min_samples:
+            delay = self.initial_delay_ms
+        else:
+            ordered = sorted(self._latencies_ms)
+            index = min(len(ordered) - 1, math.ceil(len(ordered) * self.quantile) - 1)
+            delay = ordered[index]
+        return min(self.max_delay_ms, max(self.min_delay_ms, delay))
+
+    async def warm_up(self) -> dict[str, float]:
+        """primary와 (다른 인스턴스라면) hedge provider를 함께 준비합니다."""
+        targets = [("primary", self.primary)]
+        if self.hedge is not self.primary:
+            targets.append(("hedge", self.hedge))
+        results = await asyncio.gather(*(warm_up_provider(provider) for _, provider in targets))
+        return {
+            f"{label}.{step}": value
+            for (label, _), timings in zip(targets, results)
+            for step, value in timings.items()
+        }
+
+    async def decide(self, request: DecisionRequest) -> ProviderResponse:
+        self._requests += 1
+        primary_started = time.perf_counter()
+        primary = asyncio.ensure_future(self.primary.decide(request))
+        primary_finished: list[float] = []
+        primary.add_done_callback(lambda _: primary_finished.append(time.perf_counter()))
+        pending = {primary}
+        errors: list[BaseException] = []
+        try:
+            done, pending = await asyncio.wait(pending, timeout=self.hedge_delay_ms / 1000)
+            if not done:
+                self._hedged += 1
+                pending.add(asyncio.ensure_future(self.hedge.decide(request)))
+            while True:
+                # primary와 hedge가 같은 tick에 끝나면 primary를 우선합니다.
+                for task in sorted(done, key=lambda item: item is not primary):
+                    error = task.exception()
+                    if error is None:
+                        error = _invalid_response_error(task.result(), request)
+                    if error is None:
+                        if task is not primary:
+                            self._hedge_wins += 1
+                        return task.result()
+                    errors.append(error)
+                if not pending:
+                    raise errors[0]
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            # hedge 지연은 primary 자체의 latency 분포를 따라야 하므로 승패와 관계없이
+            # primary 시작 시각부터 잽니다. hedge가 이겨 primary를 취소하면 지금까지
+            # 걸린 시간을 하한으로 기록합니다.
+            if primary_finished:
+                if not primary.cancelled() and primary.exception() is None:
+                    self._latencies_ms.append((primary_finished[0] - primary_started) * 1000)
+            elif primary in pending:
+                self._latencies_ms.append((time.perf_counter() - primary_started) * 1000)
+            for task in pending:
+                task.cancel()
+                task.add_done_callback(consume_task_exception)
+
+    def stats(self) -> HedgeStats:
+        return HedgeStats(
+            requests=self._requests,
+            hedged=self._hedged,
+            hedge_wins=self._hedge_wins,
+            hedge_delay_ms=round(self.hedge_delay_ms, 3),
+        )
+
+    async def aclose(self) -> None:
+        """wrapper가 묶은 provider들을 한 번씩 해제합니다."""
+        for provider in _distinct(self.primary, self.hedge):
+            aclose = getattr(provider, "aclose", None)
+            if callable(aclose):
+                await aclose()
+                continue
+            close = getattr(provider, "close", None)
+            if callable(close):
+                await asyncio.to_thread(close)
+
+    def close(self) -> None:
+        for provider in _distinct(self.primary, self.hedge):
+            close = getattr(provider, "close", None)
+            if callable(close):
+                close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        self.close()
+        return False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> bool:
+        await self.aclose()
+        return False
+
+
+def _invalid_response_error(
+    response: ProviderResponse, request: DecisionRequest
+) -> InvalidProviderOutputError | None:
+    # 전체 계약 검증은 engine이 수행합니다. 여기서는 승자를 고를 수 있을 만큼만
+    # 응답 형태와 span 집합을 확인합니다.
+    if not isinstance(response, ProviderResponse) or not isinstance(response.selections, tuple):
+        return InvalidProviderOutputError("provider must return ProviderResponse")
+    expected = {span.id for span in request.spans}
+    received = [getattr(selection, "span_id", None) for selection in response.selections]
+    if len(received) != len(expected) or set(received) != expected:
+        return InvalidProviderOutputError("provider must return exactly one decision per requested span")
+    return None
+
+
+def _distinct(*providers):
+    seen = []
+    for provider in providers:
+        if all(provider is not other for other in seen):
+            seen.append(provider)
+    return seen
@@ -1,18 +1,51 @@
 """Ollama native API provider."""
 
+import asyncio
 import inspect
 import json
 import math
 import os
+import threading
+import time
+import weakref
+from collections.abc import AsyncGenerator
 from typing import Any
 
 from ..errors import InvalidProviderOutputError, ProviderConfigurationError
-from ..models import DECISION_SCHEMA, DecisionRequest, ProviderResponse, parse_provider_payload
-from ..prompts import SYSTEM_INSTRUCTIONS
-from .base import raise_classified_provider_error
+from ..models import (
+    DecisionRequest,
+    ProviderResponse,
+    decision_schema,
+    parse_provider_payload,
+    validate_decision_format,
+    validate_payload_format,
+)
+from ..prompts import system_instructions
+from .base import (
+    MIN_CONTEXT_TOKENS,
+    context_window,
+    elapsed_ms,
+    estimate_prompt_tokens,
+    output_token_budget,
+    raise_classified_provider_error,
+)
 
 
 class OllamaProvider:
+    """Ollama native chat API provider.
+
+    내부에서 만든 ``AsyncClient``는 실행 중인 event loop마다 하나씩 재사용해
+    HTTP keep-alive 연결을 유지합니다. client는 그 loop의 async generator에
+    묶여 있어 ``asyncio.run()``이 끝날 때 ``shutdown_asyncgens()``가 닫고,
+    ``aclose()``는 현재 loop의 client를 바로 닫습니다. ``reuse_client=False``면
+    이전처럼 호출마다 client를 만들고 닫습니다.
+
+    ``adaptive_budget``의 ``num_ctx``는 요청마다 크기에 맞는 bucket으로 정하므로
+    작은 요청은 큰 KV cache를 잡지 않습니다. Ollama는 ``num_ctx``가 바뀔 때마다
+    모델을 다시 올리므로 ``warm_up()``은 마지막 요청이 쓴 bucket(처음에는 최소
+    bucket)으로 적재해 같은 크기의 다음 요청이 재적재하지 않게 합니다.
+    """
+
     name = "ollama"
 
     def __init__(
@@ -24,6 +57,11 @@ class OllamaProvider:
         max_output_tokens: int = 2048,
         keep_alive: str = "5m",
         client: Any | None = None,
+        payload_format: str = "standard",
+        decision_format: str = "standard",
+        adaptive_budget: bool = False,
+        reuse_client: bool = True,
+        max_connections: int | None = None,
     ):
         self.host = host or os.getenv("OLLAMA_HOST") or "http://localhost:11434"
         self.model = model or os.getenv("OLLAMA_MODEL") or "qwen3.5:4b"
@@ -36,54 +74,87 @@ class OllamaProvider:
             raise ValueError("max_output_tokens must be a positive integer")
         self.max_output_tokens = max_output_tokens
         self.keep_alive = keep_alive
+        self.payload_format = validate_payload_format(payload_format)
+        self.decision_format = validate_decision_format(decision_format)
+        if max_connections is not None and (
+            isinstance(max_connections, bool)
+            or not isinstance(max_connections, int)
+            or max_connections < 1
+        ):
+            raise ValueError("max_connections must be at least 1")
+        self.adaptive_budget = bool(adaptive_budget)
+        self._num_ctx = MIN_CONTEXT_TOKENS
+        self.reuse_client = bool(reuse_client)
+        self.max_connections = max_connections
         self._client = client
+        self._loop_clients: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, tuple[Any, AsyncGenerator[None, None]]
+        ] = weakref.WeakKeyDictionary()
+        self._loop_clients_lock = threading.Lock()
 
-    async def decide(self, request: DecisionRequest) -> ProviderResponse:
-        if not isinstance(self.model, str) or not self.model.strip():
-            raise ProviderConfigurationError("Ollama model is missing; set OLLAMA_MODEL")
+    async def warm_up(self) -> dict[str, float]:
+        """SDK import, client 생성, 모델 적재를 미리 수행하고 단계별 소요 시간(ms)을 반환합니다.
 
-        owns_client = self._client is None
-        try:
-            client = self._client if self._client is not None else self._new_client()
-        except ProviderConfigurationError:
-            raise
-        except Exception as error:
-            raise_classified_provider_error("Ollama", error)
+        빈 prompt로 ``generate``를 호출하면 Ollama는 답을 만들지 않고 모델만
+        ``keep_alive`` 동안 메모리에 올려 둡니다. ``adaptive_budget``이면
+        마지막 ``decide()``가 쓴 ``num_ctx``로 적재합니다.
+        """
+        self._check_model()
+        timings = {}
+        if self._client is None:
+            started = time.perf_counter()
+            self._load_client_class()
+            timings["import_sdk"] = elapsed_ms(started)
+        started = time.perf_counter()
+        client, owns_client = await self._acquire_client()
+        timings["client"] = elapsed_ms(started)
 
-        payload = json.dumps(request.to_provider_payload(), ensure_ascii=False, separators=(",", ":"))
-        response = None
-        request_error: BaseException | None = None
-        try:
-            response = await client.chat(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": SYSTEM_INSTRUCTIONS},
-                    {"role": "user", "content": payload},
-                ],
-                format=DECISION_SCHEMA,
-                stream=False,
-                think=False,
-                options={"temperature": 0, "num_predict": self.max_output_tokens},
-                keep_alive=self.keep_alive,
-            )
-        except BaseException as error:
-            request_error = error
+        load_kwargs = {"model": self.model, "prompt": "", "keep_alive": self.keep_alive}
+        if self.adaptive_budget:
+            load_kwargs["options"] = {"num_ctx": self._num_ctx}
+        started = time.perf_counter()
+        await self._send(client, owns_client, "generate", **load_kwargs)
+        timings["model_load"] = elapsed_ms(started)
+        return timings
 
-        # An internally-created AsyncClient belongs to this invocation. This
-        # avoids retaining a client bound to a completed asyncio.run() loop.
-        if owns_client:
-            try:
-                await _close_async(client)
-            except BaseException as close_error:
-                if request_error is None:
-                    if isinstance(close_error, Exception):
-                        raise_classified_provider_error("Ollama client close", close_error)
-                    raise
+    async def decide(self, request: DecisionRequest) -> ProviderResponse:
+        self._check_model()
+        client, owns_client = await self._acquire_client()
 
-        if request_error is not None:
-            if isinstance(request_error, Exception):
-                raise_classified_provider_error("Ollama", request_error)
-            raise request_error
+        payload = json.dumps(
+            request.to_provider_payload(self.payload_format),
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        instructions = system_instructions(
+            self.payload_format, self.decision_format, nbest=request.has_hypotheses
+        )
+        options = {"temperature": 0, "num_predict": self.max_output_tokens}
+        if self.adaptive_budget:
+            # 작은 요청이 큰 KV cache를 잡지 않고, 폭주한 생성도 span 수에 맞춰
+            # 끊기도록 num_predict와 num_ctx를 요청 크기로 정합니다.
+            options["num_predict"] = output_token_budget(
+                request, self.decision_format, self.max_output_tokens
+            )
+            self._num_ctx = context_window(
+                estimate_prompt_tokens(instructions, payload), options["num_predict"]
+            )
+            options["num_ctx"] = self._num_ctx
+        response = await self._send(
+            client,
+            owns_client,
+            "chat",
+            model=self.model,
+            messages=[
+                {"role": "system", "content": instructions},
+                {"role": "user", "content": payload},
+            ],
+            format=decision_schema(self.decision_format),
+            stream=False,
+            think=False,
+            options=options,
+            keep_alive=self.keep_alive,
+        )
 
         message = _value(response, "message")
         content = _value(message, "content")
@@ -110,11 +181,82 @@ class OllamaProvider:
             provider=self.name,
             model=self.model,
             usage=usage,
+            decision_format=self.decision_format,
+            request=request,
         )
 
+    async def _acquire_client(self) -> tuple[Any, bool]:
+        """호출에 쓸 client와 호출 뒤 닫아야 하는지 여부를 반환합니다."""
+        owns_client = self._client is None and not self.reuse_client
+        try:
+            if self._client is not None:
+                return self._client, owns_client
+            if self.reuse_client:
+                return await self._loop_client(), owns_client
+            return self._new_client(), owns_client
+        except ProviderConfigurationError:
+            raise
+        except Exception as error:
+            raise_classified_provider_error("Ollama", error)
+
+    async def _send(self, client: Any, owns_client: bool, method: str, **kwargs: Any) -> Any:
+        """SDK 호출 하나를 수행하고 SDK 오류를 provider 오류로 분류합니다."""
+        response = None
+        request_error: BaseException | None = None
+        try:
+            response = await getattr(client, method)(**kwargs)
+        except BaseException as error:
+            request_error = error
+
+        # An internally-created AsyncClient belongs to this invocation. This
+        # avoids retaining a client bound to a completed asyncio.run() loop.
+        if owns_client:
+            try:
+                await _close_async(client)
+            except BaseException as close_error:
+                if request_error is None:
+                    if isinstance(close_error, Exception):
+                        raise_classified_provider_error("Ollama client close", close_error)
+                    raise
+
+        if request_error is not None:
+            if isinstance(request_error, Exception):
+                raise_classified_provider_error("Ollama", request_error)
+            raise request_error
+        return response
+
+    def _check_model(self) -> None:
+        if not isinstance(self.model, str) or not self.model.strip():
+            raise ProviderConfigurationError("Ollama model is missing; set OLLAMA_MODEL")
+
     def _new_client(self):
         AsyncClient = self._load_client_class()
-        return AsyncClient(host=self.host, timeout=self.timeout)
+        if self.max_connections is None:
+            return AsyncClient(host=self.host, timeout=self.timeout)
+        import httpx
+
+        # AsyncClient는 추가 인자를 내부 httpx.AsyncClient에 그대로 넘깁니다.
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_connections,
+        )
+        return AsyncClient(host=self.host, timeout=self.timeout, limits=limits)
+
+    async def _loop_client(self):
+        loop = asyncio.get_running_loop()
+        with self._loop_clients_lock:
+            entry = self._loop_clients.get(loop)
+            if entry is not None:
+                return entry[0]
+            for stale in [other for other in self._loop_clients if other.is_closed()]:
+                # shutdown_asyncgens 없이 닫힌 loop의 client는 닫을 수 없어 버립니다.
+                del self._loop_clients[stale]
+            client = self._new_client()
+            holder = _hold_client(client)
+            self._loop_clients[loop] = (client, holder)
+        # 첫 반복에서 loop의 asyncgen hook이 holder를 등록하므로 loop 종료 시 닫힙니다.
+        await anext(holder)
+        return client
 
     @staticmethod
     def _load_client_class():
@@ -128,10 +270,17 @@ class OllamaProvider:
         return AsyncClient
 
     async def aclose(self) -> None:
-        """No-op: injected clients are caller-owned; internal clients are per-call."""
+        """현재 loop에서 재사용하던 내부 client를 닫습니다. 주입한 client는 닫지 않습니다."""
+        with self._loop_clients_lock:
+            entry = self._loop_clients.pop(asyncio.get_running_loop(), None)
+        if entry is not None:
+            await entry[1].aclose()
 
     def close(self) -> None:
-        """No-op: injected clients are caller-owned; internal clients are per-call."""
+        """닫힌 loop의 client 참조를 놓습니다. 실행 중인 loop의 client는 그 loop가 닫습니다."""
+        with self._loop_clients_lock:
+            for loop in [loop for loop in self._loop_clients if loop.is_closed()]:
+                del self._loop_clients[loop]
 
     def __enter__(self):
         return self
@@ -148,6 +297,13 @@ class OllamaProvider:
         return False
 
 
+async def _hold_client(client: Any) -> AsyncGenerator[None, None]:
+    try:
+        yield
+    finally:
+        await _close_async(client)
+
+
 def _value(value: Any, key: str) -> Any:
     if isinstance(value, dict):
         return value.get(key)
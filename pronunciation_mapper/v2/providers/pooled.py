@@ -0,0 +1,213 @@
+"""같은 종류의 여러 endpoint에 판정 요청을 나누는 provider pool."""
+
+import asyncio
+import itertools
+import math
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+
+from ..errors import ProviderUnavailableError
+from ..models import DecisionRequest, ProviderResponse
+from .base import DecisionProvider, warm_up_provider
+
+POOL_STRATEGIES = ("least-outstanding", "ewma")
+
+
+@dataclass(frozen=True, slots=True)
+class PoolMemberStats:
+    index: int
+    model: str
+    requests: int
+    failures: int
+    outstanding: int
+    ewma_latency_ms: float | None
+    healthy: bool
+
+
+@dataclass(slots=True)
+class _Member:
+    provider: DecisionProvider
+    requests: int = 0
+    failures: int = 0
+    outstanding: int = 0
+    ewma_latency_ms: float | None = None
+    ejected_until: float = 0.0
+
+
+class PooledProvider:
+    """명시적으로 구성한 provider 인스턴스들에 ``decide()``를 분산합니다.
+
+    ``least-outstanding``은 진행 중인 요청이 가장 적은 member를, ``ewma``는
+    지수 이동 평균 latency × (진행 중 요청 + 1)이 가장 작은 member를 고릅니다.
+    ``ProviderUnavailableError``를 낸 member는 ``eject_ms`` 동안 선택에서 빼고
+    같은 요청을 아직 시도하지 않은 다른 member로 다시 보냅니다. 모든 member가
+    빠져 있으면 복귀가 가장 가까운 member부터 다시 시도합니다.
+
+    ADR 0002에 따라 member는 모두 같은 provider 종류(``name``)여야 합니다.
+    여러 Ollama host 또는 여러 Foundry deployment를 묶을 수 있지만 Azure와
+    Ollama를 섞어 데이터 경계를 넘나드는 pool은 만들 수 없습니다.
+    """
+
+    def __init__(
+        self,
+        members: Sequence[DecisionProvider],
+        *,
+        strategy: str = "least-outstanding",
+        ewma_alpha: float = 0.3,
+        eject_ms: float = 30_000.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if isinstance(members, (str, bytes)) or not isinstance(members, Sequence):
+            raise TypeError("members must be a sequence of providers")
+        members = list(members)
+        if not members:
+            raise ValueError("members must contain at least one provider")
+        if any(not callable(getattr(member, "decide", None)) for member in members):
+            raise TypeError("every member must implement decide()")
+        if len({id(member) for member in members}) != len(members):
+            raise ValueError("members must be distinct provider instances")
+        names = {getattr(member, "name", None) for member in members}
+        if len(names) != 1:
+            raise ValueError(
+                "pool members must share one provider type; "
+                "mixing data boundaries is not allowed (ADR 0002)"
+            )
+        if strategy not in POOL_STRATEGIES:
+            raise ValueError(f"strategy must be one of: {', '.join(POOL_STRATEGIES)}")
+        if (
+            isinstance(ewma_alpha, bool)
+            or not isinstance(ewma_alpha, (int, float))
+            or not 0.0 < ewma_alpha <= 1.0
+        ):
+            raise ValueError("ewma_alpha must be in (0, 1]")
+        if (
+            isinstance(eject_ms, bool)
+            or not isinstance(eject_ms, (int, float))
+            or not math.isfinite(eject_ms)
+            or eject_ms < 0
+        ):
+            raise ValueError("eject_ms must be a non-negative finite number")
+        if not callable(clock):
+            raise TypeError("clock must be callable")
+
+        self.name = names.pop()
+        models = list(dict.fromkeys(getattr(member, "model", "") for member in members))
+        self.model = ",".join(models)
+        self.strategy = strategy
+        self.ewma_alpha = float(ewma_alpha)
+        self.eject_ms = float(eject_ms)
+        self._clock = clock
+        self._members = [_Member(member) for member in members]
+        # 점수가 같으면 돌아가며 고르도록 시작 위치를 옮깁니다.
+        self._rotation = itertools.count()
+
+    @property
+    def members(self) -> tuple[DecisionProvider, ...]:
+        return tuple(member.provider for member in self._members)
+
+    async def decide(self, request: DecisionRequest) -> ProviderResponse:
+        tried: set[int] = set()
+        last_error: ProviderUnavailableError | None = None
+        while True:
+            index = self._select(tried)
+            if index is None:
+                raise last_error
+            tried.add(index)
+            member = self._members[index]
+            member.requests += 1
+            member.outstanding += 1
+            started = time.perf_counter()
+            try:
+                response = await member.provider.decide(request)
+            except ProviderUnavailableError as error:
+                member.failures += 1
+                member.ejected_until = self._clock() + self.eject_ms / 1000
+                last_error = error
+                continue
+            finally:
+                member.outstanding -= 1
+            latency_ms = (time.perf_counter() - started) * 1000
+            if member.ewma_latency_ms is None:
+                member.ewma_latency_ms = latency_ms
+            else:
+                member.ewma_latency_ms += self.ewma_alpha * (latency_ms - member.ewma_latency_ms)
+            member.ejected_until = 0.0
+            return response
+
+    def _select(self, tried: set[int]) -> int | None:
+        candidates = [index for index in range(len(self._members)) if index not in tried]
+        if not candidates:
+            return None
+        now = self._clock()
+        healthy = [index for index in candidates if self._members[index].ejected_until <= now]
+        if not healthy:
+            return min(candidates, key=lambda index: self._members[index].ejected_until)
+        offset = next(self._rotation)
+        ordered = healthy[offset % len(healthy):] + healthy[: offset % len(healthy)]
+        return min(ordered, key=self._score)
+
+    def _score(self, index: int) -> tuple[float, ...]:
+        member = self._members[index]
+        # 아직 latency 표본이 없는 member는 0으로 보아 먼저 한 번 써 봅니다.
+        latency = member.ewma_latency_ms or 0.0
+        if self.strategy == "ewma":
+            return (latency * (member.outstanding + 1), member.outstanding)
+        return (member.outstanding, latency)
+
+    def stats(self) -> tuple[PoolMemberStats, ...]:
+        now = self._clock()
+        return tuple(
+            PoolMemberStats(
+                index=index,
+                model=getattr(member.provider, "model", ""),
+                requests=member.requests,
+                failures=member.failures,
+                outstanding=member.outstanding,
+                ewma_latency_ms=(
+                    None if member.ewma_latency_ms is None else round(member.ewma_latency_ms, 3)
+                ),
+                healthy=member.ejected_until <= now,
+            )
+            for index, member in enumerate(self._members)
+        )
+
+    async def warm_up(self) -> dict[str, float]:
+        """모든 member를 함께 준비하고 ``m<index>.<step>`` 이름으로 시간을 반환합니다."""
+        results = await asyncio.gather(*(warm_up_provider(provider) for provider in self.members))
+        return {
+            f"m{index}.{step}": value
+            for index, timings in enumerate(results)
+            for step, value in timings.items()
+        }
+
+    async def aclose(self) -> None:
+        """pool이 묶은 provider들을 한 번씩 해제합니다."""
+        for provider in self.members:
+            aclose = getattr(provider, "aclose", None)
+            if callable(aclose):
+                await aclose()
+                continue
+            close = getattr(provider, "close", None)
+            if callable(close):
+                await asyncio.to_thread(close)
+
+    def close(self) -> None:
+        for provider in self.members:
+            close = getattr(provider, "close", None)
+            if callable(close):
+                close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        self.close()
+        return False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> bool:
+        await self.aclose()
+        return False
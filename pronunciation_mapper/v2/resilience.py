@@ -0,0 +1,385 @@
+"""provider 장애가 지연 장애로 번지지 않게 하는 호출 보호 장치."""
+
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from enum import Enum
+
+from .errors import ConcurrencyLimitExceededError
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass(frozen=True, slots=True)
+class CircuitBreakerStats:
+    state: CircuitState
+    successes: int
+    failures: int
+    consecutive_failures: int
+    short_circuited: int
+    opened: int
+
+
+class CircuitBreaker:
+    """closed/open/half-open 상태를 가진 provider 호출 circuit breaker.
+
+    연속 실패가 ``failure_threshold``에 도달하거나 최근 ``window``개 호출의
+    실패율이 ``failure_rate_threshold`` 이상이면 열립니다. 열린 동안에는
+    provider를 호출하지 않고, ``reset_timeout`` 뒤 최대
+    ``half_open_max_calls``개의 시험 호출 결과로 닫을지 다시 열지 결정합니다.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = 5,
+        failure_rate_threshold: float = 0.5,
+        window: int = 20,
+        min_calls: int = 10,
+        reset_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        for name, value in (
+            ("failure_threshold", failure_threshold),
+            ("window", window),
+            ("min_calls", min_calls),
+            ("half_open_max_calls", half_open_max_calls),
+        ):
+            if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+                raise ValueError(f"{name} must be at least 1")
+        if (
+            isinstance(failure_rate_threshold, bool)
+            or not isinstance(failure_rate_threshold, (int, float))
+            or not 0.0 < failure_rate_threshold <= 1.0
+        ):
+            raise ValueError("failure_rate_threshold must be in (0, 1]")
+        if (
+            isinstance(reset_timeout, bool)
+            or not isinstance(reset_timeout, (int, float))
+            or not math.isfinite(reset_timeout)
+            or reset_timeout <= 0
+        ):
+            raise ValueError("reset_timeout must be a positive finite number")
+
+        self.failure_threshold = failure_threshold
+        self.failure_rate_threshold = float(failure_rate_threshold)
+        self.min_calls = min_calls
+        self.reset_timeout = float(reset_timeout)
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._outcomes: deque[bool] = deque(maxlen=window)
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._half_open_in_flight = 0
+        self._consecutive_failures = 0
+        self._successes = 0
+        self._failures = 0
+        self._short_circuited = 0
+        self._opened = 0
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            return self._current_state()
+
+    def allow(self) -> bool:
+        """호출을 진행해도 되면 ``True``를 반환하고 half-open 시험 슬롯을 예약합니다."""
+        with self._lock:
+            state = self._current_state()
+            if state is CircuitState.CLOSED:
+                return True
+            if state is CircuitState.HALF_OPEN and self._half_open_in_flight < self.half_open_max_calls:
+                self._half_open_in_flight += 1
+                return True
+            self._short_circuited += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._successes += 1
+            self._consecutive_failures = 0
+            self._outcomes.append(True)
+            if self._state is CircuitState.HALF_OPEN:
+                self._release_probe()
+                self._state = CircuitState.CLOSED
+                self._outcomes.clear()
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._consecutive_failures += 1
+            self._outcomes.append(False)
+            if self._state is CircuitState.HALF_OPEN:
+                self._release_probe()
+                self._open()
+                return
+            failures = self._outcomes.count(False)
+            if self._consecutive_failures >= self.failure_threshold or (
+                len(self._outcomes) >= self.min_calls
+                and failures / len(self._outcomes) >= self.failure_rate_threshold
+            ):
+                self._open()
+
+    def record_cancelled(self) -> None:
+        """결과 없이 끝난 호출의 half-open 슬롯만 반환합니다."""
+        with self._lock:
+            if self._state is CircuitState.HALF_OPEN:
+                self._release_probe()
+
+    def stats(self) -> CircuitBreakerStats:
+        with self._lock:
+            return CircuitBreakerStats(
+                state=self._current_state(),
+                successes=self._successes,
+                failures=self._failures,
+                consecutive_failures=self._consecutive_failures,
+                short_circuited=self._short_circuited,
+                opened=self._opened,
+            )
+
+    def _current_state(self) -> CircuitState:
+        if (
+            self._state is CircuitState.OPEN
+            and self._clock() - self._opened_at >= self.reset_timeout
+        ):
+            self._state = CircuitState.HALF_OPEN
+            self._half_open_in_flight = 0
+        return self._state
+
+    def _open(self) -> None:
+        if self._state is not CircuitState.OPEN:
+            self._opened += 1
+        self._state = CircuitState.OPEN
+        self._opened_at = self._clock()
+        self._half_open_in_flight = 0
+
+    def _release_probe(self) -> None:
+        self._half_open_in_flight = max(0, self._half_open_in_flight - 1)
+
+
+@dataclass(frozen=True, slots=True)
+class ConcurrencyLimiterStats:
+    limit: int
+    in_flight: int
+    queued: int
+    increases: int
+    decreases: int
+    rejected: int
+    baseline_latency_ms: float | None
+    smoothed_latency_ms: float | None = None
+
+
+class AdaptiveConcurrencyLimiter:
+    """provider 동시 호출 수를 AIMD로 조절하는 limiter.
+
+    한도가 꽉 찬 상태에서 latency가 건강하면 한도를 왕복 한 번에 약
+    ``increase``만큼 늘리고, 과부하 신호(HTTP 429, timeout)가 오거나 평활
+    latency가 baseline의 ``latency_tolerance``배를 넘으면 ``decrease_factor``를
+    곱해 줄입니다. 평활 latency는 계수 ``smoothing``의 EWMA이고 baseline은 약
+    ``window``개 표본에 걸쳐 천천히 움직이는 EWMA이므로, 요청마다 흔들리는
+    latency 하나로는 한도가 줄지 않습니다. ``record_success(size=...)``로 요청
+    크기(예: 추정 입력 토큰)를 주면 latency를 크기 단위당 값으로 바꿔 비교합니다.
+    같은 혼잡으로 동시에 실패한 호출들이 한도를 여러 번 깎지 않도록, 마지막
+    감소 이전에 시작한 호출의 신호는 무시합니다. 한도를 넘는 호출은 최대
+    ``max_queue``개까지 ``max_wait_ms`` 동안 기다리고, 그 밖에는
+    ``ConcurrencyLimitExceededError``로 거절합니다.
+
+    대기열은 asyncio future이므로 하나의 event loop에서 사용해야 합니다.
+    """
+
+    def __init__(
+        self,
+        *,
+        initial_limit: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 256,
+        increase: float = 1.0,
+        decrease_factor: float = 0.7,
+        latency_tolerance: float = 2.0,
+        smoothing: float = 0.2,
+        window: int = 100,
+        min_samples: int = 10,
+        max_queue: int = 1024,
+        max_wait_ms: float = 1000.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        for name, value in (
+            ("initial_limit", initial_limit),
+            ("min_limit", min_limit),
+            ("max_limit", max_limit),
+            ("window", window),
+            ("min_samples", min_samples),
+        ):
+            if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+                raise ValueError(f"{name} must be at least 1")
+        if not min_limit <= initial_limit <= max_limit:
+            raise ValueError("initial_limit must be between min_limit and max_limit")
+        if isinstance(max_queue, bool) or not isinstance(max_queue, int) or max_queue < 0:
+            raise ValueError("max_queue must be a non-negative integer")
+        if (
+            isinstance(decrease_factor, bool)
+            or not isinstance(decrease_factor, (int, float))
+            or not 0.0 < decrease_factor < 1.0
+        ):
+            raise ValueError("decrease_factor must be in (0, 1)")
+        if (
+            isinstance(smoothing, bool)
+            or not isinstance(smoothing, (int, float))
+            or not 0.0 < smoothing <= 1.0
+        ):
+            raise ValueError("smoothing must be in (0, 1]")
+        for name, value, minimum in (
+            ("increase", increase, 0.0),
+            ("latency_tolerance", latency_tolerance, 1.0),
+            ("max_wait_ms", max_wait_ms, 0.0),
+        ):
+            if (
+                isinstance(value, bool)
+                or not isinstance(value, (int, float))
+                or not math.isfinite(value)
+                or value < minimum
+            ):
+                raise ValueError(f"{name} must be a finite number of at least {minimum:g}")
+
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = float(increase)
+        self.decrease_factor = float(decrease_factor)
+        self.latency_tolerance = float(latency_tolerance)
+        self.smoothing = float(smoothing)
+        self.window = window
+        self.min_samples = min_samples
+        self.max_queue = max_queue
+        self.max_wait_ms = float(max_wait_ms)
+        self._clock = clock
+        self._limit = float(initial_limit)
+        self._samples = 0
+        self._smoothed: float | None = None
+        self._baseline: float | None = None
+        self._waiters: deque[asyncio.Future] = deque()
+        self._in_flight = 0
+        self._last_decrease = -math.inf
+        self._increases = 0
+        self._decreases = 0
+        self._rejected = 0
+
+    @property
+    def limit(self) -> int:
+        return max(self.min_limit, int(self._limit))
+
+    async def acquire(self) -> float:
+        """호출 슬롯을 얻고 ``record_*()``에 넘길 시작 시각을 반환합니다."""
+        if self._in_flight < self.limit and not self._waiters:
+            self._in_flight += 1
+            return self._clock()
+        if len(self._waiters) >= self.max_queue:
+            self._rejected += 1
+            raise ConcurrencyLimitExceededError("provider concurrency queue is full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.max_wait_ms / 1000)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as error:
+            if waiter.done() and not waiter.cancelled():
+                # 시간 초과와 동시에 슬롯을 넘겨받았다면 시간 초과만 무시하고
+                # 취소라면 받은 슬롯을 돌려줍니다.
+                if isinstance(error, asyncio.CancelledError):
+                    self._release_slot()
+                    raise
+                return self._clock()
+            waiter.cancel()
+            try:
+                self._waiters.remove(waiter)
+            except ValueError:
+                pass
+            if isinstance(error, asyncio.CancelledError):
+                raise
+            self._rejected += 1
+            raise ConcurrencyLimitExceededError(
+                f"no provider concurrency slot within {self.max_wait_ms:g}ms"
+            ) from None
+        return self._clock()
+
+    def record_success(self, started: float, size: float = 1.0) -> None:
+        """응답을 받은 호출의 슬롯을 반환하고 latency로 한도를 조정합니다.
+
+        ``size``는 요청 크기이며 latency를 ``size``로 나눈 값을 표본으로 씁니다.
+        """
+        if (
+            isinstance(size, bool)
+            or not isinstance(size, (int, float))
+            or not math.isfinite(size)
+            or size <= 0
+        ):
+            self._release_slot()
+            raise ValueError("size must be a positive finite number")
+        saturated = self._in_flight >= self.limit or bool(self._waiters)
+        sample = (self._clock() - started) * 1000 / size
+        self._samples += 1
+        # 첫 min_samples개는 단순 평균으로 baseline을 잡고, 그 뒤에는 약 window개
+        # 표본에 걸쳐 천천히 따라가게 합니다.
+        if self._smoothed is None or self._baseline is None:
+            self._smoothed = self._baseline = sample
+        else:
+            self._smoothed += max(self.smoothing, 1 / self._samples) * (sample - self._smoothed)
+        congested = (
+            self._samples > self.min_samples
+            and self._smoothed > self._baseline * self.latency_tolerance
+        )
+        weight = 1 / self._samples if self._samples <= self.min_samples else 1 / self.window
+        self._baseline += weight * (sample - self._baseline)
+        if congested:
+            self._decrease(started)
+        elif saturated and self._limit < self.max_limit:
+            self._limit = min(float(self.max_limit), self._limit + self.increase / self._limit)
+            self._increases += 1
+        self._release_slot()
+
+    def record_overload(self, started: float) -> None:
+        """throttling(HTTP 429)이나 timeout으로 끝난 호출의 슬롯을 반환하고 한도를 줄입니다."""
+        self._decrease(started)
+        self._release_slot()
+
+    def record_ignored(self) -> None:
+        """취소나 설정 오류처럼 용량과 무관하게 끝난 호출의 슬롯만 반환합니다."""
+        self._release_slot()
+
+    def stats(self) -> ConcurrencyLimiterStats:
+        return ConcurrencyLimiterStats(
+            limit=self.limit,
+            in_flight=self._in_flight,
+            queued=len(self._waiters),
+            increases=self._increases,
+            decreases=self._decreases,
+            rejected=self._rejected,
+            baseline_latency_ms=None if self._baseline is None else round(self._baseline, 3),
+            smoothed_latency_ms=None if self._smoothed is None else round(self._smoothed, 3),
+        )
+
+    def _decrease(self, started: float) -> None:
+        if started < self._last_decrease:
+            return
+        self._limit = max(float(self.min_limit), self._limit * self.decrease_factor)
+        self._last_decrease = self._clock()
+        self._decreases += 1
+
+    def _release_slot(self) -> None:
+        self._in_flight -= 1
+        # 대기자에게 슬롯을 넘길 때는 in_flight를 줄이지 않은 것처럼 바로 채웁니다.
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            waiter.set_result(None)
+            self._in_flight += 1
@@ -0,0 +1,111 @@
+"""동기 호출자가 공유하는 background event loop."""
+
+import asyncio
+import threading
+from collections.abc import Coroutine
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class BackgroundLoopRunner:
+    """전용 thread에서 도는 event loop 하나에 coroutine을 제출합니다.
+
+    ``asyncio.run()``은 호출마다 loop를 새로 만들고 닫으므로 provider가 loop에
+    묶인 연결 pool을 유지할 수 없습니다. 이 runner는 loop를 처음 ``run()`` 때
+    시작해 ``close()``까지 유지하므로, 여러 동기 worker thread가 같은 loop와
+    provider 연결을 함께 씁니다. ``close()``는 남은 task를 취소하고
+    ``shutdown_asyncgens()``로 loop에 묶인 client를 닫은 뒤 thread를 멈춥니다.
+    """
+
+    def __init__(self, *, name: str = "pronunciation-mapper-loop"):
+        if not isinstance(name, str) or not name:
+            raise ValueError("name must be a non-empty string")
+        self.name = name
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @property
+    def running(self) -> bool:
+        """loop thread가 시작되었고 아직 닫히지 않았는지 여부."""
+        return self._loop is not None and not self._closed
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """필요하면 loop thread를 시작하고 그 loop를 반환합니다."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("runner is closed")
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                started = threading.Event()
+                thread = threading.Thread(
+                    target=self._serve, args=(loop, started), name=self.name, daemon=True
+                )
+                thread.start()
+                started.wait()
+                self._loop, self._thread = loop, thread
+            return self._loop
+
+    def run(self, coroutine: Coroutine[Any, Any, T], *, timeout: float | None = None) -> T:
+        """coroutine을 background loop에서 실행하고 결과를 기다립니다."""
+        if not asyncio.iscoroutine(coroutine):
+            raise TypeError("coroutine must be a coroutine object")
+        try:
+            loop = self.loop
+            if threading.current_thread() is self._thread:
+                raise RuntimeError("run() cannot be called from the runner's own loop thread")
+        except RuntimeError:
+            coroutine.close()
+            raise
+        future = asyncio.run_coroutine_threadsafe(coroutine, loop)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            # 호출자가 더 기다리지 않으므로 loop에 남은 작업도 취소합니다.
+            future.cancel()
+            raise
+
+    def close(self, *, timeout: float | None = 30.0) -> None:
+        """남은 task와 async generator를 정리하고 loop thread를 멈춥니다."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            loop, thread = self._loop, self._thread
+        if loop is None:
+            return
+        if threading.current_thread() is thread:
+            raise RuntimeError("close() cannot be called from the runner's own loop thread")
+        try:
+            asyncio.run_coroutine_threadsafe(_shutdown(loop), loop).result(timeout)
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout)
+            if not thread.is_alive():
+                loop.close()
+
+    @staticmethod
+    def _serve(loop: asyncio.AbstractEventLoop, started: threading.Event) -> None:
+        asyncio.set_event_loop(loop)
+        loop.call_soon(started.set)
+        loop.run_forever()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        self.close()
+        return False
+
+
+async def _shutdown(loop: asyncio.AbstractEventLoop) -> None:
+    current = asyncio.current_task()
+    tasks = [task for task in asyncio.all_tasks(loop) if task is not current]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await loop.shutdown_asyncgens()
+    await loop.shutdown_default_executor()
@@ -0,0 +1,62 @@
+"""긴 입력을 문장·절 경계에서 mapper 한도 안의 구간으로 나눕니다."""
+
+import re
+from collections.abc import Callable
+
+# 경계 문자 뒤의 공백을 구간 사이 간격으로 남깁니다. 공백 없이 붙은 문장부호는
+# 숫자·식별자 일부일 수 있으므로 경계로 보지 않습니다.
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?。！？])\s+|\n\s*")
+_CLAUSE_BOUNDARY = re.compile(r"(?<=[,;:，；：])\s+")
+_WORD_BOUNDARY = re.compile(r"\s+")
+
+
+def segment_text(text: str, fits: Callable[[str], bool]) -> tuple[tuple[int, int], ...]:
+    """``fits``를 만족하는 ``(start, end)`` 구간들을 원문 offset으로 반환합니다.
+
+    문장 경계로 먼저 나누고, 한도를 넘는 문장은 절, 그다음 공백 단위로 더
+    나눕니다. 이웃한 조각은 ``fits``가 허용하는 한 다시 합쳐 호출 수를
+    줄입니다. 구간 사이에는 공백만 남고, 공백 없는 한 단어가 한도를 넘으면
+    그 단어는 그대로 한 구간이 되어 호출자의 한도 검사에 맡깁니다.
+    """
+    refined = []
+    for start, end in _split(text, 0, len(text), _SENTENCE_BOUNDARY):
+        if fits(text[start:end]):
+            refined.append((start, end))
+            continue
+        for clause_start, clause_end in _split(text, start, end, _CLAUSE_BOUNDARY):
+            if fits(text[clause_start:clause_end]):
+                refined.append((clause_start, clause_end))
+            else:
+                refined.extend(_split(text, clause_start, clause_end, _WORD_BOUNDARY))
+
+    segments: list[tuple[int, int]] = []
+    for start, end in refined:
+        if segments and fits(text[segments[-1][0]:end]):
+            segments[-1] = (segments[-1][0], end)
+        else:
+            segments.append((start, end))
+    return tuple(segments)
+
+
+def _split(text: str, start: int, end: int, boundary: re.Pattern) -> list[tuple[int, int]]:
+    pieces = []
+    cursor = start
+    for match in boundary.finditer(text, start, end):
+        if match.start() > cursor:
+            pieces.append((cursor, match.start()))
+        cursor = match.end()
+    if cursor < end:
+        pieces.append((cursor, end))
+    return [
+        _strip(text, piece_start, piece_end)
+        for piece_start, piece_end in pieces
+        if text[piece_start:piece_end].strip()
+    ]
+
+
+def _strip(text: str, start: int, end: int) -> tuple[int, int]:
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return start, end
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Compare rewrite throughput with candidate generation on and off the event loop."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from pronunciation_mapper.v2 import (  # noqa: E402
+    AgenticPronunciationMapper,
+    DecisionAction,
+    ProviderResponse,
+    ProviderSelection,
+    ReasonCode,
+)
+
+SYLLABLES = ("트", "랜", "잭", "션", "로", "그", "서", "버", "커", "스", "터", "머", "쿼", "리")
+# Terms always in the vocabulary, with misheard Hangul forms that need a provider decision.
+ANCHORS = {
+    "transaction": "트랜잭숑",
+    "customer": "커스토머",
+    "server": "써버",
+    "query": "쿼리이",
+    "rollback": "롤빽",
+}
+
+
+class SlowProvider:
+    """Keeps every span after a fixed network-like delay."""
+
+    name = "bench"
+    model = "sleep"
+
+    def __init__(self, latency_ms: float) -> None:
+        self.latency = latency_ms / 1000
+
+    async def decide(self, request):
+        await asyncio.sleep(self.latency)
+        selections = tuple(
+            ProviderSelection(span.id, DecisionAction.KEEP, None, 0.9, ReasonCode.AMBIGUOUS)
+            for span in request.spans
+        )
+        return ProviderResponse(selections, self.name, self.model, {})
+
+
+def build_workload(terms: int, texts: int, words: int, seed: int) -> tuple[list[str], list[str]]:
+    rng = random.Random(seed)
+    filler = {f"term_{index}_{rng.randrange(10**6)}" for index in range(terms)}
+    vocabulary = sorted(filler | set(ANCHORS))
+    misheard = list(ANCHORS.values())
+    inputs = []
+    for _ in range(texts):
+        tokens = ["".join(rng.choices(SYLLABLES, k=rng.randint(2, 5))) for _ in range(words)]
+        tokens[rng.randrange(words)] = rng.choice(misheard)
+        inputs.append(" ".join(tokens))
+    return vocabulary, inputs
+
+
+async def measure(executor: str | None, args, vocabulary, inputs) -> dict:
+    mapper = AgenticPronunciationMapper(
+        vocabulary,
+        provider=SlowProvider(args.latency_ms),
+        executor=executor,
+        executor_workers=args.workers,
+    )
+    loop_lag = []
+
+    async def probe() -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(0.005)
+            loop_lag.append(time.perf_counter() - started - 0.005)
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def one(text: str) -> None:
+        async with semaphore:
+            await mapper.rewrite(text)
+
+    probe_task = asyncio.create_task(probe())
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(one(text) for text in inputs))
+    finally:
+        elapsed = time.perf_counter() - started
+        probe_task.cancel()
+        await mapper.aclose()
+    return {
+        "executor": executor or "none",
+        "seconds": round(elapsed, 3),
+        "rewrites_per_second": round(len(inputs) / elapsed, 1),
+        "max_loop_lag_ms": round(max(loop_lag, default=0.0) * 1000, 1),
+    }
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--terms", type=int, default=3000)
+    parser.add_argument("--texts", type=int, default=64)
+    parser.add_argument("--words", type=int, default=12)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    vocabulary, inputs = build_workload(args.terms, args.texts, args.words, args.seed)
+    report = [
+        await measure(executor, args, vocabulary, inputs)
+        for executor in (None, "thread", "process")
+    ]
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""Compare the sync and async Foundry transports against a local stand-in server.
+
+The server speaks just enough HTTP/1.1 of the Responses API for the OpenAI
+client: every POST to ``/responses`` waits ``--latency-ms`` and returns a
+``keep`` decision for each span. It records the peak number of requests in
+flight, so the report shows whether concurrency was capped by threads or by
+``max_connections``. Requires the ``foundry`` extra.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from pronunciation_mapper.v2 import (  # noqa: E402
+    AzureFoundryProvider,
+    Candidate,
+    CandidateSpan,
+    DecisionRequest,
+)
+
+
+class StandInServer:
+    def __init__(self, latency_ms: float) -> None:
+        self.latency = latency_ms / 1000
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.requests = 0
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    return
+                length = 0
+                while (line := await reader.readline()) not in (b"\r\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    if name.strip().lower() == "content-length":
+                        length = int(value)
+                body = json.loads(await reader.readexactly(length)) if length else {}
+                self.requests += 1
+                self.in_flight += 1
+                self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+                try:
+                    await asyncio.sleep(self.latency)
+                finally:
+                    self.in_flight -= 1
+                encoded = json.dumps(self.response(body)).encode()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\ncontent-type: application/json\r\n"
+                    + f"content-length: {len(encoded)}\r\n\r\n".encode()
+                    + encoded
+                )
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            return
+        finally:
+            writer.close()
+
+    @staticmethod
+    def response(body: dict) -> dict:
+        payload = json.loads(body.get("input", "{}"))
+        decisions = {
+            "decisions": [
+                {
+                    "span_id": span["span_id"],
+                    "action": "keep",
+                    "candidate_id": None,
+                    "confidence": 0.9,
+                    "reason_code": "ambiguous",
+                }
+                for span in payload.get("spans", ())
+            ]
+        }
+        return {
+            "id": "resp_bench",
+            "object": "response",
+            "created_at": 0,
+            "model": body.get("model", "bench"),
+            "status": "completed",
+            "output": [
+                {
+                    "type": "message",
+                    "id": "msg_bench",
+                    "role": "assistant",
+                    "status": "completed",
+                    "content": [
+                        {"type": "output_text", "text": json.dumps(decisions), "annotations": []}
+                    ],
+                }
+            ],
+            "parallel_tool_calls": False,
+            "tool_choice": "auto",
+            "tools": [],
+            "usage": {
+                "input_tokens": 1,
+                "input_tokens_details": {"cached_tokens": 0},
+                "output_tokens": 1,
+                "output_tokens_details": {"reasoning_tokens": 0},
+                "total_tokens": 2,
+            },
+        }
+
+
+def request_fixture() -> DecisionRequest:
+    candidate = Candidate("s0:c0", "transaction", ("transaction",), 0.2, "phonetic")
+    return DecisionRequest("트랜잭숑", (CandidateSpan("s0", 0, 4, "트랜잭숑", (candidate,)),))
+
+
+def build_provider(transport: str, base_url: str, max_connections: int):
+    import httpx
+    from openai import AsyncOpenAI, DefaultAsyncHttpxClient, OpenAI
+
+    if transport == "sync":
+        client = OpenAI(base_url=base_url, api_key="bench", max_retries=0)
+        return AzureFoundryProvider(model="bench", client=client), client
+    # The provider builds the same pool itself when it creates the client via
+    # AIProjectClient; the stand-in server has no Entra ID, so inject it here.
+    limits = httpx.Limits(
+        max_connections=max_connections, max_keepalive_connections=max_connections
+    )
+    client = AsyncOpenAI(
+        base_url=base_url,
+        api_key="bench",
+        max_retries=0,
+        http_client=DefaultAsyncHttpxClient(limits=limits),
+    )
+    provider = AzureFoundryProvider(
+        model="bench", transport="async", max_connections=max_connections, async_client=client
+    )
+    return provider, client
+
+
+async def measure(transport: str, args, server: StandInServer, base_url: str) -> dict:
+    server.peak_in_flight = 0
+    provider, client = build_provider(transport, base_url, args.max_connections)
+    request = request_fixture()
+    peak_threads = threading.active_count()
+
+    async def probe() -> None:
+        nonlocal peak_threads
+        while True:
+            peak_threads = max(peak_threads, threading.active_count())
+            await asyncio.sleep(0.01)
+
+    probe_task = asyncio.create_task(probe())
+    started = time.perf_counter()
+    try:
+        results = await asyncio.gather(
+            *(provider.decide(request) for _ in range(args.decisions)), return_exceptions=True
+        )
+    finally:
+        elapsed = time.perf_counter() - started
+        probe_task.cancel()
+        if transport == "async":
+            await client.close()
+        else:
+            client.close()
+    errors = [result for result in results if isinstance(result, BaseException)]
+    return {
+        "transport": transport,
+        "decisions": args.decisions,
+        "errors": len(errors),
+        "seconds": round(elapsed, 3),
+        "peak_in_flight": server.peak_in_flight,
+        "peak_threads": peak_threads,
+    }
+
+
+def raise_open_file_limit(wanted: int) -> None:
+    # Client and server ends of every pooled connection share this process.
+    try:
+        import resource
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft != resource.RLIM_INFINITY and soft < wanted:
+        target = wanted if hard == resource.RLIM_INFINITY else min(wanted, hard)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--decisions", type=int, default=600)
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument("--max-connections", type=int, default=600)
+    args = parser.parse_args()
+    raise_open_file_limit(4 * args.max_connections)
+
+    server = StandInServer(args.latency_ms)
+    listener = await asyncio.start_server(server.handle, "127.0.0.1", 0, backlog=4096)
+    port = listener.sockets[0].getsockname()[1]
+    base_url = f"http://127.0.0.1:{port}/v1"
+    try:
+        report = [await measure(transport, args, server, base_url) for transport in ("sync", "async")]
+    finally:
+        listener.close()
+        await listener.wait_closed()
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))
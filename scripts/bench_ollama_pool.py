@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""Measure per-request overhead of per-call vs. reused Ollama clients.
+
+A local stand-in server answers ``POST /api/chat`` with a ``keep`` decision
+for every span and counts accepted TCP connections. Each mode sends the
+same number of decisions sequentially and then in concurrent waves, so the
+difference in mean latency is the client setup and connection cost the
+loop-scoped pool saves. Requires the ``ollama`` extra.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from pronunciation_mapper.v2 import (  # noqa: E402
+    Candidate,
+    CandidateSpan,
+    DecisionRequest,
+    OllamaProvider,
+)
+
+
+class StandInServer:
+    def __init__(self, latency_ms: float) -> None:
+        self.latency = latency_ms / 1000
+        self.connections = 0
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while await reader.readline():
+                length = 0
+                while (line := await reader.readline()) not in (b"\r\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    if name.strip().lower() == "content-length":
+                        length = int(value)
+                body = json.loads(await reader.readexactly(length)) if length else {}
+                await asyncio.sleep(self.latency)
+                encoded = json.dumps(self.response(body)).encode()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\ncontent-type: application/json\r\n"
+                    + f"content-length: {len(encoded)}\r\n\r\n".encode()
+                    + encoded
+                )
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            return
+        finally:
+            writer.close()
+
+    @staticmethod
+    def response(body: dict) -> dict:
+        payload = json.loads(body["messages"][-1]["content"])
+        decisions = [
+            {
+                "span_id": span["span_id"],
+                "action": "keep",
+                "candidate_id": None,
+                "confidence": 0.9,
+                "reason_code": "ambiguous",
+            }
+            for span in payload.get("spans", ())
+        ]
+        return {
+            "model": body.get("model", "bench"),
+            "created_at": "2026-01-01T00:00:00Z",
+            "message": {"role": "assistant", "content": json.dumps({"decisions": decisions})},
+            "done": True,
+            "done_reason": "stop",
+            "prompt_eval_count": 1,
+            "eval_count": 1,
+        }
+
+
+def request_fixture() -> DecisionRequest:
+    candidate = Candidate("s0:c0", "transaction", ("transaction",), 0.2, "phonetic")
+    return DecisionRequest("트랜잭숑", (CandidateSpan("s0", 0, 4, "트랜잭숑", (candidate,)),))
+
+
+async def measure(reuse: bool, args, server: StandInServer, host: str) -> dict:
+    provider = OllamaProvider(host=host, model="bench", reuse_client=reuse)
+    request = request_fixture()
+    server.connections = 0
+    latencies = []
+    try:
+        for _ in range(args.requests):
+            started = time.perf_counter()
+            await provider.decide(request)
+            latencies.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        for _ in range(args.waves):
+            await asyncio.gather(*(provider.decide(request) for _ in range(args.concurrency)))
+        wave_seconds = time.perf_counter() - started
+    finally:
+        await provider.aclose()
+    return {
+        "reuse_client": reuse,
+        "sequential_mean_ms": round(statistics.fmean(latencies) * 1000, 3),
+        "sequential_p95_ms": round(statistics.quantiles(latencies, n=20)[-1] * 1000, 3),
+        "concurrent_seconds": round(wave_seconds, 3),
+        "server_connections": server.connections,
+    }
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--waves", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--latency-ms", type=float, default=1.0)
+    args = parser.parse_args()
+
+    server = StandInServer(args.latency_ms)
+    listener = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+    host = f"http://127.0.0.1:{listener.sockets[0].getsockname()[1]}"
+    try:
+        report = [await measure(reuse, args, server, host) for reuse in (False, True)]
+    finally:
+        listener.close()
+        await listener.wait_closed()
+    saved = report[0]["sequential_mean_ms"] - report[1]["sequential_mean_ms"]
+    print(json.dumps({"modes": report, "saved_per_request_ms": round(saved, 3)}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))
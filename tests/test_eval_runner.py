@@ -1,10 +1,20 @@
 from argparse import Namespace
+import asyncio
 import hashlib
 import json
 
 import pytest
 
-from evals.run_v2 import build_report_metadata, release_gate_failures, validate_gate_args
+from evals.run_v2 import (
+    OfflineProvider,
+    build_report_metadata,
+    calibrate_local_gate,
+    compare_payload_formats,
+    release_gate_failures,
+    validate_gate_args,
+)
+from pronunciation_mapper.v2 import LocalConfidenceGate
+from pronunciation_mapper.v2.providers.base import PROMPT_TOKEN_OVERHEAD
 
 
 def _metrics(*, accuracy=1.0, fallback_rate=0.0, provider_results=1):
@@ -98,3 +108,37 @@ def test_report_metadata_records_reproducible_inputs_without_endpoint(tmp_path,
     ).hexdigest()
     assert metadata["release_gate"]["max_fallback_rate"] == 0.0
     assert "do-not-record" not in json.dumps(metadata)
+
+
+def test_local_gate_calibration_reports_saved_calls_and_accuracy_cost():
+    vocabulary = {"terms": ["transaction"], "mappings": {}}
+    cases = [{"input": "트랜잭숑 조회", "expected": "transaction 조회"}]
+
+    report = asyncio.run(
+        calibrate_local_gate(vocabulary, cases, OfflineProvider(), LocalConfidenceGate())
+    )
+
+    assert report["provider_calls_saved"] == 1
+    assert report["provider_calls_with_gate"] == 0
+    assert report["gated_spans"] == 1
+    assert report["accuracy_cost"] == 0.0
+    assert report["gate"]["max_distance"] == 0.2
+
+
+def test_payload_format_comparison_reports_token_estimates():
+    vocabulary = {"terms": ["server", "service"], "mappings": {}}
+    cases = [{"input": "써버 써비스 써버", "expected": "server service server"}]
+
+    report = asyncio.run(compare_payload_formats(vocabulary, cases))
+
+    assert report["request_count"] == 1
+    standard = report["standard"]
+    compact = report["compact"]
+    assert compact["payload_tokens"] < standard["payload_tokens"]
+    assert compact["instruction_tokens"] > standard["instruction_tokens"]
+    # 늘어난 지침까지 포함한 호출당 총 입력에서도 compact가 작아야 합니다.
+    assert compact["input_tokens"] < standard["input_tokens"]
+    assert compact["input_tokens"] == (
+        compact["instruction_tokens"] + compact["payload_tokens"] + PROMPT_TOKEN_OVERHEAD
+    )
+    assert 0 < report["input_token_reduction"] < report["payload_token_reduction"] < 1
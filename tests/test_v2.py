@@ -1,13 +1,26 @@
+import asyncio
 import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import replace
 from unittest.mock import patch
 
 from pronunciation_mapper.v2 import (
     AgenticPronunciationMapper,
+    BackgroundLoopRunner,
+    CandidatePruning,
+    DeadlineExceededError,
     DecisionAction,
+    InvalidProviderOutputError,
+    LocalConfidenceGate,
+    LRUCache,
     ProviderResponse,
     ProviderSelection,
+    ProviderUnavailableError,
     ReasonCode,
+    StreamSession,
 )
+from pronunciation_mapper.v2.models import DECISION_SCHEMA, parse_provider_payload
+from pronunciation_mapper.v2.segmentation import segment_text
 
 
 class ScriptedProvider:
@@ -286,6 +299,659 @@ class TestAgenticPronunciationMapper(unittest.IsolatedAsyncioTestCase):
             pass
         self.assertEqual(injected.close_calls, 0)
 
+    async def test_rewrite_many_packs_unresolved_spans_into_one_request(self):
+        provider = ScriptedProvider()
+        mapper = AgenticPronunciationMapper(
+            ["transaction", "customer"],
+            custom_mappings={"커스터머": "customer"},
+            provider=provider,
+        )
+
+        results = await mapper.rewrite_many(["트랜잭숑 로그", "커스터머 조회", "로그 트랜잭숑"])
+
+        self.assertEqual(
+            [result.rewritten_text for result in results],
+            ["transaction 로그", "customer 조회", "로그 transaction"],
+        )
+        self.assertEqual(len(provider.calls), 1)
+        request = provider.calls[0]
+        self.assertEqual([span.id for span in request.spans], ["t0.s0", "t2.s1"])
+        self.assertEqual(request.spans[1].candidates[0].id, "t2.s1:c0")
+        self.assertEqual(request.text[request.spans[1].start:request.spans[1].end], "트랜잭숑")
+        self.assertEqual(results[1].provider, "local-deterministic")
+        self.assertEqual(results[2].decisions[0].span_id, "s1")
+        self.assertEqual(results[2].decisions[0].candidate_id, "s1:c0")
+        self.assertIn("provider-batch:0", results[2].diagnostics)
+
+    async def test_rewrite_many_splits_batches_by_budget_and_falls_back_per_batch(self):
+        provider = ScriptedProvider()
+        mapper = AgenticPronunciationMapper(["transaction"], provider=provider)
+
+        results = await mapper.rewrite_many(["트랜잭숑", "트랜잭숑 로그"], max_batch_spans=1)
+
+        self.assertEqual(len(provider.calls), 2)
+        self.assertIn("provider-batch:1", results[1].diagnostics)
+
+        failing = AgenticPronunciationMapper(
+            ["transaction"],
+            provider=ScriptedProvider(error=ConnectionError("offline")),
+            fallback_strategy="original",
+        )
+        results = await failing.rewrite_many(["트랜잭숑", "트랜잭숑"])
+        self.assertTrue(all(result.fallback_used for result in results))
+        self.assertEqual([result.rewritten_text for result in results], ["트랜잭숑", "트랜잭숑"])
+        with self.assertRaises(TypeError):
+            await failing.rewrite_many("트랜잭숑")
+        with self.assertRaises(ValueError):
+            await failing.rewrite_many(["트랜잭숑"], max_batch_chars=0)
+
+    async def test_concurrent_identical_rewrites_share_one_provider_call(self):
+        release = asyncio.Event()
+
+        class GatedProvider(ScriptedProvider):
+            async def decide(self, request):
+                self.calls.append(request)
+                await release.wait()
+                self.calls.pop()
+                return await super().decide(request)
+
+        provider = GatedProvider()
+        mapper = AgenticPronunciationMapper(["transaction"], provider=provider)
+
+        first = asyncio.create_task(mapper.rewrite("트랜잭숑 로그"))
+        cancelled = asyncio.create_task(mapper.rewrite("트랜잭숑 로그"))
+        second = asyncio.create_task(mapper.rewrite("트랜잭숑 로그"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        results = await asyncio.gather(first, second)
+        self.assertEqual(len(provider.calls), 1)
+        self.assertEqual({result.rewritten_text for result in results}, {"transaction 로그"})
+        with self.assertRaises(asyncio.CancelledError):
+            await cancelled
+        self.assertEqual(mapper._inflight, {})
+
+        uncoalesced = GatedProvider()
+        mapper = AgenticPronunciationMapper(
+            ["transaction"], provider=uncoalesced, coalesce_requests=False
+        )
+        await asyncio.gather(mapper.rewrite("트랜잭숑"), mapper.rewrite("트랜잭숑"))
+        self.assertEqual(len(uncoalesced.calls), 2)
+
+    async def test_deadline_returns_heuristic_and_late_result_fills_decision_cache(self):
+        release = asyncio.Event()
+
+        class SlowProvider(ScriptedProvider):
+            async def decide(self, request):
+                await release.wait()
+                return await super().decide(request)
+
+        provider = SlowProvider(action="keep")
+        cache = LRUCache()
+        mapper = AgenticPronunciationMapper(
+            ["transaction"], provider=provider, decision_cache=cache, deadline_ms=400
+        )
+
+        result = await mapper.rewrite("트랜잭숑 로그", deadline_ms=20)
+
+        self.assertTrue(result.fallback_used)
+        self.assertEqual(result.rewritten_text, "transaction 로그")
+        self.assertIn("deadline-fallback", result.diagnostics)
+        self.assertEqual(len(cache), 0)
+
+        release.set()
+        for _ in range(5):
+            await asyncio.sleep(0)
+        self.assertEqual(len(cache), 1)
+        cached = await mapper.rewrite("트랜잭숑 로그")
+        self.assertEqual(cached.rewritten_text, "트랜잭숑 로그")
+        self.assertFalse(cached.fallback_used)
+
+    async def test_deadline_cancels_shared_call_once_last_waiter_leaves(self):
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        class HangingProvider(ScriptedProvider):
+            async def decide(self, request):
+                self.calls.append(request)
+                started.set()
+                try:
+                    await asyncio.Event().wait()
+                except asyncio.CancelledError:
+                    cancelled.set()
+                    raise
+
+        provider = HangingProvider()
+        mapper = AgenticPronunciationMapper(["transaction"], provider=provider)
+        waiting = asyncio.create_task(mapper.rewrite("트랜잭숑"))
+        await started.wait()
+        result = await mapper.rewrite("트랜잭숑", deadline_ms=10)
+
+        # 아직 기다리는 호출자가 있으므로 공유 호출은 계속됩니다.
+        self.assertIn("deadline-fallback", result.diagnostics)
+        self.assertFalse(cancelled.is_set())
+        self.assertEqual(len(mapper._inflight), 1)
+
+        waiting.cancel()
+        await asyncio.wait_for(cancelled.wait(), 1)
+        await asyncio.sleep(0)
+        self.assertEqual(mapper._inflight, {})
+        self.assertEqual(len(provider.calls), 1)
+
+        cancelled.clear()
+        result = await mapper.rewrite("트랜잭숑", deadline_ms=10)
+        self.assertIn("deadline-fallback", result.diagnostics)
+        await asyncio.wait_for(cancelled.wait(), 1)
+        self.assertEqual(mapper._inflight, {})
+
+    async def test_cancelling_deadline_rewrite_cancels_provider_call(self):
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        class SlowProvider(ScriptedProvider):
+            async def decide(self, request):
+                started.set()
+                try:
+                    await asyncio.sleep(0.5)
+                except asyncio.CancelledError:
+                    cancelled.set()
+                    raise
+                return await super().decide(request)
+
+        provider = SlowProvider()
+        mapper = AgenticPronunciationMapper(["transaction"], provider=provider)
+        rewrite = asyncio.create_task(mapper.rewrite("트랜잭숑", deadline_ms=10_000))
+        await started.wait()
+        rewrite.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await rewrite
+
+        await asyncio.wait_for(cancelled.wait(), 1)
+        self.assertEqual(provider.calls, [])
+        self.assertEqual(mapper._inflight, {})
+
+    async def test_deadline_respects_raise_strategy_and_validates_budget(self):
+        class HangingProvider(ScriptedProvider):
+            async def decide(self, request):
+                await asyncio.Event().wait()
+
+        mapper = AgenticPronunciationMapper(
+            ["transaction"], provider=HangingProvider(), fallback_strategy="raise"
+        )
+        with self.assertRaises(DeadlineExceededError):
+            await mapper.rewrite("트랜잭숑", deadline_ms=5)
+        with self.assertRaises(ValueError):
+            await mapper.rewrite("트랜잭숑", deadline_ms=0)
+        with self.assertRaises(ValueError):
+            AgenticPronunciationMapper(["transaction"], provider=ScriptedProvider(), deadline_ms=float("inf"))
+
+    async def test_provider_context_trimming_keeps_windows_around_spans(self):
+        text = "하나 둘 셋 넷 트랜잭숑 다섯 여섯 일곱 트랜잭숑 여덟 아홉 열 열하나 열둘 트랜잭숑 끝"
+        provider = ScriptedProvider()
+        mapper = AgenticPronunciationMapper(
+            ["transaction"], provider=provider, provider_context_tokens=1
+        )
+
+        result = await mapper.rewrite(text)
+
+        request = provider.calls[0]
+        self.assertEqual(request.text, "넷 트랜잭숑 다섯 … 일곱 트랜잭숑 여덟 … 열둘 트랜잭숑 끝")
+        self.assertEqual([span.id for span in request.spans], ["s4", "s8", "s14"])
+        for span in request.spans:
+            self.assertEqual(request.text[span.start:span.end], span.source)
+        self.assertEqual(result.rewritten_text.count("transaction"), 3)
+
+        merged = ScriptedProvider()
+        mapper = AgenticPronunciationMapper(
+            ["transaction"], provider=merged, provider_context_tokens=2
+        )
+        await mapper.rewrite_many([text, "트랜잭숑"])
+        batch = merged.calls[0]
+        self.assertEqual(
+            batch.text,
+            "셋 넷 트랜잭숑 다섯 여섯 일곱 트랜잭숑 여덟 아홉 … 열하나 열둘 트랜잭숑 끝\n트랜잭숑",
+        )
+        for span in batch.spans:
+            self.assertEqual(batch.text[span.start:span.end], span.source)
+        with self.assertRaises(ValueError):
+            AgenticPronunciationMapper(["transaction"], provider=merged, provider_context_tokens=-1)
+
+    async def test_long_input_is_segmented_rewritten_concurrently_and_stitched(self):
+        class ConcurrencyProvider(ScriptedProvider):
+            active = 0
+            peak = 0
+
+            async def decide(self, request):
+                type(self).active += 1
+                type(self).peak = max(type(self).peak, type(self).active)
+                await asyncio.sleep(0.01)
+                type(self).active -= 1
+                return await super().decide(request)
+
+        text = "트랜잭숑 로그 확인. 써버 상태, 트랜잭숑 다시 조회\n마지막 써버 점검 완료 후 보고"
+        provider = ConcurrencyProvider()
+        mapper = AgenticPronunciationMapper(
+            ["transaction", "server"],
+            provider=provider,
+            max_spans=4,
+            segment_long_inputs=True,
+            max_concurrent_segments=2,
+        )
+
+        result = await mapper.rewrite(text)
+
+        self.assertEqual(
+            result.rewritten_text,
+            "transaction 로그 확인. server 상태, transaction 다시 조회\n마지막 server 점검 완료 후 보고",
+        )
+        self.assertEqual(result.original_text, text)
+        self.assertEqual(result.normalized_text, text)
+        self.assertEqual(ConcurrencyProvider.peak, 2)
+        self.assertEqual(result.provider, "scripted")
+        self.assertIn("segment:0:0-11", result.diagnostics)
+        whole = await AgenticPronunciationMapper(
+            ["transaction", "server"], provider=ScriptedProvider()
+        ).rewrite(text)
+        self.assertEqual(
+            [(decision.span_id, decision.candidate_id) for decision in result.decisions],
+            [(decision.span_id, decision.candidate_id) for decision in whole.decisions],
+        )
+
+        with self.assertRaises(ValueError):
+            await AgenticPronunciationMapper(
+                ["transaction"], provider=ScriptedProvider(), max_spans=4
+            ).rewrite(text)
+        with self.assertRaises(ValueError):
+            AgenticPronunciationMapper(
+                ["transaction"], provider=provider, max_concurrent_segments=0
+            )
+
+    async def test_segmented_rewrite_shares_one_deadline_across_queued_segments(self):
+        class SlowProvider(ScriptedProvider):
+            started = 0
+
+            async def decide(self, request):
+                self.started += 1
+                await asyncio.sleep(0.08)
+                return await super().decide(request)
+
+        words = ("하나", "둘", "셋", "넷", "다섯", "여섯", "일곱", "여덟")
+        text = " ".join(f"트랜잭숑 {word}." for word in words)
+        provider = SlowProvider()
+        mapper = AgenticPronunciationMapper(
+            ["transaction"],
+            provider=provider,
+            max_spans=2,
+            segment_long_inputs=True,
+            max_concurrent_segments=2,
+        )
+
+        started = asyncio.get_running_loop().time()
+        result = await mapper.rewrite(text, deadline_ms=100)
+        elapsed = asyncio.get_running_loop().time() - started
+
+        self.assertLess(elapsed, 0.2)
+        self.assertTrue(result.fallback_used)
+        self.assertEqual(result.diagnostics[0], "segmented:8")
+        self.assertEqual(
+            sum(item.endswith(":deadline-fallback") for item in result.diagnostics), 6
+        )
+        # 두 번째 쌍은 남은 예산만큼만 기다리고, 마감 뒤에 차례가 온 구간은
+        # provider를 부르지 않습니다.
+        self.assertEqual(len(provider.calls), 2)
+        self.assertLessEqual(provider.started, 4)
+
+    def test_segment_text_prefers_sentence_then_clause_then_word_boundaries(self):
+        text = "가 나. 다 라 마, 바 사\n아"
+
+        def words_at_most(limit):
+            return lambda segment: len(segment.split()) <= limit
+
+        self.assertEqual(
+            [text[start:end] for start, end in segment_text(text, words_at_most(3))],
+            ["가 나.", "다 라 마,", "바 사\n아"],
+        )
+        self.assertEqual(
+            [text[start:end] for start, end in segment_text(text, words_at_most(1))],
+            ["가", "나.", "다", "라", "마,", "바", "사", "아"],
+        )
+        self.assertEqual(segment_text("  ", words_at_most(1)), ())
+
+    async def test_stream_session_reuses_stable_prefix_and_debounces_tail(self):
+        provider = ScriptedProvider()
+        mapper = AgenticPronunciationMapper(["transaction", "server"], provider=provider)
+        now = [0.0]
+        session = StreamSession(mapper, debounce_ms=300, clock=lambda: now[0])
+
+        def sent():
+            return [[span.id for span in request.spans] for request in provider.calls]
+
+        result = await session.update("트랜잭")
+        self.assertEqual(sent(), [])
+        self.assertEqual(result.rewritten_text, "transaction")
+        self.assertIn("stream-pending:s0", result.diagnostics)
+
+        await session.update("트랜잭숑 ")
+        self.assertEqual(sent(), [["s0"]])
+        now[0] += 0.1
+        result = await session.update("트랜잭숑 써버")
+        self.assertEqual(sent(), [["s0"]])
+        self.assertIn("stream-pending:s1", result.diagnostics)
+        now[0] += 0.5
+        await session.update("트랜잭숑 써버")
+        self.assertEqual(sent(), [["s0"], ["s1"]])
+
+        result = await session.update("트랜잭숑 써버 로그", final=True)
+        self.assertEqual(result.rewritten_text, "transaction server 로그")
+        self.assertEqual(sent(), [["s0"], ["s1"]])
+        self.assertIn("트랜잭숑", session._candidates)
+
+        # 앞 token이 바뀌면 그 뒤의 판정은 다시 요청합니다.
+        await session.update("트랜잭션 써버 로그", final=True)
+        self.assertEqual(sent(), [["s0"], ["s1"], ["s1"]])
+        self.assertEqual(session.provider_calls, 3)
+        self.assertIsInstance(mapper.stream_session(debounce_ms=0), StreamSession)
+        with self.assertRaises(ValueError):
+            mapper.stream_session(debounce_ms=-1)
+
+    async def test_rewrite_stream_bounds_in_flight_work_and_orders_results(self):
+        class DelayedProvider(ScriptedProvider):
+            active = 0
+            peak = 0
+
+            async def decide(self, request):
+                type(self).active += 1
+                type(self).peak = max(type(self).peak, type(self).active)
+                # 첫 항목이 가장 늦게 끝나도록 지연을 거꾸로 둡니다.
+                await asyncio.sleep(0.02 if "트랜잭숑" in request.text else 0.001)
+                type(self).active -= 1
+                return await super().decide(request)
+
+        pulled = []
+
+        async def source():
+            for text in ["트랜잭숑", "써버 1", "써버 2", "써버 3", "써버 4"]:
+                pulled.append(text)
+                yield text
+
+        mapper = AgenticPronunciationMapper(
+            ["transaction", "server"], provider=DelayedProvider(), coalesce_requests=False
+        )
+        stream = mapper.rewrite_stream(source(), concurrency=2)
+        first = await anext(stream)
+        self.assertEqual(first.original_text, "트랜잭숑")
+        self.assertLessEqual(len(pulled), 3)
+        rest = [result.original_text async for result in stream]
+        self.assertEqual(rest, ["써버 1", "써버 2", "써버 3", "써버 4"])
+        self.assertEqual(DelayedProvider.peak, 2)
+
+        unordered = [
+            result.original_text
+            async for result in mapper.rewrite_stream(source(), concurrency=2, ordered=False)
+        ]
+        self.assertEqual(sorted(unordered), sorted(["트랜잭숑", "써버 1", "써버 2", "써버 3", "써버 4"]))
+        self.assertNotEqual(unordered[0], "트랜잭숑")
+
+        with self.assertRaises(ValueError):
+            await anext(mapper.rewrite_stream(source(), concurrency=0))
+        with self.assertRaises(TypeError):
+            await anext(mapper.rewrite_stream(["트랜잭숑"]))
+
+    async def test_rewrite_nbest_uses_one_request_and_ranks_chosen_hypothesis(self):
+        class ChoosingProvider(ScriptedProvider):
+            async def decide(self, request):
+                response = await super().decide(request)
+                hypothesis = request.spans[0]
+                choice = replace(
+                    response.selections[0], candidate_id=hypothesis.candidates[-1].id
+                )
+                return replace(response, selections=(choice, *response.selections[1:]))
+
+        provider = ChoosingProvider()
+        mapper = AgenticPronunciationMapper(["transaction", "log"], provider=provider)
+        generator = mapper.candidate_generator
+        original = generator._candidates_for
+        looked_up = []
+
+        def counting(source):
+            looked_up.append(source)
+            return original(source)
+
+        with patch.object(generator, "_candidates_for", side_effect=counting):
+            results = await mapper.rewrite_nbest(["트랜잭숑 로그", "트랜잭숑 로그", "트랜잭숀 로그"])
+
+        self.assertEqual(len(provider.calls), 1)
+        self.assertEqual(len(looked_up), len(set(looked_up)))
+        request = provider.calls[0]
+        self.assertTrue(request.has_hypotheses)
+        self.assertEqual(request.spans[0].id, "hyp")
+        self.assertEqual({candidate.distance for candidate in request.spans[0].candidates}, {0.0})
+        # 같은 위치의 같은 span은 처음 나온 가설 것 하나만 보냅니다.
+        self.assertEqual([span.id for span in request.spans[1:]], ["h0.s0", "h0.s1", "h2.s0"])
+        for span in request.spans[1:]:
+            self.assertEqual(request.text[span.start:span.end], span.source)
+        self.assertEqual(results[1].rewritten_text, results[2].rewritten_text)
+        self.assertEqual(results[2].decisions, results[1].decisions)
+        self.assertIn("nbest-selected", results[0].diagnostics)
+        self.assertIn("nbest:2", results[0].diagnostics)
+        self.assertEqual(
+            [result.original_text for result in results],
+            ["트랜잭숀 로그", "트랜잭숑 로그", "트랜잭숑 로그"],
+        )
+        self.assertEqual(results[0].decisions[0].span_id, "s0")
+        self.assertEqual(results[0].decisions[0].candidate_id, "s0:c0")
+
+        failing = AgenticPronunciationMapper(
+            ["transaction"], provider=ScriptedProvider(error=ProviderUnavailableError("down"))
+        )
+        fallback = await failing.rewrite_nbest(["트랜잭숑", "트랜잭숀"])
+        self.assertEqual([result.original_text for result in fallback], ["트랜잭숑", "트랜잭숀"])
+        self.assertTrue(all(result.fallback_used for result in fallback))
+        with self.assertRaises(ValueError):
+            await failing.rewrite_nbest([])
+        with self.assertRaises(TypeError):
+            await failing.rewrite_nbest("트랜잭숑")
+
+        class HangingProvider(ScriptedProvider):
+            async def decide(self, request):
+                await asyncio.Event().wait()
+
+        slow = AgenticPronunciationMapper(
+            ["transaction"], provider=HangingProvider(), executor="thread"
+        )
+        try:
+            timed_out = await slow.rewrite_nbest(["트랜잭숑", "트랜잭숀"], deadline_ms=10)
+        finally:
+            await slow.aclose()
+        self.assertEqual([result.original_text for result in timed_out], ["트랜잭숑", "트랜잭숀"])
+        self.assertTrue(all("deadline-fallback" in result.diagnostics for result in timed_out))
+        self.assertEqual(slow._inflight, {})
+        with self.assertRaises(ValueError):
+            await slow.rewrite_nbest(["트랜잭숑"], deadline_ms=-1)
+
+    async def test_executor_offloads_candidate_generation_with_same_results(self):
+        texts = ["트랜잭숑 로그", "커스터머 서버 트랜잭숀", "이십 개 트랜잭숑"]
+        options = {"custom_mappings": {"커스터머": "customer"}}
+        baseline = AgenticPronunciationMapper(
+            ["transaction", "customer", "server"], provider=ScriptedProvider(), **options
+        )
+        expected = [result.rewritten_text for result in await baseline.rewrite_many(texts)]
+
+        for kind in ("thread", "process"):
+            with self.subTest(kind=kind):
+                mapper = AgenticPronunciationMapper(
+                    ["transaction", "customer", "server"],
+                    provider=ScriptedProvider(),
+                    executor=kind,
+                    executor_workers=2,
+                    **options,
+                )
+                try:
+                    results = await mapper.rewrite_many(texts)
+                    single = await mapper.rewrite(texts[0])
+                    with self.assertRaises(ValueError):
+                        await mapper.rewrite("가" * (mapper.max_token_chars + 1))
+                finally:
+                    await mapper.aclose()
+                self.assertEqual([result.rewritten_text for result in results], expected)
+                self.assertEqual(single.rewritten_text, expected[0])
+                self.assertIsNone(mapper.executor)
+
+    async def test_process_executor_restarts_workers_after_vocabulary_change(self):
+        mapper = AgenticPronunciationMapper(
+            ["transaction"], provider=ScriptedProvider(), executor="process", executor_workers=1
+        )
+        try:
+            first = await mapper.rewrite("커스터머 트랜잭숑")
+            original = mapper.executor
+            mapper.heuristic_mapper.add_custom_mapping("커스터머", "customer")
+            changed = await mapper.rewrite("커스터머 트랜잭숑")
+            restarted = mapper.executor
+            again = await mapper.rewrite("커스터머 트랜잭숑")
+            self.assertIs(mapper.executor, restarted)
+        finally:
+            await mapper.aclose()
+
+        self.assertEqual(first.rewritten_text, "커스터머 transaction")
+        self.assertIsNot(restarted, original)
+        with self.assertRaises(RuntimeError):
+            original.submit(int)
+        self.assertEqual(changed.rewritten_text, "customer transaction")
+        self.assertIn("executor-restarted:vocabulary", changed.diagnostics)
+        self.assertNotIn("executor-restarted:vocabulary", again.diagnostics)
+
+    async def test_executor_option_validation_and_caller_owned_executor(self):
+        with self.assertRaises(ValueError):
+            AgenticPronunciationMapper(["transaction"], provider=ScriptedProvider(), executor="gpu")
+        with self.assertRaises(ValueError):
+            AgenticPronunciationMapper(
+                ["transaction"], provider=ScriptedProvider(), executor="thread", executor_workers=0
+            )
+        with ProcessPoolExecutor(max_workers=1) as pool, self.assertRaises(TypeError):
+            AgenticPronunciationMapper(["transaction"], provider=ScriptedProvider(), executor=pool)
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            mapper = AgenticPronunciationMapper(
+                ["transaction"], provider=ScriptedProvider(), executor=pool
+            )
+            result = await mapper.rewrite("트랜잭숑")
+            await mapper.aclose()
+            self.assertIs(mapper.executor, pool)
+            self.assertEqual(result.rewritten_text, "transaction")
+            self.assertEqual(pool.submit(lambda: 1).result(), 1)
+
+    async def test_local_gate_resolves_confident_spans_without_provider(self):
+        provider = ScriptedProvider(action="keep")
+        mapper = AgenticPronunciationMapper(
+            ["transaction"], provider=provider, local_gate=LocalConfidenceGate()
+        )
+
+        result = await mapper.rewrite("트랜잭숑 로그")
+
+        self.assertEqual(provider.calls, [])
+        self.assertEqual(result.rewritten_text, "transaction 로그")
+        self.assertFalse(result.fallback_used)
+        self.assertEqual(result.decisions[0].reason_code, ReasonCode.LOCAL_CONFIDENCE.value)
+
+        strict = AgenticPronunciationMapper(
+            ["transaction"], provider=provider, local_gate=LocalConfidenceGate(max_distance=0.1)
+        )
+        await strict.rewrite("트랜잭숑 로그")
+        self.assertEqual(len(provider.calls), 1)
+        with self.assertRaises(ValueError):
+            LocalConfidenceGate(min_margin=1.5)
+        with self.assertRaises(TypeError):
+            AgenticPronunciationMapper(["transaction"], provider=provider, local_gate=0.2)
+
+    async def test_candidate_pruning_shrinks_provider_payload(self):
+        terms = ["transaction", "transact", "transfer", "transition", "transport", "trace", "traction"]
+        text = "트랜잭숑 트랜스퍼 트레이스"
+        unpruned = ScriptedProvider(action="keep")
+        mapper = AgenticPronunciationMapper(terms, provider=unpruned, candidate_threshold=0.9)
+        await mapper.rewrite(text)
+        full = unpruned.calls[0].to_provider_payload()["spans"]
+
+        provider = ScriptedProvider()
+        mapper = AgenticPronunciationMapper(
+            terms,
+            provider=provider,
+            candidate_threshold=0.9,
+            candidate_pruning=CandidatePruning(max_request_candidates=6),
+        )
+        result = await mapper.rewrite(text)
+
+        pruned = provider.calls[0].to_provider_payload()["spans"]
+        self.assertEqual([len(span["candidates"]) for span in pruned], [1, 2, 2])
+        for before, after in zip(full, pruned):
+            self.assertEqual(after["candidates"], before["candidates"][: len(after["candidates"])])
+        self.assertEqual(result.rewritten_text, "transaction transaction transaction")
+        with self.assertRaises(ValueError):
+            CandidatePruning(max_distance_ratio=0.5)
+        with self.assertRaises(ValueError):
+            CandidatePruning(max_request_candidates=0)
+        with self.assertRaises(TypeError):
+            AgenticPronunciationMapper(terms, provider=provider, candidate_pruning=6)
+
+    async def test_local_confidence_reason_is_not_offered_to_providers(self):
+        reason_schema = DECISION_SCHEMA["properties"]["decisions"]["items"]["properties"]["reason_code"]
+        self.assertNotIn(ReasonCode.LOCAL_CONFIDENCE.value, reason_schema["enum"])
+        payload = {
+            "decisions": [
+                {
+                    "span_id": "s0",
+                    "action": "keep",
+                    "candidate_id": None,
+                    "confidence": 0.9,
+                    "reason_code": ReasonCode.LOCAL_CONFIDENCE.value,
+                }
+            ]
+        }
+        with self.assertRaises(InvalidProviderOutputError):
+            parse_provider_payload(payload, provider="scripted", model="fixture")
+
+        class LocalReasonProvider(ScriptedProvider):
+            async def decide(self, request):
+                response = await super().decide(request)
+                selections = tuple(
+                    replace(selection, reason_code=ReasonCode.LOCAL_CONFIDENCE)
+                    for selection in response.selections
+                )
+                return replace(response, selections=selections)
+
+        mapper = AgenticPronunciationMapper(
+            ["transaction"], provider=LocalReasonProvider(), fallback_strategy="raise"
+        )
+        with self.assertRaisesRegex(InvalidProviderOutputError, "reserved for local"):
+            await mapper.rewrite("트랜잭숑")
+
+    async def test_awarm_up_reports_local_and_provider_steps(self):
+        class WarmProvider(ScriptedProvider):
+            warmed = 0
+
+            async def warm_up(self):
+                self.warmed += 1
+                return {"client": 1.5, "model_load": 20.0}
+
+        provider = WarmProvider()
+        mapper = AgenticPronunciationMapper(
+            ["transaction"], provider=provider, executor="thread"
+        )
+        try:
+            timings = await mapper.awarm_up()
+        finally:
+            await mapper.aclose()
+
+        self.assertEqual(list(timings), ["local", "provider.client", "provider.model_load"])
+        self.assertEqual(timings["provider.model_load"], 20.0)
+        self.assertEqual(provider.warmed, 1)
+        self.assertEqual(provider.calls, [])
+        plain = AgenticPronunciationMapper(["transaction"], provider=ScriptedProvider())
+        self.assertEqual(list(await plain.awarm_up()), ["local"])
+        with self.assertRaisesRegex(RuntimeError, "warm_up cannot run inside an event loop"):
+            plain.warm_up()
+
     def test_sync_projection(self):
         mapper = AgenticPronunciationMapper(
             ["customer"],
@@ -295,5 +961,70 @@ class TestAgenticPronunciationMapper(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(mapper.map_sentence("커스터머 조회"), "customer 조회")
 
 
+
+class LoopRecordingProvider(ScriptedProvider):
+    def __init__(self):
+        super().__init__()
+        self.loops = set()
+        self.aclose_loops = []
+
+    async def decide(self, request):
+        self.loops.add(asyncio.get_running_loop())
+        return await super().decide(request)
+
+    async def aclose(self):
+        self.aclose_loops.append(asyncio.get_running_loop())
+
+
+class TestBackgroundLoopRunner(unittest.TestCase):
+    def test_sync_callers_share_one_background_loop_and_close_cleanly(self):
+        provider = LoopRecordingProvider()
+        mapper = AgenticPronunciationMapper(
+            ["transaction"], provider=provider, sync_runner="background"
+        )
+        mapper._owns_provider = True
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(mapper.map_sentence, ["트랜잭숑"] * 16))
+
+        self.assertEqual(results, ["transaction"] * 16)
+        self.assertEqual(len(provider.loops), 1)
+        loop = next(iter(provider.loops))
+        runner = mapper.sync_runner
+        thread = runner._thread
+
+        mapper.close()
+        self.assertEqual(provider.aclose_loops, [loop])
+        self.assertFalse(runner.running)
+        self.assertFalse(thread.is_alive())
+        self.assertTrue(loop.is_closed())
+        mapper.close()
+        with self.assertRaises(RuntimeError):
+            mapper.rewrite_sync("트랜잭숑")
+
+    def test_shared_runner_outlives_mapper_and_rejects_loop_thread_calls(self):
+        with BackgroundLoopRunner() as runner:
+            first = AgenticPronunciationMapper(
+                ["transaction"], provider=ScriptedProvider(), sync_runner=runner
+            )
+            second = AgenticPronunciationMapper(
+                ["transaction"], provider=ScriptedProvider(), sync_runner=runner
+            )
+            self.assertEqual(first.map_sentence("트랜잭숑"), "transaction")
+            first.close()
+            self.assertTrue(runner.running)
+            self.assertEqual(second.map_sentence("트랜잭숑"), "transaction")
+
+            async def nested():
+                return runner.run(asyncio.sleep(0))
+
+            with self.assertRaises(RuntimeError):
+                runner.run(nested())
+            with self.assertRaises(TypeError):
+                runner.run(lambda: None)
+        self.assertFalse(runner.running)
+        with self.assertRaises(ValueError):
+            AgenticPronunciationMapper(["transaction"], sync_runner="thread")
+
 if __name__ == "__main__":
     unittest.main()
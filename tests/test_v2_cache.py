@@ -0,0 +1,213 @@
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from pronunciation_mapper.v2 import (
+    AgenticPronunciationMapper,
+    LRUCache,
+    SQLiteDecisionCache,
+)
+from tests.test_v2 import ScriptedProvider
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_counts_hits_misses_and_evictions(self):
+        cache = LRUCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.put("c", 3)
+
+        self.assertIsNone(cache.get("b"))
+        stats = cache.stats()
+        self.assertEqual((stats.hits, stats.misses, stats.evictions), (1, 1, 1))
+        self.assertEqual((stats.size, stats.maxsize), (2, 2))
+        with self.assertRaises(ValueError):
+            LRUCache(maxsize=0)
+
+
+class TestRewriteResultCache(unittest.IsolatedAsyncioTestCase):
+    async def test_repeated_utterance_is_served_from_cache(self):
+        provider = ScriptedProvider()
+        cache = LRUCache(maxsize=8)
+        mapper = AgenticPronunciationMapper(["transaction"], provider=provider, result_cache=cache)
+
+        first = await mapper.rewrite("트랜잭숑 로그")
+        second = await mapper.rewrite("트랜잭숑 로그")
+
+        self.assertEqual(len(provider.calls), 1)
+        self.assertEqual(second.rewritten_text, first.rewritten_text)
+        self.assertEqual(second.provider, "scripted")
+        self.assertEqual(second.usage, {})
+        self.assertIn("cache-hit", second.diagnostics)
+        self.assertNotIn("cache-hit", first.diagnostics)
+        self.assertEqual((cache.stats().hits, cache.stats().misses), (1, 1))
+
+    async def test_policy_and_vocabulary_changes_invalidate_entries(self):
+        provider = ScriptedProvider()
+        cache = LRUCache()
+        mapper = AgenticPronunciationMapper(["transaction"], provider=provider, result_cache=cache)
+
+        await mapper.rewrite("트랜잭숑")
+        mapper.minimum_confidence = 0.9
+        await mapper.rewrite("트랜잭숑")
+        mapper.heuristic_mapper.add_custom_mapping("트랜잭숀", "transaction")
+        await mapper.rewrite("트랜잭숑")
+
+        self.assertEqual(len(provider.calls), 3)
+
+    async def test_fallback_results_are_not_cached(self):
+        provider = ScriptedProvider(error=ConnectionError("offline"))
+        cache = LRUCache()
+        mapper = AgenticPronunciationMapper(["transaction"], provider=provider, result_cache=cache)
+
+        await mapper.rewrite("트랜잭숑")
+        await mapper.rewrite("트랜잭숑")
+
+        self.assertEqual(len(provider.calls), 2)
+        self.assertEqual(len(cache), 0)
+        with self.assertRaises(TypeError):
+            AgenticPronunciationMapper(["transaction"], provider=provider, result_cache={})
+
+
+class TestSpanDecisionCache(unittest.IsolatedAsyncioTestCase):
+    async def test_recurring_span_in_same_context_skips_provider(self):
+        provider = ScriptedProvider()
+        cache = LRUCache()
+        mapper = AgenticPronunciationMapper(
+            ["transaction", "customer"],
+            provider=provider,
+            decision_cache=cache,
+            decision_context_tokens=1,
+        )
+
+        await mapper.rewrite("어제 트랜잭숑 로그")
+        result = await mapper.rewrite("오늘 어제 트랜잭숑 로그")
+
+        self.assertEqual(len(provider.calls), 1)
+        self.assertEqual(result.rewritten_text, "오늘 어제 transaction 로그")
+        self.assertEqual(result.decisions[0].candidate_id, "s2:c0")
+        self.assertIn("decision-cache-hit:s2", result.diagnostics)
+        self.assertEqual(result.provider, "scripted")
+
+    async def test_partial_hit_shrinks_provider_request(self):
+        provider = ScriptedProvider()
+        mapper = AgenticPronunciationMapper(
+            ["transaction", "customer"],
+            provider=provider,
+            decision_cache=LRUCache(),
+            decision_context_tokens=0,
+        )
+
+        await mapper.rewrite("트랜잭숑")
+        result = await mapper.rewrite("트랜잭숑 커스토머")
+
+        self.assertEqual(len(provider.calls), 2)
+        self.assertEqual([span.source for span in provider.calls[1].spans], ["커스토머"])
+        self.assertEqual(result.rewritten_text, "transaction customer")
+
+    async def test_different_context_or_invalid_entry_is_a_miss(self):
+        provider = ScriptedProvider()
+        cache = LRUCache()
+        mapper = AgenticPronunciationMapper(["transaction"], provider=provider, decision_cache=cache)
+
+        await mapper.rewrite("어제 트랜잭숑")
+        await mapper.rewrite("오늘 트랜잭숑")
+        self.assertEqual(len(provider.calls), 2)
+
+        corrupted = {"action": "replace", "candidate_index": 99, "confidence": 0.9, "reason_code": "context"}
+        cache.put_many({key: corrupted for key in list(cache._entries)})
+        result = await mapper.rewrite("오늘 트랜잭숑")
+        self.assertEqual(len(provider.calls), 3)
+        self.assertEqual(result.rewritten_text, "오늘 transaction")
+        with self.assertRaises(ValueError):
+            AgenticPronunciationMapper(["transaction"], decision_context_tokens=-1, provider=provider)
+
+
+class TestSQLiteDecisionCache(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.path = Path(self._directory.name) / "decisions.sqlite3"
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    async def test_workers_share_a_warm_cache_across_restarts(self):
+        first_provider = ScriptedProvider()
+        with SQLiteDecisionCache(self.path) as cache:
+            mapper = AgenticPronunciationMapper(
+                ["transaction"], provider=first_provider, decision_cache=cache
+            )
+            await mapper.rewrite("트랜잭숑 로그")
+
+        second_provider = ScriptedProvider()
+        with SQLiteDecisionCache(self.path) as cache:
+            mapper = AgenticPronunciationMapper(
+                ["transaction"], provider=second_provider, decision_cache=cache
+            )
+            result = await mapper.rewrite("트랜잭숑 로그")
+            self.assertEqual(cache.stats().hits, 1)
+
+        self.assertEqual(len(first_provider.calls), 1)
+        self.assertEqual(second_provider.calls, [])
+        self.assertEqual(result.rewritten_text, "transaction 로그")
+
+    async def test_locked_database_degrades_to_miss_without_losing_the_answer(self):
+        provider = ScriptedProvider()
+        with SQLiteDecisionCache(self.path, busy_timeout=0.05) as cache:
+            mapper = AgenticPronunciationMapper(
+                ["transaction", "customer"], provider=provider, decision_cache=cache
+            )
+            await mapper.rewrite("트랜잭숑 로그")
+
+            writer = sqlite3.connect(self.path, isolation_level=None)
+            writer.execute("BEGIN IMMEDIATE")
+            try:
+                remembered = await mapper.rewrite("트랜잭숑 로그")
+                fresh = await mapper.rewrite("커스토머 로그")
+            finally:
+                writer.execute("ROLLBACK")
+                writer.close()
+
+            self.assertEqual(remembered.rewritten_text, "transaction 로그")
+            self.assertEqual(fresh.rewritten_text, "customer 로그")
+            self.assertFalse(fresh.fallback_used)
+            self.assertEqual(len(provider.calls), 2)
+            # 잠긴 동안 hit의 사용 시각 갱신과 새 판정 저장을 건너뛰었습니다.
+            self.assertEqual(cache.stats().errors, 2)
+
+            await mapper.rewrite("커스토머 로그")
+            self.assertEqual(len(provider.calls), 3)
+            self.assertEqual(cache.stats().errors, 2)
+
+    def test_ttl_and_size_eviction(self):
+        with SQLiteDecisionCache(self.path, ttl_seconds=10, max_entries=2, eviction_interval=1) as cache:
+            with patch("pronunciation_mapper.v2.cache.time.time", return_value=100.0):
+                cache.put_many({"a": {"value": 1}, "b": {"value": 2}})
+            with patch("pronunciation_mapper.v2.cache.time.time", return_value=105.0):
+                self.assertEqual(cache.get_many(["a", "b", "missing"]), {"a": {"value": 1}, "b": {"value": 2}})
+                cache.get_many(["b"])
+                cache.put_many({"c": {"value": 3}})
+                self.assertEqual(set(cache.get_many(["a", "b", "c"])), {"b", "c"})
+            with patch("pronunciation_mapper.v2.cache.time.time", return_value=111.0):
+                self.assertEqual(cache.get_many(["b"]), {})
+                cache.evict()
+
+            stats = cache.stats()
+            self.assertEqual(stats.size, 1)
+            self.assertEqual(stats.evictions, 2)
+            self.assertEqual(stats.misses, 3)
+
+        connection = sqlite3.connect(self.path)
+        self.assertEqual(connection.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        connection.close()
+        with self.assertRaises(ValueError):
+            SQLiteDecisionCache(self.path, ttl_seconds=0)
+        with self.assertRaises(RuntimeError):
+            cache.get_many(["a"])
+
+
+if __name__ == "__main__":
+    unittest.main()
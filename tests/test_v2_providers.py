@@ -2,21 +2,31 @@ import asyncio
 import json
 import time
 import unittest
+from dataclasses import replace
 from types import SimpleNamespace
-from unittest.mock import Mock
+from typing import ClassVar
+from unittest.mock import Mock, patch
 
 from pronunciation_mapper.v2 import (
     AzureFoundryProvider,
     Candidate,
     CandidateSpan,
+    DecisionAction,
     DecisionRequest,
+    HedgedProvider,
     InvalidProviderOutputError,
     OllamaProvider,
+    PooledProvider,
     ProviderConfigurationError,
+    ProviderResponse,
+    ProviderSelection,
     ProviderUnavailableError,
+    ReasonCode,
     UnsupportedProviderError,
     create_provider,
+    create_provider_pool,
 )
+from pronunciation_mapper.v2.models import parse_provider_payload
 
 
 DECISION = {
@@ -39,20 +49,21 @@ def request_fixture():
 
 
 class FakeFoundryResponses:
-    def __init__(self):
+    def __init__(self, output=DECISION):
         self.kwargs = None
+        self.output = output
 
     def create(self, **kwargs):
         self.kwargs = kwargs
         return SimpleNamespace(
-            output_text=json.dumps(DECISION),
+            output_text=json.dumps(self.output),
             usage={"input_tokens": 11, "output_tokens": 7, "total_tokens": 18},
         )
 
 
 class FakeFoundryClient:
-    def __init__(self):
-        self.responses = FakeFoundryResponses()
+    def __init__(self, output=DECISION):
+        self.responses = FakeFoundryResponses(output)
         self.close_calls = 0
 
     def close(self):
@@ -60,16 +71,21 @@ class FakeFoundryClient:
 
 
 class FakeOllamaClient:
-    def __init__(self):
+    def __init__(self, output=DECISION):
+        self.output = output
         self.kwargs = None
         self.chat_calls = 0
         self.close_calls = 0
 
+    async def generate(self, **kwargs):
+        self.generate_kwargs = kwargs
+        return {"done": True, "done_reason": "load"}
+
     async def chat(self, **kwargs):
         self.kwargs = kwargs
         self.chat_calls += 1
         return {
-            "message": {"content": json.dumps(DECISION)},
+            "message": {"content": json.dumps(self.output)},
             "prompt_eval_count": 9,
             "eval_count": 4,
         }
@@ -110,8 +126,13 @@ class FakeCredential:
 
     def __init__(self):
         self.close_calls = 0
+        self.token_scopes = []
         self.__class__.instances.append(self)
 
+    def get_token(self, *scopes):
+        self.token_scopes.append(scopes)
+        return SimpleNamespace(token="token", expires_on=0)
+
     def close(self):
         self.close_calls += 1
 
@@ -158,6 +179,52 @@ class SlowProjectClient(FakeProjectClient):
         super().__init__(endpoint=endpoint, credential=credential)
 
 
+class FakeAsyncFoundryResponses(FakeFoundryResponses):
+    def __init__(self, output=DECISION):
+        super().__init__(output)
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def create(self, **kwargs):
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            return super().create(**kwargs)
+        finally:
+            self.in_flight -= 1
+
+
+class FakeAsyncFoundryClient(FakeFoundryClient):
+    def __init__(self, output=DECISION):
+        super().__init__(output)
+        self.responses = FakeAsyncFoundryResponses(output)
+
+    async def close(self):
+        self.close_calls += 1
+
+
+class FakeAsyncCredential(FakeCredential):
+    instances: ClassVar[list["FakeAsyncCredential"]] = []
+
+    async def get_token(self, *scopes):
+        return super().get_token(*scopes)
+
+    async def close(self):
+        self.close_calls += 1
+
+
+class FakeAsyncProjectClient(FakeProjectClient):
+    instances: ClassVar[list["FakeAsyncProjectClient"]] = []
+
+    def __init__(self, *, endpoint, credential):
+        super().__init__(endpoint=endpoint, credential=credential)
+        self.openai_client = FakeAsyncFoundryClient()
+
+    async def close(self):
+        self.close_calls += 1
+
+
 class TestProviderAdapters(unittest.IsolatedAsyncioTestCase):
     async def test_foundry_uses_project_responses_structured_schema(self):
         client = FakeFoundryClient()
@@ -199,6 +266,69 @@ class TestProviderAdapters(unittest.IsolatedAsyncioTestCase):
         await limited_provider.decide(request_fixture())
         self.assertEqual(limited_client.kwargs["options"]["num_predict"], 321)
 
+    async def test_adaptive_budget_sizes_generation_and_context_to_the_request(self):
+        ollama_client = FakeOllamaClient()
+        await OllamaProvider(model="qwen", client=ollama_client, adaptive_budget=True).decide(
+            request_fixture()
+        )
+        options = ollama_client.kwargs["options"]
+        self.assertEqual(options["num_predict"], 16 + 48)
+        self.assertEqual(options["num_ctx"], 1024)
+
+        candidate = Candidate("s0:c0", "transaction", ("transaction",), 0.2, "phonetic")
+        spans = tuple(
+            CandidateSpan(f"s{index}", 0, 5, "트랜잭숑", (replace(candidate, id=f"s{index}:c0"),))
+            for index in range(60)
+        )
+        large = DecisionRequest("트랜잭숑 " * 600, spans)
+        ollama_client = FakeOllamaClient({"decisions": []})
+        await OllamaProvider(
+            model="qwen", client=ollama_client, adaptive_budget=True, max_output_tokens=512
+        ).decide(large)
+        options = ollama_client.kwargs["options"]
+        self.assertEqual(options["num_predict"], 512)
+        self.assertEqual(options["num_ctx"], 16384)
+
+        foundry_client = FakeFoundryClient()
+        await AzureFoundryProvider(
+            model="deployment",
+            client=foundry_client,
+            adaptive_budget=True,
+            decision_format="standard",
+        ).decide(request_fixture())
+        self.assertEqual(foundry_client.responses.kwargs["max_output_tokens"], 64)
+
+        fixed_client = FakeOllamaClient()
+        await OllamaProvider(model="qwen", client=fixed_client).decide(request_fixture())
+        self.assertNotIn("num_ctx", fixed_client.kwargs["options"])
+
+    async def test_adaptive_context_window_follows_each_request_and_warm_up(self):
+        client = FakeOllamaClient({"decisions": []})
+        provider = OllamaProvider(model="qwen", client=client, adaptive_budget=True)
+        await provider.warm_up()
+        self.assertEqual(client.generate_kwargs["options"], {"num_ctx": 1024})
+        client.output = DECISION
+        await provider.decide(request_fixture())
+        self.assertEqual(client.kwargs["options"]["num_ctx"], 1024)
+
+        candidate = Candidate("s0:c0", "transaction", ("transaction",), 0.2, "phonetic")
+        spans = tuple(
+            CandidateSpan(f"s{index}", 0, 5, "트랜잭숑", (replace(candidate, id=f"s{index}:c0"),))
+            for index in range(60)
+        )
+        client.output = {"decisions": []}
+        await provider.decide(DecisionRequest("트랜잭숑 " * 600, spans))
+        self.assertEqual(client.kwargs["options"]["num_ctx"], 16384)
+        await provider.warm_up()
+        self.assertEqual(client.generate_kwargs["options"], {"num_ctx": 16384})
+
+        # 큰 요청 뒤의 작은 요청은 다시 작은 context를 씁니다.
+        client.output = DECISION
+        await provider.decide(request_fixture())
+        self.assertEqual(client.kwargs["options"]["num_ctx"], 1024)
+        await provider.warm_up()
+        self.assertEqual(client.generate_kwargs["options"], {"num_ctx": 1024})
+
     async def test_foundry_validates_model_before_creating_client(self):
         provider = AzureFoundryProvider(endpoint="https://example", model="deployment")
         provider.model = ""
@@ -237,6 +367,113 @@ class TestProviderAdapters(unittest.IsolatedAsyncioTestCase):
         await provider.aclose()
         self.assertEqual(project.openai_client.close_calls, 1, "close must be idempotent")
 
+    async def test_foundry_async_transport_shares_one_pooled_client_without_threads(self):
+        FakeAsyncCredential.instances.clear()
+        FakeAsyncProjectClient.instances.clear()
+        provider = AzureFoundryProvider(
+            endpoint="https://example",
+            model="deployment",
+            timeout=12.5,
+            max_retries=3,
+            transport="async",
+            max_connections=600,
+        )
+        provider._load_async_sdk = lambda: (
+            FakeAsyncProjectClient,
+            FakeAsyncCredential,
+            lambda max_connections: ("pool", max_connections),
+        )
+        provider._ensure_client = Mock(side_effect=AssertionError("sync client must not be used"))
+
+        with patch(
+            "asyncio.to_thread", side_effect=AssertionError("must not use threads")
+        ):
+            responses = await asyncio.gather(
+                *(provider.decide(request_fixture()) for _ in range(512))
+            )
+
+        self.assertEqual(len(responses), 512)
+        self.assertEqual(len(FakeAsyncProjectClient.instances), 1)
+        project = FakeAsyncProjectClient.instances[-1]
+        self.assertEqual(
+            project.get_openai_client_kwargs,
+            {"timeout": 12.5, "max_retries": 3, "http_client": ("pool", 600)},
+        )
+        self.assertEqual(project.openai_client.responses.peak_in_flight, 512)
+
+        await provider.aclose()
+        self.assertEqual(project.openai_client.close_calls, 1)
+        self.assertEqual(project.close_calls, 1)
+        self.assertEqual(FakeAsyncCredential.instances[-1].close_calls, 1)
+        await provider.aclose()
+        self.assertEqual(project.openai_client.close_calls, 1, "close must be idempotent")
+
+    async def test_foundry_async_transport_validation_and_injected_client(self):
+        for kwargs in (
+            {"transport": "grpc"},
+            {"transport": "async", "max_connections": 0},
+            {"async_client": FakeAsyncFoundryClient()},
+            {"transport": "async", "client": FakeFoundryClient()},
+        ):
+            with self.subTest(kwargs=kwargs), self.assertRaises(ValueError):
+                AzureFoundryProvider(endpoint="https://example", model="deployment", **kwargs)
+
+        client = FakeAsyncFoundryClient()
+        provider = AzureFoundryProvider(
+            model="deployment", transport="async", async_client=client
+        )
+        response = await provider.decide(request_fixture())
+        await provider.aclose()
+
+        self.assertEqual(response.selections[0].candidate_id, "s0:c0")
+        self.assertFalse(client.responses.kwargs["store"])
+        self.assertEqual(client.close_calls, 0)
+
+    async def test_provider_warm_up_prepares_clients_credentials_and_model(self):
+        FakeCredential.instances.clear()
+        FakeProjectClient.instances.clear()
+        foundry = AzureFoundryProvider(endpoint="https://example", model="deployment")
+        foundry._load_sdk = lambda: (FakeProjectClient, FakeCredential)
+        timings = await foundry.warm_up()
+        self.assertEqual(list(timings), ["import_sdk", "client", "credential"])
+        self.assertEqual(FakeCredential.instances[-1].token_scopes, [("https://ai.azure.com/.default",)])
+        await foundry.decide(request_fixture())
+        self.assertEqual(len(FakeProjectClient.instances), 1)
+        await foundry.aclose()
+
+        FakeAsyncCredential.instances.clear()
+        async_foundry = AzureFoundryProvider(
+            endpoint="https://example", model="deployment", transport="async"
+        )
+        async_foundry._load_async_sdk = lambda: (
+            FakeAsyncProjectClient,
+            FakeAsyncCredential,
+            lambda max_connections: None,
+        )
+        timings = await async_foundry.warm_up()
+        self.assertEqual(list(timings), ["import_sdk", "client", "credential"])
+        self.assertEqual(len(FakeAsyncCredential.instances[-1].token_scopes), 1)
+        await async_foundry.aclose()
+
+        ollama_client = FakeOllamaClient()
+        ollama = OllamaProvider(model="qwen", keep_alive="30m", client=ollama_client)
+        backup_client = FakeOllamaClient()
+        backup = OllamaProvider(host="http://backup:11434", model="qwen", client=backup_client)
+        hedged = HedgedProvider(ollama, backup)
+        timings = await hedged.warm_up()
+        self.assertEqual(
+            list(timings),
+            ["primary.client", "primary.model_load", "hedge.client", "hedge.model_load"],
+        )
+        self.assertEqual(
+            ollama_client.generate_kwargs, {"model": "qwen", "prompt": "", "keep_alive": "30m"}
+        )
+        self.assertEqual(backup_client.generate_kwargs["keep_alive"], "5m")
+        await foundry.aclose()
+
+        with self.assertRaises(ProviderConfigurationError):
+            await AzureFoundryProvider(endpoint="https://example", model="").warm_up()
+
     async def test_foundry_lazy_initialization_is_thread_safe(self):
         FakeCredential.instances.clear()
         SlowProjectClient.instances.clear()
@@ -367,6 +604,139 @@ class TestProviderAdapters(unittest.IsolatedAsyncioTestCase):
                 model="deployment", client=foundry_client
             ).decide(request_fixture())
 
+    async def test_compact_payload_shares_candidate_table_for_both_providers(self):
+        candidates = (
+            Candidate("s0:c0", "server", ("server",), 0.123, "phonetic"),
+            Candidate("s0:c1", "service", ("service",), 0.456, "phonetic"),
+        )
+        spans = (
+            CandidateSpan("s0", 0, 2, "서버", candidates),
+            CandidateSpan(
+                "s1",
+                3,
+                6,
+                "써버",
+                (Candidate("s1:c0", "server", ("server",), 0.2, "phonetic"),),
+            ),
+        )
+        request = DecisionRequest("서버 써버", spans)
+
+        payload = request.to_provider_payload("compact")
+
+        self.assertEqual(payload["c"], ["server", "service"])
+        self.assertEqual(payload["s"][0], {"i": "s0", "w": "서버", "k": [[0, 0.12], [1, 0.46]]})
+        self.assertEqual(payload["s"][1]["k"], [[0, 0.2]])
+        self.assertEqual(request.to_provider_payload(), request.to_provider_payload("standard"))
+        with self.assertRaises(ValueError):
+            request.to_provider_payload("tiny")
+        renamed = CandidateSpan("s0", 0, 2, "서버", (replace(candidates[0], id="other"),))
+        with self.assertRaises(ValueError):
+            DecisionRequest("서버", (renamed,)).to_provider_payload("compact")
+
+        foundry_client = FakeFoundryClient()
+        await AzureFoundryProvider(
+            model="deployment", client=foundry_client, payload_format="compact"
+        ).decide(request_fixture())
+        kwargs = foundry_client.responses.kwargs
+        self.assertEqual(json.loads(kwargs["input"])["c"], ["transaction"])
+        self.assertIn("Compact input", kwargs["instructions"])
+
+        ollama_client = FakeOllamaClient()
+        await OllamaProvider(
+            model="qwen", client=ollama_client, payload_format="compact"
+        ).decide(request_fixture())
+        system, user = ollama_client.kwargs["messages"]
+        self.assertIn("Compact input", system["content"])
+        self.assertIn('"k":[[0,0.2]]', user["content"])
+        self.assertNotIn("N-best requests", system["content"])
+        with self.assertRaises(ValueError):
+            OllamaProvider(payload_format="tiny")
+
+    async def test_nbest_requests_add_hypothesis_instructions(self):
+        hypothesis = CandidateSpan(
+            "hyp",
+            0,
+            0,
+            "n-best",
+            tuple(
+                Candidate(f"hyp:c{index}", f"#{index}", (), 0.0, "hypothesis")
+                for index in range(2)
+            ),
+        )
+        request = DecisionRequest("#0 트랜잭숑\n#1 트랜잭숀", (hypothesis,))
+        output = {"decisions": [{**DECISION["decisions"][0], "span_id": "hyp", "candidate_id": "hyp:c1"}]}
+        self.assertTrue(request.has_hypotheses)
+        self.assertFalse(request_fixture().has_hypotheses)
+
+        foundry_client = FakeFoundryClient(output)
+        await AzureFoundryProvider(model="deployment", client=foundry_client).decide(request)
+        self.assertIn("N-best requests", foundry_client.responses.kwargs["instructions"])
+
+        ollama_client = FakeOllamaClient(output)
+        response = await OllamaProvider(model="qwen", client=ollama_client).decide(request)
+        self.assertIn("N-best requests", ollama_client.kwargs["messages"][0]["content"])
+        self.assertEqual(response.selections[0].candidate_id, "hyp:c1")
+
+    async def test_compact_decisions_map_back_to_selections_for_both_providers(self):
+        foundry_client = FakeFoundryClient({"d": [[0, 0.9]]})
+        response = await AzureFoundryProvider(
+            model="deployment", client=foundry_client, decision_format="compact"
+        ).decide(request_fixture())
+        self.assertEqual(
+            response.selections[0],
+            ProviderSelection("s0", DecisionAction.REPLACE, "s0:c0", 0.9, ReasonCode.PHONETIC),
+        )
+        kwargs = foundry_client.responses.kwargs
+        self.assertEqual(set(kwargs["text"]["format"]["schema"]["properties"]), {"d"})
+        self.assertIn("Output format (compact)", kwargs["instructions"])
+
+        ollama_client = FakeOllamaClient({"d": [[-1, 0.7, 2]]})
+        response = await OllamaProvider(
+            model="qwen", client=ollama_client, decision_format="compact"
+        ).decide(request_fixture())
+        self.assertEqual(
+            response.selections[0],
+            ProviderSelection("s0", DecisionAction.KEEP, None, 0.7, ReasonCode.CONTEXT),
+        )
+        self.assertEqual(set(ollama_client.kwargs["format"]["properties"]), {"d"})
+        with self.assertRaises(ValueError):
+            AzureFoundryProvider(decision_format="short")
+
+    def test_compact_decisions_are_validated_strictly(self):
+        request = request_fixture()
+        invalid_payloads = (
+            {"decisions": []},
+            {"d": {}},
+            {"d": []},
+            {"d": [[0, 0.9], [0, 0.9]]},
+            {"d": [[0]]},
+            {"d": [[1, 0.9]]},
+            {"d": [[-3, 0.9]]},
+            {"d": [[0.5, 0.9]]},
+            {"d": [[True, 0.9]]},
+            {"d": [[0, 1.5]]},
+            {"d": [[0, 0.9, 5]]},
+        )
+        for payload in invalid_payloads:
+            with self.subTest(payload=payload), self.assertRaises(InvalidProviderOutputError):
+                parse_provider_payload(
+                    payload,
+                    provider="fixture",
+                    model="fixture",
+                    decision_format="compact",
+                    request=request,
+                )
+        response = parse_provider_payload(
+            {"d": [[-2.0, 0.4]]},
+            provider="fixture",
+            model="fixture",
+            decision_format="compact",
+            request=request,
+        )
+        self.assertIs(response.selections[0].action, DecisionAction.ABSTAIN)
+        with self.assertRaises(ValueError):
+            parse_provider_payload({"d": []}, provider="fixture", model="fixture", decision_format="compact")
+
     def test_factory_defaults_to_azure(self):
         self.assertIsInstance(create_provider("azure"), AzureFoundryProvider)
         self.assertIsInstance(create_provider("ollama"), OllamaProvider)
@@ -397,6 +767,210 @@ class TestProviderAdapters(unittest.IsolatedAsyncioTestCase):
                     OllamaProvider(max_output_tokens=value)
 
 
+class DelayedProvider:
+    name = "delayed"
+    model = "fixture"
+
+    def __init__(self, *delays, error=None):
+        self.delays = list(delays)
+        self.error = error
+        self.calls = 0
+        self.cancelled = 0
+        self.close_calls = 0
+
+    async def decide(self, request):
+        delay = self.delays[min(self.calls, len(self.delays) - 1)]
+        self.calls += 1
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.error is not None:
+            raise self.error
+        return ProviderResponse(
+            tuple(
+                ProviderSelection(span.id, DecisionAction.KEEP, None, 0.9, ReasonCode.NO_MATCH)
+                for span in request.spans
+            ),
+            self.name,
+            self.model,
+        )
+
+    async def aclose(self):
+        self.close_calls += 1
+
+
+class TestHedgedProvider(unittest.IsolatedAsyncioTestCase):
+    async def test_fast_primary_is_not_hedged(self):
+        primary = DelayedProvider(0)
+        provider = HedgedProvider(primary, initial_delay_ms=50)
+
+        response = await provider.decide(request_fixture())
+
+        self.assertEqual(response.provider, "delayed")
+        self.assertEqual(primary.calls, 1)
+        self.assertEqual(provider.stats().hedged, 0)
+
+    async def test_slow_primary_is_hedged_and_loser_cancelled(self):
+        primary = DelayedProvider(1.0)
+        alternate = DelayedProvider(0)
+        provider = HedgedProvider(primary, alternate, initial_delay_ms=10, min_delay_ms=0)
+
+        await provider.decide(request_fixture())
+        await asyncio.sleep(0)
+
+        stats = provider.stats()
+        self.assertEqual((stats.requests, stats.hedged, stats.hedge_wins), (1, 1, 1))
+        self.assertEqual(stats.hedge_rate, 1.0)
+        self.assertEqual(primary.cancelled, 1)
+        await provider.aclose()
+        self.assertEqual((primary.close_calls, alternate.close_calls), (1, 1))
+
+    async def test_failed_hedge_waits_for_primary_and_delay_adapts(self):
+        primary = DelayedProvider(0.03)
+        provider = HedgedProvider(
+            primary,
+            DelayedProvider(0, error=ProviderUnavailableError("down")),
+            initial_delay_ms=5,
+            min_delay_ms=0,
+            min_samples=1,
+        )
+
+        response = await provider.decide(request_fixture())
+
+        self.assertEqual(response.provider, "delayed")
+        self.assertEqual(provider.stats().hedge_wins, 0)
+        self.assertGreaterEqual(provider.hedge_delay_ms, 25)
+
+        failing = HedgedProvider(DelayedProvider(0, error=ProviderUnavailableError("down")))
+        with self.assertRaises(ProviderUnavailableError):
+            await failing.decide(request_fixture())
+        with self.assertRaises(ValueError):
+            HedgedProvider(primary, quantile=1.0)
+        foundry = AzureFoundryProvider(model="deployment", client=FakeFoundryClient())
+        ollama = OllamaProvider(model="qwen", client=FakeOllamaClient())
+        with self.assertRaisesRegex(ValueError, "ADR 0002"):
+            HedgedProvider(ollama, foundry)
+
+
+    async def test_delay_converges_on_primary_latency_when_hedges_win(self):
+        primary = DelayedProvider(0.04)
+        provider = HedgedProvider(
+            primary,
+            DelayedProvider(0.005),
+            initial_delay_ms=5,
+            min_delay_ms=0,
+            min_samples=1,
+            window=4,
+        )
+
+        for _ in range(12):
+            await provider.decide(request_fixture())
+
+        # hedge가 이긴 요청도 primary 시작부터 잰 하한을 남기므로 지연이 hedge
+        # 응답 시간(5ms)에 머물지 않고 primary latency(40ms)로 수렴합니다.
+        self.assertGreaterEqual(provider.hedge_delay_ms, 38)
+        self.assertLess(provider.hedge_delay_ms, 80)
+        self.assertGreaterEqual(primary.cancelled, 1)
+        self.assertLess(provider.stats().hedge_wins, 12)
+
+
+class TestPooledProvider(unittest.IsolatedAsyncioTestCase):
+    async def test_least_outstanding_spreads_concurrent_requests(self):
+        members = [DelayedProvider(0.02) for _ in range(3)]
+        pool = PooledProvider(members)
+
+        await asyncio.gather(*(pool.decide(request_fixture()) for _ in range(9)))
+
+        self.assertEqual([member.calls for member in members], [3, 3, 3])
+        stats = pool.stats()
+        self.assertEqual([item.requests for item in stats], [3, 3, 3])
+        self.assertTrue(all(item.outstanding == 0 and item.healthy for item in stats))
+        self.assertTrue(all(item.ewma_latency_ms >= 15 for item in stats))
+        await pool.aclose()
+        self.assertEqual([member.close_calls for member in members], [1, 1, 1])
+
+    async def test_ewma_prefers_faster_member(self):
+        slow, fast = DelayedProvider(0.03), DelayedProvider(0)
+        pool = PooledProvider([slow, fast], strategy="ewma")
+
+        for _ in range(6):
+            await pool.decide(request_fixture())
+
+        self.assertEqual(slow.calls, 1)
+        self.assertEqual(fast.calls, 5)
+
+    async def test_unavailable_member_is_ejected_and_request_retried(self):
+        now = [0.0]
+        broken = DelayedProvider(0, error=ProviderUnavailableError("down"))
+        healthy = DelayedProvider(0)
+        pool = PooledProvider([broken, healthy], eject_ms=1000, clock=lambda: now[0])
+
+        responses = [await pool.decide(request_fixture()) for _ in range(4)]
+
+        self.assertEqual(len(responses), 4)
+        self.assertEqual((broken.calls, healthy.calls), (1, 4))
+        broken_stats, healthy_stats = pool.stats()
+        self.assertEqual((broken_stats.failures, broken_stats.healthy), (1, False))
+        self.assertTrue(healthy_stats.healthy)
+
+        now[0] = 2.0
+        broken.error = None
+        await pool.decide(request_fixture())
+        self.assertEqual(broken.calls, 2)
+        self.assertTrue(pool.stats()[0].healthy)
+
+        failing = PooledProvider(
+            [DelayedProvider(0, error=ProviderUnavailableError("down")) for _ in range(2)]
+        )
+        with self.assertRaises(ProviderUnavailableError):
+            await failing.decide(request_fixture())
+        self.assertEqual([item.requests for item in failing.stats()], [1, 1])
+
+        invalid = DelayedProvider(0, error=InvalidProviderOutputError("bad"))
+        strict = PooledProvider([invalid, DelayedProvider(0)])
+        with self.assertRaises(InvalidProviderOutputError):
+            await strict.decide(request_fixture())
+        self.assertTrue(strict.stats()[0].healthy)
+
+    def test_pool_requires_one_explicit_provider_type(self):
+        foundry = AzureFoundryProvider(model="deployment", client=FakeFoundryClient())
+        ollama = OllamaProvider(model="qwen", client=FakeOllamaClient())
+        with self.assertRaises(ValueError):
+            PooledProvider([foundry, ollama])
+        with self.assertRaises(ValueError):
+            PooledProvider([])
+        with self.assertRaises(ValueError):
+            PooledProvider([ollama, ollama])
+        with self.assertRaises(ValueError):
+            PooledProvider([ollama], strategy="random")
+
+        pool = create_provider_pool(
+            "ollama",
+            [{"host": "http://a:11434", "model": "qwen"}, {"host": "http://b:11434", "model": "qwen"}],
+            strategy="ewma",
+        )
+        self.assertEqual([member.host for member in pool.members], ["http://a:11434", "http://b:11434"])
+        self.assertEqual((pool.name, pool.model, pool.strategy), ("ollama", "qwen", "ewma"))
+
+    def test_pool_factory_closes_built_members_when_a_later_step_fails(self):
+        members = [{"host": "http://a:11434", "model": "qwen"}, {"model": "qwen", "timeout": 0}]
+        with (
+            patch.object(OllamaProvider, "close") as close,
+            self.assertRaisesRegex(ValueError, "timeout"),
+        ):
+            create_provider_pool("ollama", members)
+        self.assertEqual(close.call_count, 1)
+
+        with (
+            patch.object(OllamaProvider, "close", side_effect=RuntimeError("close")) as close,
+            self.assertRaisesRegex(ValueError, "strategy"),
+        ):
+            create_provider_pool("ollama", members[:1] * 2, strategy="random")
+        self.assertEqual(close.call_count, 2)
+
+
 class TestOllamaSyncLoopSafety(unittest.TestCase):
     def test_internal_client_is_created_and_closed_per_event_loop(self):
         PerCallOllamaClient.instances.clear()
@@ -414,6 +988,45 @@ class TestOllamaSyncLoopSafety(unittest.TestCase):
         self.assertTrue(all(client.host == "http://ollama" for client in PerCallOllamaClient.instances))
         self.assertTrue(all(client.timeout == 8.0 for client in PerCallOllamaClient.instances))
 
+    def test_internal_client_is_reused_within_a_loop_and_closed_by_aclose(self):
+        PerCallOllamaClient.instances.clear()
+        provider = OllamaProvider(host="http://ollama", model="qwen")
+        provider._load_client_class = lambda: PerCallOllamaClient
+
+        async def run():
+            await asyncio.gather(*(provider.decide(request_fixture()) for _ in range(5)))
+            await provider.decide(request_fixture())
+            reused = list(PerCallOllamaClient.instances)
+            await provider.aclose()
+            closed_by_aclose = reused[0].close_calls
+            await provider.decide(request_fixture())
+            return reused, closed_by_aclose
+
+        reused, closed_by_aclose = asyncio.run(run())
+
+        self.assertEqual(len(reused), 1)
+        self.assertEqual(reused[0].chat_calls, 6)
+        self.assertEqual(closed_by_aclose, 1)
+        self.assertEqual(len(PerCallOllamaClient.instances), 2)
+        self.assertTrue(all(client.close_calls == 1 for client in PerCallOllamaClient.instances))
+        provider.close()
+        self.assertEqual(len(provider._loop_clients), 0)
+
+    def test_reuse_can_be_disabled_and_connection_limit_is_validated(self):
+        PerCallOllamaClient.instances.clear()
+        provider = OllamaProvider(host="http://ollama", model="qwen", reuse_client=False)
+        provider._load_client_class = lambda: PerCallOllamaClient
+
+        async def run():
+            for _ in range(3):
+                await provider.decide(request_fixture())
+            return [client.close_calls for client in PerCallOllamaClient.instances]
+
+        self.assertEqual(asyncio.run(run()), [1, 1, 1])
+        for value in (0, True, 1.5):
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                OllamaProvider(model="qwen", max_connections=value)
+
 
 async def _async_value(value):
     return value
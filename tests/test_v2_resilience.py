@@ -0,0 +1,256 @@
+import asyncio
+import random
+import unittest
+
+from pronunciation_mapper.v2 import (
+    AdaptiveConcurrencyLimiter,
+    AgenticPronunciationMapper,
+    CircuitBreaker,
+    CircuitState,
+    ConcurrencyLimitExceededError,
+    ProviderConfigurationError,
+    ProviderUnavailableError,
+)
+from tests.test_v2 import ScriptedProvider
+from tests.test_v2_providers import FakeHTTPError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_consecutive_failures_open_and_half_open_probe_closes(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+
+        breaker.record_failure()
+        self.assertIs(breaker.state, CircuitState.CLOSED)
+        breaker.record_failure()
+        self.assertIs(breaker.state, CircuitState.OPEN)
+        self.assertFalse(breaker.allow())
+
+        clock.now = 10
+        self.assertIs(breaker.state, CircuitState.HALF_OPEN)
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow(), "only one half-open probe by default")
+        breaker.record_success()
+
+        stats = breaker.stats()
+        self.assertIs(stats.state, CircuitState.CLOSED)
+        self.assertEqual((stats.failures, stats.successes, stats.short_circuited, stats.opened), (2, 1, 2, 1))
+
+    def test_failure_rate_and_failed_probe_reopen(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(
+            failure_threshold=100, failure_rate_threshold=0.5, window=4, min_calls=4, clock=clock
+        )
+        for succeeded in (True, False, True, False):
+            if succeeded:
+                breaker.record_success()
+            else:
+                breaker.record_failure()
+        self.assertIs(breaker.state, CircuitState.OPEN)
+
+        clock.now = 30
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+        self.assertIs(breaker.state, CircuitState.OPEN)
+        self.assertEqual(breaker.stats().opened, 2)
+        with self.assertRaises(ValueError):
+            CircuitBreaker(reset_timeout=0)
+
+
+class TestMapperCircuitBreaker(unittest.IsolatedAsyncioTestCase):
+    async def test_open_circuit_short_circuits_to_fallback(self):
+        provider = ScriptedProvider(error=ProviderUnavailableError("down"))
+        breaker = CircuitBreaker(failure_threshold=2, clock=FakeClock())
+        mapper = AgenticPronunciationMapper(
+            ["transaction"], provider=provider, circuit_breaker=breaker
+        )
+
+        for _ in range(2):
+            await mapper.rewrite("트랜잭숑")
+        result = await mapper.rewrite("트랜잭숑")
+
+        self.assertEqual(len(provider.calls), 2)
+        self.assertTrue(result.fallback_used)
+        self.assertEqual(result.rewritten_text, "transaction")
+        self.assertIn("provider-fallback:CircuitOpenError", result.diagnostics)
+        self.assertIn("circuit:open", result.diagnostics)
+        self.assertEqual(breaker.stats().short_circuited, 1)
+
+    async def test_non_availability_errors_do_not_trip(self):
+        provider = ScriptedProvider(error=ProviderConfigurationError("bad deployment"))
+        breaker = CircuitBreaker(failure_threshold=1)
+        mapper = AgenticPronunciationMapper(
+            ["transaction"], provider=provider, circuit_breaker=breaker
+        )
+
+        await mapper.rewrite("트랜잭숑")
+        await mapper.rewrite("트랜잭숑")
+
+        self.assertEqual(len(provider.calls), 2)
+        self.assertIs(breaker.state, CircuitState.CLOSED)
+        with self.assertRaises(TypeError):
+            AgenticPronunciationMapper(["transaction"], provider=provider, circuit_breaker=object())
+
+
+
+class CapacityProvider(ScriptedProvider):
+    """동시 호출이 ``capacity``를 넘으면 HTTP 429로 거절하는 provider."""
+
+    def __init__(self, capacity, latency=0.005):
+        super().__init__()
+        self.capacity = capacity
+        self.latency = latency
+        self.in_flight = 0
+        self.throttled = 0
+
+    async def decide(self, request):
+        self.in_flight += 1
+        try:
+            if self.in_flight > self.capacity:
+                self.throttled += 1
+                raise ProviderUnavailableError("throttled (HTTP 429)") from FakeHTTPError(429)
+            await asyncio.sleep(self.latency)
+            return await super().decide(request)
+        finally:
+            self.in_flight -= 1
+
+
+class TestAdaptiveConcurrencyLimiter(unittest.IsolatedAsyncioTestCase):
+    async def test_additive_increase_and_single_multiplicative_decrease(self):
+        clock = FakeClock()
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, decrease_factor=0.5, clock=clock)
+
+        first = await limiter.acquire()
+        second = await limiter.acquire()
+        clock.now = 0.01
+        limiter.record_success(first)
+        self.assertEqual(limiter.stats().increases, 1)
+        third = await limiter.acquire()
+        limiter.record_success(second)
+        limiter.record_success(third)
+        self.assertEqual(limiter.stats().increases, 2)
+        self.assertEqual(limiter.limit, 2)
+
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=8, decrease_factor=0.5, clock=clock)
+        slots = [await limiter.acquire() for _ in range(4)]
+        clock.now = 1.0
+        for started in slots:
+            limiter.record_overload(started)
+        stats = limiter.stats()
+        self.assertEqual((stats.limit, stats.decreases, stats.in_flight), (4, 1, 0))
+        limiter.record_overload(await limiter.acquire())
+        self.assertEqual(limiter.limit, 2)
+        await limiter.acquire()
+        limiter.record_ignored()
+        self.assertEqual((limiter.limit, limiter.stats().in_flight), (2, 0))
+
+    async def test_sustained_latency_inflation_decreases_limit(self):
+        clock = FakeClock()
+        limiter = AdaptiveConcurrencyLimiter(
+            initial_limit=10, decrease_factor=0.5, min_samples=3, clock=clock
+        )
+
+        async def call(latency, size=1.0):
+            started = await limiter.acquire()
+            clock.now += latency
+            limiter.record_success(started, size=size)
+
+        for _ in range(3):
+            await call(0.01)
+        self.assertEqual(limiter.stats().baseline_latency_ms, 10.0)
+        # 한 번 튄 응답은 평활 latency를 baseline의 두 배까지 올리지 못합니다.
+        await call(0.05)
+        self.assertEqual(limiter.limit, 10)
+        await call(0.05)
+        self.assertEqual(limiter.limit, 5)
+        self.assertEqual(limiter.stats().decreases, 1)
+        with self.assertRaises(ValueError):
+            await call(0.01, size=0)
+        self.assertEqual(limiter.stats().in_flight, 0)
+
+    async def test_latency_variation_without_overload_keeps_limit(self):
+        rng = random.Random(7)
+        for normalize in (False, True):
+            with self.subTest(normalize=normalize):
+                clock = FakeClock()
+                limiter = AdaptiveConcurrencyLimiter(initial_limit=32, max_limit=64, clock=clock)
+                for _ in range(100):
+                    # 용량 제한이 없는 backend: latency는 20-120ms이고 요청 크기에만 달려 있습니다.
+                    calls = []
+                    for _ in range(limiter.limit):
+                        size = rng.uniform(1, 6)
+                        calls.append((await limiter.acquire(), size))
+                    for started, size in calls:
+                        clock.now = started + 0.02 * size
+                        limiter.record_success(started, size=size if normalize else 1.0)
+                stats = limiter.stats()
+                self.assertEqual(stats.decreases, 0)
+                self.assertGreaterEqual(stats.limit, 32)
+
+    async def test_excess_calls_queue_with_bounded_wait(self):
+        limiter = AdaptiveConcurrencyLimiter(
+            initial_limit=1, increase=0, max_queue=1, max_wait_ms=20
+        )
+        holder = await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        with self.assertRaises(ConcurrencyLimitExceededError):
+            await limiter.acquire()
+        limiter.record_success(holder)
+        limiter.record_success(await waiter)
+
+        holder = await limiter.acquire()
+        with self.assertRaises(ConcurrencyLimitExceededError):
+            await limiter.acquire()
+        limiter.record_ignored()
+        stats = limiter.stats()
+        self.assertEqual((stats.rejected, stats.in_flight, stats.queued), (2, 0, 0))
+        for kwargs in (
+            {"initial_limit": 0},
+            {"initial_limit": 300},
+            {"decrease_factor": 1.0},
+            {"latency_tolerance": 0.5},
+            {"max_queue": -1},
+        ):
+            with self.subTest(kwargs=kwargs), self.assertRaises(ValueError):
+                AdaptiveConcurrencyLimiter(**kwargs)
+
+    async def test_mapper_limiter_settles_near_provider_capacity(self):
+        async def run(limiter):
+            provider = CapacityProvider(capacity=6)
+            mapper = AgenticPronunciationMapper(
+                ["transaction"],
+                provider=provider,
+                coalesce_requests=False,
+                concurrency_limiter=limiter,
+            )
+            fallbacks = 0
+            for _ in range(10):
+                results = await asyncio.gather(*(mapper.rewrite("트랜잭숑") for _ in range(30)))
+                fallbacks += sum(result.fallback_used for result in results)
+            return provider, fallbacks
+
+        unlimited, unlimited_fallbacks = await run(None)
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=24, max_wait_ms=5000)
+        limited, limited_fallbacks = await run(limiter)
+
+        self.assertGreater(unlimited_fallbacks, 200)
+        self.assertLess(limited_fallbacks, unlimited_fallbacks / 4)
+        self.assertLess(limited.throttled, unlimited.throttled / 4)
+        self.assertLessEqual(limiter.limit, 8)
+        self.assertGreaterEqual(limiter.limit, 3)
+        with self.assertRaises(TypeError):
+            AgenticPronunciationMapper(
+                ["transaction"], provider=ScriptedProvider(), concurrency_limiter=object()
+            )
+
+if __name__ == "__main__":
+    unittest.main()